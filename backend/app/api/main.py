@@ -1,10 +1,14 @@
 from fastapi import APIRouter
 
-from .routes import root, articles, scheduler
+from .routes import root, articles, scheduler, jobs, debug
+from ..core.config import settings
 
 api_router = APIRouter()
 
 api_router.include_router(root.router)
 api_router.include_router(articles.router)
 api_router.include_router(scheduler.router)
+api_router.include_router(jobs.router)
 
+if settings.ENABLE_DEBUG_ENDPOINTS:
+    api_router.include_router(debug.router)
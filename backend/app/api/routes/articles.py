@@ -1,101 +1,237 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from fastapi_pagination import Page, add_pagination, paginate
-from fastapi_pagination.utils import disable_installed_extensions_check
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from fastapi_pagination import Page, Params, add_pagination, create_page
+from typing import AsyncIterator, Literal
 from datetime import datetime
 import asyncio
+import json
 from ..deps import get_db
-from ...core.scraper import ArticleScrapper
-from ...crud import create_articles, fetch_articles_from_db, get_distinct_categories
-from ...models import ArticleBase, ArticleDB
+from ...core.config import settings
+from ...core.jobs import SKIPPED, SUCCEEDED, Job
+from ...core.response_cache import response_cache
+from ...core.scheduler import article_scheduler
+from ...crud import (
+    ARTICLE_LIST_PROJECTION,
+    build_article_filter,
+    count_articles,
+    fetch_article,
+    fetch_articles_after,
+    fetch_articles_page,
+    fetch_category_stats
+)
+from ...models import ArticleDB, ArticleFeed, ArticleListItem, CategoryStats
 from ...utils import logger
 
 router = APIRouter(prefix="/articles", tags=["articles"])
 
 
-async def _scape_and_store_batch(db, batch_size: int = 5):
-    try:
-        scrapper = ArticleScrapper()
-        articles = await scrapper.scrape_articles(batch_size)
-
-        if not articles:
-            logger.warning("No new articles found during background scraping")
-            return
-
-        stored_count = 0
-        for article in articles:
-            try:
-                await create_articles(db['articles'], article)
-                stored_count += 1
-            except Exception as e:
-                logger.error(f"Error storing article: {str(e)}")
-
-        logger.info(f"Background task stored {stored_count} new articles")
-    except Exception as e:
-        logger.error(f"Error during background task: {str(e)}")
-
-
 @router.post("/", response_model=dict)
 async def scrape_and_store_articles(
-        background_tasks: BackgroundTasks,
-        db=Depends(get_db),
-        batch_size: int = Query(5, ge=1, le=20, description="Number of articles per batch"),
-        run_in_background: bool = Query(False, description="Run the task in the background")
+        batch_size: int = Query(
+            5, ge=1, le=20, deprecated=True,
+            description="Ignored: articles are now stored as soon as each one is processed"
+        ),
+        run_in_background: bool = Query(False, description="Return the job right away instead of waiting for it")
 ):
+    """Scrape every source as a tracked job (see ``/jobs``); a scrape that is
+    already queued or running is joined instead of starting another."""
     try:
+        job, created = article_scheduler.submit_scrape(trigger="api")
         if run_in_background:
-            background_tasks.add_task(_scape_and_store_batch, db, batch_size)
             return {
-                "status": "Background task started",
-                "message": f"Background task started to scrape and store",
+                "status": "Background task started" if created else "Background task already running",
+                "message": f"Follow the scrape at /jobs/{job.id}",
+                "job_id": job.id,
                 "batch_size": batch_size,
                 "timestamp": datetime.now().isoformat()
             }
 
-        scrapper = ArticleScrapper()
-        articles = await scrapper.scrape_articles(batch_size=batch_size)
+        await job.wait()
+        if job.status == SKIPPED:
+            raise HTTPException(status_code=409, detail="A scrape is already running on another node")
+        if job.status != SUCCEEDED:
+            raise HTTPException(status_code=500, detail=job.error or f"Scrape {job.status}")
 
-        if not articles:
-            raise HTTPException(status_code=404, detail="No articles found")
+        run = job.result
+        if run["status"] == "unchanged":
+            return {
+                "status": "unchanged",
+                "message": "No listing page has changed since the last run",
+                "articles_count": 0,
+                "job_id": job.id
+            }
 
-        stored_articles = []
-        for article in articles:
-            stored_article = await create_articles(db['articles'], article)
-            stored_articles.append(stored_article)
+        if not run["discovered"]:
+            raise HTTPException(status_code=404, detail="No articles found")
 
         return {
             "status": "completed",
-            "message": f"Successfully scraped and stored {len(stored_articles)} articles",
-            "articles_count": len(stored_articles)
+            "message": f"Successfully scraped and stored {run['stored']} articles",
+            "articles_count": run["stored"],
+            "job_id": job.id
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in scrape_and_store_articles: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/", response_model=Page[ArticleDB])
+# Sent while nothing else happens (e.g. during Gemini rate limiting) so proxies
+# do not close an idle stream.
+STREAM_KEEPALIVE_SECONDS = 15
+
+
+def _encode_ndjson(event: str, data: dict) -> str:
+    return json.dumps({"event": event, "data": data}, ensure_ascii=False) + "\n"
+
+
+def _encode_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _scrape_events(job: Job, events: asyncio.Queue, encode) -> AsyncIterator[str]:
+    try:
+        while True:
+            try:
+                entry = await asyncio.wait_for(events.get(), STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield encode("keepalive", {})
+                continue
+            if entry is None:
+                break
+            event, data = entry
+            if event == "article":
+                data = ArticleListItem(**data.model_dump(by_alias=True))
+            yield encode(event, jsonable_encoder(data))
+
+        if job.status == SUCCEEDED:
+            yield encode("done", job.result)
+        elif job.status == SKIPPED:
+            yield encode("error", {"detail": "A scrape is already running on another node"})
+        else:
+            yield encode("error", {"detail": job.error or f"Scrape {job.status}"})
+    finally:
+        # The client went away: the job goes on (others may have joined it)
+        # and can still be followed at /jobs/{id}.
+        job.unsubscribe(events)
+
+
+@router.post("/stream")
+async def stream_scrape(
+        format: Literal["ndjson", "sse"] = Query("ndjson", description="NDJSON lines or Server-Sent Events")
+):
+    """Run a scrape as a tracked job (see ``/jobs``) and stream its progress.
+
+    Like ``POST /articles``, a scrape already queued or running is joined
+    instead of starting another, and only then are its events streamed from
+    that point on. Every message has an event name and a JSON object: pipeline
+    progress (``discovered``, ``fetched``, ``summarized``, ``stored``,
+    ``skipped``, ``failed``, ``listing_unchanged``, each with the ``source``
+    it came from), ``article`` with each stored article as soon as its batch is
+    written, then ``done`` with the run record or ``error``. NDJSON lines are
+    ``{"event": ..., "data": ...}``; the job id is in the ``X-Job-Id`` header.
+    This is a POST, so read the SSE variant with ``fetch``, not ``EventSource``.
+    """
+    if format == "sse":
+        encode, media_type = _encode_sse, "text/event-stream"
+    else:
+        encode, media_type = _encode_ndjson, "application/x-ndjson"
+
+    job, _ = article_scheduler.submit_scrape(trigger="stream")
+    events = job.subscribe()
+    return StreamingResponse(
+        _scrape_events(job, events, encode),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Job-Id": job.id}
+    )
+
+
+@router.get("/", response_model=Page[ArticleListItem])
 async def get_articles(
+        request: Request,
+        db=Depends(get_db),
+        params: Params = Depends(),
+        category: str | None = None,
+        q: str | None = Query(None, description="Search query; accents and case are ignored"),
+        prefix: bool = Query(True, description="Treat the last word of q as a prefix (type-ahead)")
+):
+    """List articles, newest first; with ``q``, ranked by relevance."""
+    async def build():
+        filter_query = build_article_filter(category, q, prefix)
+        articles = await fetch_articles_page(
+            db['articles'],
+            filter_query,
+            skip=(params.page - 1) * params.size,
+            limit=params.size,
+            projection=ARTICLE_LIST_PROJECTION
+        )
+        total = await count_articles(db['articles'], filter_query, settings.ARTICLE_COUNT_CACHE_SECONDS)
+        return create_page([ArticleListItem(**article) for article in articles], total, params)
+
+    try:
+        return await response_cache.respond(request, build)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/feed", response_model=ArticleFeed)
+async def get_article_feed(
+        request: Request,
         db=Depends(get_db),
+        cursor: str | None = Query(None, description="next_cursor of the previous page"),
+        limit: int = Query(20, ge=1, le=100),
         category: str | None = None,
         q: str | None = None
 ):
+    async def build():
+        articles, next_cursor = await fetch_articles_after(
+            db['articles'],
+            build_article_filter(category, q),
+            cursor,
+            limit,
+            projection=ARTICLE_LIST_PROJECTION
+        )
+        return ArticleFeed(items=[ArticleListItem(**article) for article in articles], next_cursor=next_cursor)
+
     try:
-        articles = await fetch_articles_from_db(db['articles'], category, q)
-        result = [ArticleDB(**article) for article in articles]
-        disable_installed_extensions_check()
-        return paginate(result)
+        return await response_cache.respond(request, build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/categories", response_model=list[str])
-async def get_categories(db=Depends(get_db)):
+@router.get("/categories", response_model=list[str] | list[CategoryStats])
+async def get_categories(
+        request: Request,
+        db=Depends(get_db),
+        with_counts: bool = Query(False, description="Return article count and latest article time per category")
+):
+    async def build():
+        stats = await fetch_category_stats(db['articles'])
+        return stats if with_counts else [category.name for category in stats]
+
     try:
-        categories = await get_distinct_categories(db['articles'])
-        return categories
+        return await response_cache.respond(request, build)
     except Exception as e:
         logger.error(f"Error in get_categories endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Declared last so that /categories and /feed are not captured as an article id.
+@router.get("/{article_id}", response_model=ArticleDB)
+async def get_article(article_id: str, db=Depends(get_db)):
+    try:
+        article = await fetch_article(db['articles'], article_id)
+    except Exception as e:
+        logger.error(f"Error in get_article endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return ArticleDB(**article)
+
+
 add_pagination(router)
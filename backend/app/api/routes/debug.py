@@ -0,0 +1,21 @@
+from fastapi import APIRouter, HTTPException
+
+from ...core.query_plans import explain_all
+from ...utils import logger
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/query-plans", response_model=dict)
+async def get_query_plans():
+    """Winning plan of every registered query shape; ``ok`` is false for
+    collection scans and in-memory sorts that are not expected."""
+    try:
+        plans = await explain_all()
+        return {
+            "ok": all(plan["ok"] for plan in plans),
+            "plans": plans
+        }
+    except Exception as e:
+        logger.error(f"Error explaining query plans: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
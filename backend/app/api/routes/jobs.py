@@ -0,0 +1,44 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from ...core.jobs import Job, job_manager
+from ...core.scheduler import article_scheduler
+from ...models import JobStatus
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def job_status(job: Job, created: Optional[bool] = None) -> JobStatus:
+    return JobStatus(**job.to_dict(), created=created)
+
+
+@router.post("/", response_model=JobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(request: Request, response: Response):
+    """Start a background scrape, or join the scrape that is already queued or
+    running (``created`` is then false)."""
+    job, created = article_scheduler.submit_scrape(trigger="api")
+    response.headers["Location"] = str(request.url_for("get_job", job_id=job.id))
+    return job_status(job, created)
+
+
+@router.get("/", response_model=list[JobStatus])
+async def list_jobs(kind: str | None = None):
+    return [job_status(job) for job in job_manager.list(kind)]
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+
+@router.delete("/{job_id}", response_model=JobStatus)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job; finished jobs are returned unchanged."""
+    job = await job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
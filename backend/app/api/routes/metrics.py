@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ...core import metrics
+from ...core.summary_queue import summary_queue
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    # The summary queue lives in MongoDB, so it is only read when scraped.
+    stats = await summary_queue.get_stats()
+    metrics.summary_queue_depth.set(stats["depth"])
+    metrics.summary_queue_lag.set(stats["lag_seconds"])
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
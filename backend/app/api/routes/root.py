@@ -1,5 +1,9 @@
 from fastapi import APIRouter
+from ...core.config import settings
 from ...core.scheduler import article_scheduler
+from ...core.response_cache import response_cache
+from ...core.summary_cache import summary_cache
+from ...core.summary_queue import summary_queue, summary_workers
 
 router = APIRouter(prefix="/health",tags=["root"])
 
@@ -8,7 +12,14 @@ async def health():
     return {
         "message": "Article Scraper API",
         "version": "1.0.0",
-        "scheduler_status": article_scheduler.get_scheduler_status(),
+        "scheduler_status": await article_scheduler.get_scheduler_status(),
+        "summary_cache": summary_cache.get_stats(),
+        "response_cache": response_cache.get_stats(),
+        "summary_queue": {
+            "mode": settings.SUMMARY_MODE,
+            **await summary_queue.get_stats(),
+            **summary_workers.get_stats()
+        },
         "docs_url": "/docs",
         "health_check": "/api/v1/health"
     }
\ No newline at end of file
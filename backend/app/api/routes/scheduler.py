@@ -3,24 +3,32 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
+from ...core.jobs import SKIPPED, SUCCEEDED
 from ...core.scheduler import article_scheduler
 from ...utils import logger
-from ...models import SchedulerConfig, SchedulerStatus
+from ...models import SchedulerConfig, SchedulerStatus, SchedulerRun
 
 router = APIRouter(prefix="/scheduler", tags=["scheduler"])
 
 
+def _describe(config: SchedulerConfig) -> str:
+    if config.mode == "adaptive":
+        return "adaptive per-feed intervals"
+    return f"{config.interval_minutes} minute interval"
+
+
 @router.post("/start", response_model=dict)
 async def start_scheduler(
         config: SchedulerConfig = SchedulerConfig()
 ):
     try:
-        success = await article_scheduler.start_scheduler(config.interval_minutes)
+        success = await article_scheduler.start_scheduler(config.interval_minutes, config.mode)
 
         if success:
             return {
                 "status": "success",
-                "message": f"Scheduler started successfully with {config.interval_minutes} minute interval",
+                "message": f"Scheduler started successfully with {_describe(config)}",
+                "mode": config.mode,
                 "interval_minutes": config.interval_minutes,
                 "started_at": datetime.now().isoformat()
             }
@@ -60,30 +68,60 @@ async def stop_scheduler():
 @router.get("/status", response_model=SchedulerStatus)
 async def get_scheduler_status():
     try:
-        status = article_scheduler.get_scheduler_status()
+        status = await article_scheduler.get_scheduler_status()
         return SchedulerStatus(**status)
     except Exception as e:
         logger.error(f"Error getting scheduler status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/trigger", response_model=dict)
-async def trigger_immediate_scraping():
+@router.get("/runs", response_model=list[SchedulerRun])
+async def get_scheduler_runs(limit: int = Query(default=20, ge=1, le=200)):
     try:
-        success = await article_scheduler.trigger_immediate_run()
+        runs = await article_scheduler.get_runs(limit=limit)
+        return [SchedulerRun(**run) for run in runs]
+    except Exception as e:
+        logger.error(f"Error getting scheduler runs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if success:
+
+@router.post("/trigger", response_model=dict)
+async def trigger_immediate_scraping(
+        wait: bool = Query(False, description="Wait for the scrape to finish instead of returning the job")
+):
+    """Start a scrape job now, or join the one already queued or running;
+    follow it with ``GET /jobs/{job_id}``."""
+    try:
+        job, created = article_scheduler.trigger_immediate_run()
+        if not wait:
             return {
-                "status": "success",
-                "message": "Immediate scraping completed successfully",
-                "triggered_at": datetime.now().isoformat()
+                "status": "accepted" if created else "already_running",
+                "message": "Scraping job started" if created else "Joined the scraping job already in progress",
+                "job_id": job.id,
+                "triggered_at": job.created_at.isoformat()
             }
-        else:
+
+        await job.wait()
+        if job.status == SKIPPED:
+            raise HTTPException(
+                status_code=409,
+                detail="A scraping run is already in progress on another node"
+            )
+        if job.status != SUCCEEDED:
             raise HTTPException(
                 status_code=500,
-                detail="Failed to complete immediate scraping"
+                detail=f"Failed to complete immediate scraping: {job.error or job.status}"
             )
-
+        return {
+            "status": "success",
+            "message": "Immediate scraping completed successfully",
+            "job_id": job.id,
+            "triggered_at": job.created_at.isoformat(),
+            "run": job.result
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error triggering immediate scraping: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -94,12 +132,13 @@ async def update_scheduler_interval(
         config: SchedulerConfig
 ):
     try:
-        success = await article_scheduler.update_schedule(config.interval_minutes)
+        success = await article_scheduler.update_schedule(config.interval_minutes, config.mode)
 
         if success:
             return {
                 "status": "success",
-                "message": f"Scheduler interval updated to {config.interval_minutes} minutes",
+                "message": f"Scheduler updated to {_describe(config)}",
+                "mode": config.mode,
                 "new_interval_minutes": config.interval_minutes,
                 "updated_at": datetime.now().isoformat()
             }
@@ -123,12 +162,13 @@ async def restart_scheduler(
         await article_scheduler.stop_scheduler()
 
         # Start with new config
-        success = await article_scheduler.start_scheduler(config.interval_minutes)
+        success = await article_scheduler.start_scheduler(config.interval_minutes, config.mode)
 
         if success:
             return {
                 "status": "success",
-                "message": f"Scheduler restarted successfully with {config.interval_minutes} minute interval",
+                "message": f"Scheduler restarted successfully with {_describe(config)}",
+                "mode": config.mode,
                 "interval_minutes": config.interval_minutes,
                 "restarted_at": datetime.now().isoformat()
             }
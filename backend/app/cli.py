@@ -0,0 +1,93 @@
+"""Maintenance commands that run against the configured MongoDB.
+
+    python -m app.cli backfill-search [--all] [--batch-size 500]
+    python -m app.cli rebuild-category-stats
+    python -m app.cli explain
+"""
+import argparse
+import asyncio
+import sys
+
+from pymongo import UpdateOne
+
+from .core.config import settings
+from .core.database import MongoDB
+from .core.query_plans import explain_all
+from .core.search import SEARCH_VERSION, search_fields
+from .crud import rebuild_category_stats
+from .utils import logger
+
+
+async def backfill_search(rebuild_all: bool, batch_size: int):
+    """Fill the folded search fields of articles stored before they existed
+    (or by an older ``SEARCH_VERSION``)."""
+    await MongoDB.setup_indexes()
+    articles = MongoDB.get_client()[settings.MONGODB_DB_NAME]["articles"]
+
+    query = {} if rebuild_all else {"search_version": {"$ne": SEARCH_VERSION}}
+    cursor = articles.find(query, {"title": 1, "description": 1, "content": 1})
+
+    updated = 0
+    operations = []
+    async for doc in cursor:
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": search_fields(doc)}))
+        if len(operations) >= batch_size:
+            await articles.bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+            logger.info(f"Search backfill: {updated} articles updated")
+
+    if operations:
+        await articles.bulk_write(operations, ordered=False)
+        updated += len(operations)
+
+    logger.info(f"Search backfill finished: {updated} articles updated")
+
+
+async def rebuild_categories():
+    articles = MongoDB.get_client()[settings.MONGODB_DB_NAME]["articles"]
+    count = await rebuild_category_stats(articles)
+    logger.info(f"Category stats rebuilt: {count} categories")
+
+
+async def explain() -> bool:
+    """Print the winning plan of every registered query shape; ``False`` if any is flagged."""
+    await MongoDB.setup_indexes()
+    plans = await explain_all()
+    for plan in plans:
+        status = "ok" if plan["ok"] else "FLAGGED"
+        detail = plan.get("error") or f"{' <- '.join(plan['stages'])} [{', '.join(plan['indexes']) or 'no index'}]"
+        print(f"{status:8} {plan['name']:32} {detail}")
+    return all(plan["ok"] for plan in plans)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("backfill-search", help="Compute folded search fields for stored articles")
+    backfill.add_argument("--all", action="store_true", help="Recompute every article, not only outdated ones")
+    backfill.add_argument("--batch-size", type=int, default=500)
+
+    commands.add_parser("rebuild-category-stats", help="Recompute category_stats from the articles collection")
+    commands.add_parser("explain", help="Check the query plans of the app's queries; exits 1 on collection scans "
+                                        "or in-memory sorts")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "backfill-search":
+            asyncio.run(backfill_search(args.all, args.batch_size))
+        elif args.command == "rebuild-category-stats":
+            asyncio.run(rebuild_categories())
+        elif args.command == "explain":
+            ok = asyncio.run(explain())
+    finally:
+        MongoDB.close_client()
+
+    if args.command == "explain" and not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,17 +18,117 @@ class Settings(BaseSettings):
         return self.BACKEND_CORS_ORIGINS
 
     GEMINI_API_KEY: str
+    GEMINI_MODEL: str = "gemini-1.5-flash"
+    # Base URL of a Gemini-compatible REST endpoint (e.g. the benchmark's fake
+    # server); empty uses Google's API.
+    GEMINI_API_ENDPOINT: str = ""
+    # Shared Gemini quota; 0 leaves that limit off.
+    GEMINI_REQUESTS_PER_MINUTE: int = 15
+    GEMINI_TOKENS_PER_MINUTE: int = 1_000_000
+    GEMINI_REQUESTS_PER_DAY: int = 1500
+    GEMINI_BURST: int = 1
+    GEMINI_MAX_WAIT_SECONDS: float = 60.0
     MAX_API_RETRIES: int = 3
     RATE_LIMIT_DELAY: float = 3.0
 
     MAX_ARTICLES_PER_BATCH: int = 5
+    STORE_BATCH_LINGER_SECONDS: float = 0.5
     BATCH_DELAY_SECOND: int = 10
 
     USE_FALLBACK_SUMMARY: bool = True
 
+    SUMMARY_BATCH_ENABLED: bool = True
+    SUMMARY_BATCH_MAX_SIZE: int = 8
+    SUMMARY_BATCH_TOKEN_BUDGET: int = 24000
+    SUMMARY_BATCH_TARGET_LATENCY: float = 20.0
+    SUMMARY_BATCH_LINGER_SECONDS: float = 2.0
+
+    # Where Gemini summaries are made, one path or the other:
+    # "queue"  - articles are stored right away with summary_status pending
+    #            (and an extractive draft); SUMMARY_WORKERS summarize them in
+    #            the background, with leases and retries (app/core/summary_queue.py).
+    # "inline" - the scrape pipeline's summarize stage summarizes before storing,
+    #            batched when SUMMARY_BATCH_ENABLED; a scrape takes as long as
+    #            Gemini does and a failed summary falls back to the draft.
+    SUMMARY_MODE: Literal["queue", "inline"] = "queue"
+    SUMMARY_WORKERS: int = 2
+    SUMMARY_LEASE_SECONDS: int = 300
+    SUMMARY_MAX_ATTEMPTS: int = 5
+    SUMMARY_RETRY_DELAY_SECONDS: int = 60
+    SUMMARY_POLL_INTERVAL_SECONDS: float = 5.0
+
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_MAX_ENTRIES: int = 2048
+    SUMMARY_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+
+    # "mongodb" shares the schedule between processes (one of them, the lease
+    # holder, runs it); "memory" keeps it in this process only.
+    SCHEDULER_JOBSTORE: str = "mongodb"
+    SCHEDULER_LEASE_SECONDS: int = 60
+    SCHEDULER_HEARTBEAT_SECONDS: int = 15
+    SCHEDULER_RUN_HISTORY_DAYS: int = 30
+    # Adaptive mode: every tick polls only the feeds whose learned interval is
+    # up (see app/core/crawl_planner.py).
+    SCHEDULER_ADAPTIVE_TICK_SECONDS: int = 60
+    SCHEDULER_ADAPTIVE_MIN_MINUTES: float = 5
+    SCHEDULER_ADAPTIVE_MAX_MINUTES: float = 180
+    SCHEDULER_ADAPTIVE_TARGET_NEW: int = 5
+    SCHEDULER_ADAPTIVE_BACKOFF: float = 1.5
+
+    # Background jobs (/jobs) running at once; more wait queued.
+    JOBS_MAX_CONCURRENT: int = 1
+    JOBS_HISTORY_SIZE: int = 100
+
+    INCREMENTAL_CRAWL: bool = True
+    CONDITIONAL_FETCH: bool = True
+    ARTICLE_REFRESH_AFTER_HOURS: float = 0
+
+    PIPELINE_QUEUE_SIZE: int = 10
+    PIPELINE_FETCH_CONCURRENCY: int = 4
+    PIPELINE_PARSE_CONCURRENCY: int = 2
+    PIPELINE_SUMMARIZE_CONCURRENCY: int = 1
+    PIPELINE_STORE_CONCURRENCY: int = 2
+
+    ARTICLE_COUNT_CACHE_SECONDS: float = 30.0
+
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+
+    # Exposes /debug routes (query plans); keep off in production.
+    ENABLE_DEBUG_ENDPOINTS: bool = False
+
+    # Prometheus-format /metrics endpoint and per-route HTTP latency.
+    METRICS_ENABLED: bool = True
+
+    LOG_LEVEL: str = "INFO"
+    LOG_DIR: str = "logs"
+    # "text" or "json" (one object per line, with job/source/article fields).
+    LOG_FORMAT: str = "text"
+    # app.log and error.log rotate at this size; 0 never rotates.
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
+    # Records waiting for the writer thread; more are dropped. 0 is unbounded.
+    LOG_QUEUE_SIZE: int = 10000
+    # Identical warning/error lines are written once per window; 0 writes all.
+    LOG_REPEAT_WINDOW_SECONDS: float = 60.0
+
     BASE_URL: str = "https://vnexpress.net/tin-tuc-24h"
+    # JSON list of sources (see app/core/sources.py); empty scrapes BASE_URL only.
+    SOURCES_FILE: str = ""
+    # Sources scraped at the same time in one run.
+    SOURCE_CONCURRENCY: int = 4
     REQUEST_TIMEOUT: int = 15
 
+    HTML_EXTRACTOR: str = "lxml"
+    PARSER_PROCESS_WORKERS: int = 2
+
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 4
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+
     MONGODB_URI: str
     MONGODB_DB_NAME: str = "article_db"
 
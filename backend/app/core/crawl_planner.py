@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, UpdateOne
+
+from .config import settings
+from .database import MongoDB
+from .sources import Source
+
+# Weight of the latest run in the publish rate estimate.
+RATE_SMOOTHING = 0.5
+
+
+class CrawlPlanner:
+    """Per-feed poll intervals learned from how many new articles each poll finds.
+
+    Every listing URL or category feed of every source has a document in
+    ``crawl_schedule`` with a smoothed publish rate (new articles per minute)
+    and the time of its next poll. After each poll:
+
+    - nothing new: the interval grows by ``SCHEDULER_ADAPTIVE_BACKOFF``
+    - otherwise: the interval becomes the time the feed needs to publish
+      ``SCHEDULER_ADAPTIVE_TARGET_NEW`` articles at the estimated rate, so a
+      busy feed is polled more often and a slow one less
+
+    always within ``SCHEDULER_ADAPTIVE_MIN_MINUTES`` and
+    ``SCHEDULER_ADAPTIVE_MAX_MINUTES``. A feed that failed backs off as if it
+    had been empty. New feeds start at the minimum interval.
+
+    Yields are recorded for every run; only the adaptive schedule uses
+    ``due_feeds`` to decide what to poll.
+    """
+
+    def __init__(
+            self,
+            min_minutes: float,
+            max_minutes: float,
+            target_new: int,
+            backoff: float
+    ):
+        self.min_minutes = min_minutes
+        self.max_minutes = max_minutes
+        self.target_new = target_new
+        self.backoff = backoff
+
+    def _collection(self):
+        return MongoDB.get_client()[settings.MONGODB_DB_NAME]["crawl_schedule"]
+
+    @staticmethod
+    def _feed_id(source_name: str, feed: str) -> str:
+        return f"{source_name} {feed}"
+
+    def _clamp(self, minutes: float) -> float:
+        return min(self.max_minutes, max(self.min_minutes, minutes))
+
+    def next_interval(self, state: Optional[Dict[str, Any]], new: int, failed: bool, now: datetime) -> Dict[str, Any]:
+        """Decide the next poll of a feed from its previous ``state`` and this poll's yield."""
+        interval = state["interval_minutes"] if state else self.min_minutes
+        rate = state.get("rate_per_minute") if state else None
+
+        if state and state.get("last_polled_at"):
+            elapsed = max((now - state["last_polled_at"]).total_seconds() / 60, 1 / 60)
+        else:
+            elapsed = interval
+
+        if not failed:
+            sample = new / elapsed
+            rate = sample if rate is None else RATE_SMOOTHING * sample + (1 - RATE_SMOOTHING) * rate
+
+        if failed:
+            reason = "error"
+            next_interval = interval * self.backoff
+        elif new == 0:
+            reason = "backoff"
+            next_interval = interval * self.backoff
+        else:
+            next_interval = self.target_new / rate if rate else interval
+            reason = "tighten" if next_interval < interval else "relax"
+        next_interval = self._clamp(next_interval)
+
+        return {
+            "interval_minutes": round(next_interval, 2),
+            "rate_per_minute": round(rate, 4) if rate is not None else None,
+            "last_new": new,
+            "last_polled_at": now,
+            "next_poll_at": now + timedelta(minutes=next_interval),
+            "reason": reason
+        }
+
+    async def due_feeds(self, sources: List[Source], now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """Feeds to poll now, by source name; feeds never polled are always due."""
+        now = now or datetime.now()
+        ids = {
+            self._feed_id(source.name, feed): (source.name, feed)
+            for source in sources
+            for feed in source.feeds
+        }
+        not_due = {
+            doc["_id"]
+            async for doc in self._collection().find(
+                {"_id": {"$in": list(ids)}, "next_poll_at": {"$gt": now}}, {"_id": 1}
+            )
+        }
+
+        due: Dict[str, List[str]] = {}
+        for feed_id, (source_name, feed) in ids.items():
+            if feed_id not in not_due:
+                due.setdefault(source_name, []).append(feed)
+        return due
+
+    async def record(self, source_name: str, feeds: Dict[str, Dict[str, Any]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Store the outcome of one poll of ``feeds`` (``ScrapePipeline.stats["feeds"]``)."""
+        if not feeds:
+            return []
+        now = now or datetime.now()
+        ids = {self._feed_id(source_name, feed): feed for feed in feeds}
+        states = {doc["_id"]: doc async for doc in self._collection().find({"_id": {"$in": list(ids)}})}
+
+        decisions, operations = [], []
+        for feed_id, feed in ids.items():
+            decision = {
+                "source": source_name,
+                "feed": feed,
+                **self.next_interval(
+                    states.get(feed_id), feeds[feed]["new"], feeds[feed]["status"] == "error", now
+                )
+            }
+            decisions.append(decision)
+            operations.append(UpdateOne({"_id": feed_id}, {"$set": decision}, upsert=True))
+
+        await self._collection().bulk_write(operations, ordered=False)
+        return decisions
+
+    async def get_plan(self) -> List[Dict[str, Any]]:
+        cursor = self._collection().find({}, {"_id": 0}).sort("next_poll_at", ASCENDING)
+        return await cursor.to_list(length=None)
+
+
+crawl_planner = CrawlPlanner(
+    min_minutes=settings.SCHEDULER_ADAPTIVE_MIN_MINUTES,
+    max_minutes=settings.SCHEDULER_ADAPTIVE_MAX_MINUTES,
+    target_new=settings.SCHEDULER_ADAPTIVE_TARGET_NEW,
+    backoff=settings.SCHEDULER_ADAPTIVE_BACKOFF
+)
@@ -1,5 +1,8 @@
+from datetime import datetime
+
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
 from .config import settings
 from ..utils import logger
 
@@ -22,38 +25,126 @@ class MongoDB:
 
     @classmethod
     async def setup_indexes(cls):
+        """Bring the indexes of every collection in line with ``INDEXES``.
+
+        The ``INDEX_VERSION`` applied last is kept in ``schema_migrations``. When
+        it is older, managed indexes whose definition changed are recreated and
+        names in ``OBSOLETE_INDEXES`` are dropped; once it is current, missing
+        indexes are only created (falling back to the migration if one no longer
+        matches its definition). A database already migrated by a newer version
+        is left alone.
+        """
         try:
             db = cls.get_client()[settings.MONGODB_DB_NAME]
 
-            link_url_index = IndexModel(
-                [("link_url", ASCENDING)],
-                unique=True,
-                name="link_url_index"
-            )
+            migration = await db.schema_migrations.find_one({"_id": "indexes"})
+            applied_version = migration["version"] if migration else 0
 
-            category_index = IndexModel(
-                [("category", ASCENDING)],
-                name="category_lookup"
-            )
+            if applied_version > INDEX_VERSION:
+                logger.warning(f"Index set is at version {applied_version}, newer than {INDEX_VERSION}; not migrating")
+                return
 
-            text_search_index = IndexModel(
-                [("title", TEXT), ("content", TEXT)],
-                name="text_search"
-            )
+            if applied_version == INDEX_VERSION:
+                try:
+                    for collection_name, indexes in INDEXES.items():
+                        await db[collection_name].create_indexes(indexes)
+                    logger.info("Indexes created successfully")
+                    return
+                except OperationFailure as e:
+                    logger.warning(f"Index set differs from version {INDEX_VERSION}, migrating again: {e}")
 
-            created_at_index = IndexModel(
-                [("created_at", DESCENDING)],
-                name="created_at_sort"
+            await _migrate_indexes(db)
+            await db.schema_migrations.update_one(
+                {"_id": "indexes"},
+                {"$set": {"version": INDEX_VERSION, "applied_at": datetime.now()}},
+                upsert=True
             )
-
-            await db.articles.create_indexes(
-                [link_url_index,
-                category_index,
-                text_search_index,
-                created_at_index
-            ])
-
-            logger.info("Indexes created successfully")
+            logger.info(f"Index set migrated from version {applied_version} to {INDEX_VERSION}")
         except Exception as e:
             logger.error(f"Error creating indexes: {e}")
             pass
+
+
+async def _migrate_indexes(db):
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+
+        for name in OBSOLETE_INDEXES.get(collection_name, []):
+            if name in existing:
+                await collection.drop_index(name)
+                logger.info(f"Dropped obsolete index {collection_name}.{name}")
+
+        for index in indexes:
+            document = index.document
+            current = existing.get(document["name"])
+            if current is not None and not _same_index(current, document):
+                await collection.drop_index(document["name"])
+                logger.info(f"Recreating changed index {collection_name}.{document['name']}")
+
+        await collection.create_indexes(indexes)
+
+
+def _same_index(current: dict, document: dict) -> bool:
+    # Text indexes are reported as (_fts, _ftsx) keys, so compare their weights.
+    if "weights" in document:
+        return current.get("weights") == document["weights"]
+    return (
+        list(current["key"]) == list(document["key"].items())
+        and current.get("unique", False) == document.get("unique", False)
+        and current.get("expireAfterSeconds") == document.get("expireAfterSeconds")
+    )
+
+
+# Bump when the set below changes; see MongoDB.setup_indexes.
+INDEX_VERSION = 3
+
+INDEXES = {
+    "articles": [
+        IndexModel([("link_url", ASCENDING)], unique=True, name="link_url_index"),
+        # Listing, feed and per-category listing all sort on (created_at, _id);
+        # with the tiebreaker in the index no page needs an in-memory sort.
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id_sort"),
+        IndexModel(
+            [("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="category_created_at_id_sort"
+        ),
+        # Weighted index over the diacritic-folded fields (see core/search.py).
+        IndexModel(
+            [("search_title", TEXT), ("search_body", TEXT)],
+            weights={"search_title": 10, "search_body": 1},
+            default_language="none",
+            name="search_text"
+        ),
+        IndexModel([("search_terms", ASCENDING)], name="search_terms_prefix"),
+        IndexModel([("summary_status", ASCENDING), ("summary_available_at", ASCENDING)], name="summary_queue"),
+    ],
+    "page_snapshots": [
+        IndexModel([("url", ASCENDING)], unique=True, name="page_url_index"),
+    ],
+    "summary_cache": [
+        IndexModel(
+            [("created_at", ASCENDING)],
+            expireAfterSeconds=settings.SUMMARY_CACHE_TTL_SECONDS,
+            name="summary_cache_ttl"
+        ),
+    ],
+    "scheduler_runs": [
+        IndexModel([("started_at", DESCENDING)], name="started_at_sort"),
+        IndexModel(
+            [("finished_at", ASCENDING)],
+            expireAfterSeconds=settings.SCHEDULER_RUN_HISTORY_DAYS * 24 * 3600,
+            name="scheduler_runs_ttl"
+        ),
+    ],
+}
+
+OBSOLETE_INDEXES = {
+    "articles": [
+        # Only one text index is allowed per collection; replaced by search_text.
+        "text_search",
+        # Prefixes of category_created_at_id_sort and created_at_id_sort.
+        "category_lookup",
+        "created_at_sort",
+    ],
+}
@@ -0,0 +1,250 @@
+"""Extractive summarizer for Vietnamese news text, used when Gemini is unavailable.
+
+Sentences are split with rules for Vietnamese abbreviations, initials, decimals
+and quotations, weighted with TF-IDF over syllable unigrams and bigrams, and
+ranked with TextRank. The weighting, the sentence similarities and the
+power iteration are computed for a whole batch of articles at once with NumPy
+(similarities are stacked into one ``articles x sentences x sentences`` array),
+so summarizing many articles costs little more than tokenizing them.
+
+Like ``extractors``, this module does not import settings or the app logger so
+it can run inside parser pool workers.
+"""
+import re
+from typing import List, Sequence
+
+import numpy as np
+
+ABBREVIATIONS = frozenset({
+    "tp", "tt", "ts", "ths", "pgs", "gs", "bs", "ks", "ls", "nxb", "ubnd", "hđnd",
+    "tx", "mr", "dr", "sp", "nov", "vs", "v.v"
+})
+
+STOPWORDS = frozenset({
+    "và", "của", "là", "có", "được", "các", "những", "cho", "trong", "với", "đã",
+    "này", "một", "không", "người", "khi", "từ", "để", "theo", "về", "đến", "tại",
+    "ở", "thì", "như", "cũng", "sẽ", "đang", "ra", "vào", "lại", "nhiều", "trên",
+    "sau", "nhưng", "mà", "do", "vì", "nên", "hơn", "rất", "còn", "nếu", "bị",
+    "the", "of", "and", "a", "to", "in"
+})
+
+OPENING_QUOTES = '"“‘(«'
+CLOSING = '"”’\')»'
+
+_BOUNDARY = re.compile(r'([.!?…]+)([' + re.escape(CLOSING) + r']*)(\s+)')
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+MAX_CANDIDATES = 60
+MIN_SENTENCE_TOKENS = 5
+
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    """Whether the period at ``text[end]`` closes an abbreviation or an initial."""
+    start = end
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    token = text[start:end].lstrip(OPENING_QUOTES)
+    if not token:
+        return False
+    if len(token) == 1:
+        # Initials such as "Nguyễn Văn A." or "J. K. Rowling": a capital letter
+        # that starts the text or follows a capitalised word. One-letter words
+        # ("đồng ý.", "loại A.") still end sentences.
+        previous_end = start
+        while previous_end > 0 and text[previous_end - 1].isspace():
+            previous_end -= 1
+        previous_start = previous_end
+        while previous_start > 0 and not text[previous_start - 1].isspace():
+            previous_start -= 1
+        previous = text[previous_start:previous_end].lstrip(OPENING_QUOTES)
+        return token.isupper() and (not previous or previous[:1].isupper())
+    token = token.lower()
+    return token in ABBREVIATIONS or token.rsplit('.', 1)[-1] in ABBREVIATIONS
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split Vietnamese prose into sentences.
+
+    A boundary is terminal punctuation (plus closing quotes) followed by
+    whitespace and a capital letter, digit or opening quote, outside of a
+    “curly” quotation, and not right after an abbreviation or an initial.
+    Decimals such as ``2.650`` or ``1,2`` never contain whitespace and are kept.
+    """
+    text = ' '.join(text.split())
+    sentences = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        end = match.end(2)
+        following = text[match.end():match.end() + 1]
+        if not following or not (following.isupper() or following.isdigit() or following in OPENING_QUOTES):
+            continue
+        if match.group(1) == '.' and _is_abbreviation(text, match.start(1)):
+            continue
+        if text.count('“', start, end) > text.count('”', start, end):
+            continue
+        sentence = text[start:end].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def tokenize(sentence: str) -> List[str]:
+    """Syllable unigrams plus bigrams, since Vietnamese words span several syllables."""
+    syllables = [word for word in _WORD.findall(sentence.lower()) if not word.isdigit()]
+    terms = [word for word in syllables if word not in STOPWORDS]
+    terms.extend(f"{a}_{b}" for a, b in zip(syllables, syllables[1:]))
+    return terms
+
+
+class ExtractiveSummarizer:
+    def __init__(
+            self,
+            max_sentences: int = 3,
+            damping: float = 0.85,
+            iterations: int = 30,
+            lead_weight: float = 1.0
+    ):
+        self.max_sentences = max_sentences
+        self.damping = damping
+        self.iterations = iterations
+        # News puts the gist first; sentence i gets a (1 + lead_weight / (i + 1)) boost.
+        self.lead_weight = lead_weight
+
+    def _score(self, documents: List[List[List[str]]]) -> np.ndarray:
+        """TextRank scores, ``articles x MAX_CANDIDATES`` padded with -inf."""
+        batch = len(documents)
+        width = max(len(sentences) for sentences in documents)
+
+        vocabulary = {}
+        rows, cols, docs, slots = [], [], [], []
+        sentence_index = 0
+        for doc_index, sentences in enumerate(documents):
+            for slot, terms in enumerate(sentences):
+                for term in terms:
+                    rows.append(sentence_index)
+                    cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                docs.append(doc_index)
+                slots.append(slot)
+                sentence_index += 1
+
+        scores = np.full((batch, width), -np.inf)
+        lengths = np.array([len(sentences) for sentences in documents])
+        if not rows:
+            return scores
+
+        n_sentences = sentence_index
+        n_terms = len(vocabulary)
+        sentence_doc = np.asarray(docs)
+        sentence_slot = np.asarray(slots)
+
+        # Term frequencies as COO entries (sentence, term, count).
+        keys, counts = np.unique(
+            np.asarray(rows, dtype=np.int64) * n_terms + np.asarray(cols, dtype=np.int64),
+            return_counts=True
+        )
+        entry_sentence = keys // n_terms
+        entry_term = keys % n_terms
+
+        document_frequency = np.bincount(entry_term, minlength=n_terms)
+        idf = np.log((1 + n_sentences) / (1 + document_frequency)) + 1.0
+        values = (1.0 + np.log(counts)) * idf[entry_term]
+        norms = np.sqrt(np.bincount(entry_sentence, weights=values ** 2, minlength=n_sentences))
+        values /= norms[entry_sentence]
+
+        # Cosine similarities only between sentences of the same article: join the
+        # entries on (article, term) and accumulate every pair of the group.
+        entry_doc = sentence_doc[entry_sentence]
+        group_key = entry_doc * n_terms + entry_term
+        order = np.argsort(group_key, kind='stable')
+        group_key = group_key[order]
+        entry_sentence = entry_sentence[order]
+        values = values[order]
+
+        boundaries = np.flatnonzero(np.diff(group_key)) + 1
+        group_start = np.concatenate(([0], boundaries))
+        group_size = np.diff(np.concatenate((group_start, [len(group_key)])))
+        entry_group_start = np.repeat(group_start, group_size)
+        entry_group_size = np.repeat(group_size, group_size)
+
+        left = np.repeat(np.arange(len(group_key)), entry_group_size)
+        pair_offset = np.arange(len(left)) - np.repeat(np.cumsum(entry_group_size) - entry_group_size, entry_group_size)
+        right = entry_group_start[left] + pair_offset
+
+        left_sentence = entry_sentence[left]
+        right_sentence = entry_sentence[right]
+        flat = (
+            sentence_doc[left_sentence] * width * width
+            + sentence_slot[left_sentence] * width
+            + sentence_slot[right_sentence]
+        )
+        similarity = np.bincount(
+            flat,
+            weights=values[left] * values[right],
+            minlength=batch * width * width
+        ).reshape(batch, width, width)
+
+        diagonal = np.arange(width)
+        similarity[:, diagonal, diagonal] = 0.0
+
+        # Batched power iteration; articles are padded to ``width`` sentences.
+        valid = diagonal[None, :] < lengths[:, None]
+        out_weight = similarity.sum(axis=2, keepdims=True)
+        transition = np.divide(similarity, out_weight, out=np.zeros_like(similarity), where=out_weight > 0)
+        teleport = valid / lengths[:, None]
+        rank = teleport.copy()
+        for _ in range(self.iterations):
+            rank = (1 - self.damping) * teleport + self.damping * np.einsum('bij,bi->bj', transition, rank)
+
+        lead = 1.0 + self.lead_weight / (diagonal + 1.0)
+        scores = np.where(valid, rank * lengths[:, None] * lead[None, :], -np.inf)
+        return scores
+
+    def summarize_batch(self, texts: Sequence[str]) -> List[str]:
+        results = [''] * len(texts)
+        candidates, documents = [], []
+
+        for index, text in enumerate(texts):
+            sentences = split_sentences(text or '')
+            if len(sentences) <= self.max_sentences:
+                results[index] = ' '.join(sentences)
+                continue
+
+            sentences = sentences[:MAX_CANDIDATES]
+            terms = [tokenize(sentence) for sentence in sentences]
+            # Very short fragments (bylines, "Tin liên quan") only compete when
+            # there are not enough real sentences.
+            kept = [slot for slot, tokens in enumerate(terms) if len(tokens) >= MIN_SENTENCE_TOKENS]
+            if len(kept) < self.max_sentences:
+                kept = list(range(len(sentences)))
+
+            candidates.append((index, [sentences[slot] for slot in kept]))
+            documents.append([terms[slot] for slot in kept])
+
+        if not documents:
+            return results
+
+        scores = self._score(documents)
+        top = np.argsort(-scores, axis=1, kind='stable')[:, :self.max_sentences]
+        for (index, sentences), chosen in zip(candidates, top):
+            chosen = sorted(slot for slot in chosen.tolist() if slot < len(sentences))
+            results[index] = ' '.join(sentences[slot] for slot in chosen)
+        return results
+
+    def summarize(self, text: str) -> str:
+        return self.summarize_batch([text])[0]
+
+
+_default = ExtractiveSummarizer()
+
+
+def summarize_text(text: str) -> str:
+    return _default.summarize(text)
+
+
+def summarize_texts(texts: Sequence[str]) -> List[str]:
+    return _default.summarize_batch(texts)
@@ -0,0 +1,348 @@
+"""HTML extraction engines for vnexpress listing and article pages.
+
+Every engine returns plain dicts so results can cross a process boundary:
+
+- ``parse_listing(html)`` -> list of article dicts (title, link_url, location,
+  datetime, description, image_url, plus empty category/content/summary)
+- ``parse_article(html)`` -> ``{'content': ..., 'category': ...}`` or ``None``
+  when the page has no ``article.fck_detail``
+
+``Html5libExtractor`` is the original BeautifulSoup implementation and is kept
+as the reference; ``LxmlExtractor`` must produce identical output (see
+app/tests/scripts/bench_extractors.py).
+
+``LxmlExtractor`` also takes CSS selector overrides (keys of
+``LxmlExtractor.SELECTORS``), which is how a source with similar markup is
+configured without code. A source that needs more than that names its own
+``BaseExtractor`` subclass as ``"package.module:ClassName"``.
+
+This module deliberately does not import settings or the app logger, so parser
+pool workers can import it cheaply.
+"""
+import asyncio
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+
+
+def _empty_article(title: str, link_url: str) -> Dict[str, Any]:
+    return {
+        'title': title,
+        'link_url': link_url,
+        'location': None,
+        'datetime': None,
+        'description': None,
+        'image_url': None,
+        'category': None,
+        'content': None,
+        'summary': None
+    }
+
+
+class BaseExtractor:
+    name: str = ""
+
+    def __init__(self, selectors: Optional[Dict[str, str]] = None):
+        if selectors:
+            raise ValueError(f"The '{self.name or type(self).__name__}' extractor does not take custom selectors")
+
+    def parse_listing(self, html: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def parse_article(self, html: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class Html5libExtractor(BaseExtractor):
+    name = "html5lib"
+
+    def _parse_listing_item(self, article: Any) -> Optional[Dict[str, Any]]:
+        title_tag = article.find('h3', class_='title-news')
+        if not title_tag:
+            return None
+
+        title_tag_next = title_tag.find('a')
+        if not title_tag_next or not title_tag_next.has_attr('href'):
+            return None
+
+        article_data = _empty_article(title_tag.get_text(strip=True), title_tag_next['href'])
+
+        location_tag = article.find('span', class_='location-stamp')
+        if location_tag:
+            article_data['location'] = location_tag.get_text(strip=True)
+
+        time_tag = article.find('span', class_='time-ago')
+        if time_tag and 'datetime' in time_tag.attrs:
+            article_data['datetime'] = str(time_tag['datetime'])
+
+        description_tag = article.find('p', class_='description')
+        if description_tag:
+            description_link = description_tag.find('a')
+            if description_link:
+                article_data['description'] = description_link.get_text(strip=True)
+
+        image_tag = article.find('div', class_='thumb-art')
+        if image_tag:
+            img = image_tag.find('img')
+            if img:
+                article_data['image_url'] = img.get('data-src') or img.get('src')
+
+        return article_data
+
+    def parse_listing(self, html: str) -> List[Dict[str, Any]]:
+        soup = BeautifulSoup(html, "html5lib")
+
+        listing = []
+        for article in soup.find_all("article", class_="thumb-left"):
+            if article.find('ins', class_='adsbyeclick') or article.find('script'):
+                continue
+
+            article_data = self._parse_listing_item(article)
+            if article_data:
+                listing.append(article_data)
+
+        return listing
+
+    def parse_article(self, html: str) -> Optional[Dict[str, Any]]:
+        article_soup = BeautifulSoup(html, 'html5lib')
+
+        if not article_soup.find('article', class_="fck_detail"):
+            return None
+
+        content_paragraphs = article_soup.find_all('p', class_='Normal')
+        full_text = ' '.join(p.get_text(strip=True) for p in content_paragraphs)
+
+        ul = article_soup.find('ul', class_='breadcrumb')
+        category_tag = ul.find('a', {'data-medium': True}) if ul else None
+        category = category_tag.get_text(strip=True) if category_tag else None
+
+        return {
+            'content': full_text,
+            'category': category
+        }
+
+
+def _collect_text(element, parts: List[str]):
+    # Mirrors BeautifulSoup's get_text(strip=True) on an html5lib tree: every text
+    # node is stripped and kept (script/style included), comment bodies are
+    # dropped but the text that follows them is not.
+    if element.text and isinstance(element.tag, str):
+        text = element.text.strip()
+        if text:
+            parts.append(text)
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail:
+            tail = child.tail.strip()
+            if tail:
+                parts.append(tail)
+
+
+def _text(element) -> str:
+    parts: List[str] = []
+    _collect_text(element, parts)
+    return ''.join(parts)
+
+
+def _first(selector: CSSSelector, element):
+    matches = selector(element)
+    return matches[0] if matches else None
+
+
+class LxmlExtractor(BaseExtractor):
+    """libxml2-backed engine with selectors compiled once to XPath."""
+
+    name = "lxml"
+
+    parser = lxml_html.HTMLParser(
+        collect_ids=False,
+        no_network=True,
+        encoding='utf-8'
+    )
+
+    # vnexpress markup; a source overrides any of these by key.
+    SELECTORS = {
+        'listing_item': 'article.thumb-left',
+        'listing_ad': 'ins.adsbyeclick, script',
+        'title': 'h3.title-news',
+        'link': 'a',
+        'location': 'span.location-stamp',
+        'time_ago': 'span.time-ago',
+        'description': 'p.description',
+        'thumb': 'div.thumb-art',
+        'image': 'img',
+
+        'detail_article': 'article.fck_detail',
+        'paragraph': 'p.Normal',
+        'breadcrumb': 'ul.breadcrumb',
+        'category_link': 'a[data-medium]',
+    }
+
+    def __init__(self, selectors: Optional[Dict[str, str]] = None):
+        unknown = set(selectors or {}) - set(self.SELECTORS)
+        if unknown:
+            raise ValueError(f"Unknown selector keys {sorted(unknown)}, expected some of {sorted(self.SELECTORS)}")
+        for key, css in {**self.SELECTORS, **(selectors or {})}.items():
+            setattr(self, key, CSSSelector(css))
+
+    def _document(self, html: str):
+        if not html.strip():
+            return None
+        return etree.fromstring(html.encode('utf-8'), self.parser)
+
+    def _descendant(self, selector: CSSSelector, element):
+        # CSSSelector matches descendant-or-self; BeautifulSoup.find() only
+        # looks at descendants.
+        for match in selector(element):
+            if match is not element:
+                return match
+        return None
+
+    def _parse_listing_item(self, article) -> Optional[Dict[str, Any]]:
+        title_tag = self._descendant(self.title, article)
+        if title_tag is None:
+            return None
+
+        title_tag_next = self._descendant(self.link, title_tag)
+        if title_tag_next is None or title_tag_next.get('href') is None:
+            return None
+
+        article_data = _empty_article(_text(title_tag), title_tag_next.get('href'))
+
+        location_tag = self._descendant(self.location, article)
+        if location_tag is not None:
+            article_data['location'] = _text(location_tag)
+
+        time_tag = self._descendant(self.time_ago, article)
+        if time_tag is not None and time_tag.get('datetime') is not None:
+            article_data['datetime'] = time_tag.get('datetime')
+
+        description_tag = self._descendant(self.description, article)
+        if description_tag is not None:
+            description_link = self._descendant(self.link, description_tag)
+            if description_link is not None:
+                article_data['description'] = _text(description_link)
+
+        image_tag = self._descendant(self.thumb, article)
+        if image_tag is not None:
+            img = self._descendant(self.image, image_tag)
+            if img is not None:
+                article_data['image_url'] = img.get('data-src') or img.get('src')
+
+        return article_data
+
+    def parse_listing(self, html: str) -> List[Dict[str, Any]]:
+        document = self._document(html)
+        if document is None:
+            return []
+
+        listing = []
+        for article in self.listing_item(document):
+            if self._descendant(self.listing_ad, article) is not None:
+                continue
+
+            article_data = self._parse_listing_item(article)
+            if article_data:
+                listing.append(article_data)
+
+        return listing
+
+    def parse_article(self, html: str) -> Optional[Dict[str, Any]]:
+        document = self._document(html)
+        if document is None or _first(self.detail_article, document) is None:
+            return None
+
+        full_text = ' '.join(_text(p) for p in self.paragraph(document))
+
+        ul = _first(self.breadcrumb, document)
+        category_tag = self._descendant(self.category_link, ul) if ul is not None else None
+        category = _text(category_tag) if category_tag is not None else None
+
+        return {
+            'content': full_text,
+            'category': category
+        }
+
+
+EXTRACTORS = {
+    Html5libExtractor.name: Html5libExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+}
+
+_instances: Dict[tuple, BaseExtractor] = {}
+
+
+def _extractor_class(name: str) -> type:
+    if name in EXTRACTORS:
+        return EXTRACTORS[name]
+    if ':' in name:
+        module_name, _, class_name = name.partition(':')
+        extractor_class = getattr(importlib.import_module(module_name), class_name, None)
+        if isinstance(extractor_class, type) and issubclass(extractor_class, BaseExtractor):
+            return extractor_class
+    raise ValueError(
+        f"Unknown HTML extractor '{name}', expected one of {sorted(EXTRACTORS)} "
+        f"or a 'package.module:ClassName' BaseExtractor subclass"
+    )
+
+
+def get_extractor(name: str, selectors: Optional[Dict[str, str]] = None) -> BaseExtractor:
+    key = (name, tuple(sorted((selectors or {}).items())))
+    extractor = _instances.get(key)
+    if extractor is None:
+        extractor = _instances[key] = _extractor_class(name)(selectors or None)
+    return extractor
+
+
+def parse_listing(html: str, engine: str, selectors: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    return get_extractor(engine, selectors).parse_listing(html)
+
+
+def parse_article(html: str, engine: str, selectors: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+    return get_extractor(engine, selectors).parse_article(html)
+
+
+class ParserPool:
+    """Process pool that keeps HTML parsing off the event loop.
+
+    With ``workers=0`` parsing runs inline, which is what the benchmarks use to
+    measure raw engine throughput.
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    workers: int = 0
+
+    @classmethod
+    def configure(cls, workers: int):
+        cls.workers = workers
+
+    @classmethod
+    def get_executor(cls) -> Optional[ProcessPoolExecutor]:
+        if cls.workers <= 0:
+            return None
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(
+                max_workers=cls.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls):
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+    @classmethod
+    async def run(cls, func: Callable, *args):
+        executor = cls.get_executor()
+        if executor is None:
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from . import metrics
+from .config import settings
+from .rate_limiter import RateLimiter
+from ..utils import logger
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClient:
+    """Process-wide async HTTP client shared by every scraper instance.
+
+    Connections are pooled and kept alive between requests, and each host gets
+    its own semaphore so a single site can never take the whole pool. A host
+    can be given its own politeness budget with ``configure_host``: fewer
+    concurrent requests than ``HTTP_MAX_CONNECTIONS_PER_HOST`` and/or a
+    requests-per-minute limit.
+    """
+
+    _client: httpx.AsyncClient = None
+    _host_semaphores: dict[str, asyncio.Semaphore] = {}
+    _host_limits: dict[str, tuple[int, int]] = {}
+    _host_limiters: dict[str, RateLimiter] = {}
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+            use_http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+            if settings.HTTP2_ENABLED and not HTTP2_AVAILABLE:
+                logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+
+            cls._client = httpx.AsyncClient(
+                http2=use_http2,
+                limits=limits,
+                timeout=httpx.Timeout(settings.REQUEST_TIMEOUT),
+                follow_redirects=True,
+                headers={
+                    'User-Agent': 'Mozilla/5.0 (compatible; ArticleScraper/1.0;)'
+                }
+            )
+            cls._host_semaphores = {}
+            logger.info(f"HTTP client created (http2={use_http2}, max_connections={settings.HTTP_MAX_CONNECTIONS})")
+        return cls._client
+
+    @classmethod
+    async def close_client(cls):
+        if cls._client is not None and not cls._client.is_closed:
+            await cls._client.aclose()
+            logger.info("HTTP client closed")
+        cls._client = None
+        cls._host_semaphores = {}
+
+    @classmethod
+    def configure_host(cls, host: str, max_concurrency: int = 0, requests_per_minute: int = 0):
+        """Set the politeness budget of ``host`` (0 keeps the default / no limit)."""
+        host = host.lower()
+        limits = (max_concurrency, requests_per_minute)
+        if cls._host_limits.get(host) == limits:
+            return
+        cls._host_limits[host] = limits
+        cls._host_semaphores.pop(host, None)
+        cls._host_limiters.pop(host, None)
+        if requests_per_minute:
+            cls._host_limiters[host] = RateLimiter(requests_per_minute)
+
+    @classmethod
+    def _host_semaphore(cls, host: str) -> asyncio.Semaphore:
+        semaphore = cls._host_semaphores.get(host)
+        if semaphore is None:
+            max_concurrency = cls._host_limits.get(host, (0, 0))[0]
+            semaphore = asyncio.Semaphore(max_concurrency or settings.HTTP_MAX_CONNECTIONS_PER_HOST)
+            cls._host_semaphores[host] = semaphore
+        return semaphore
+
+    @classmethod
+    async def get(cls, url: str, **kwargs) -> httpx.Response:
+        client = cls.get_client()
+        host = urlsplit(url).netloc.lower()
+        async with cls._host_semaphore(host):
+            limiter = cls._host_limiters.get(host)
+            if limiter is not None:
+                await limiter.acquire()
+            metrics.fetches_in_flight.inc()
+            started = time.perf_counter()
+            result = "error"
+            try:
+                response = await client.get(url, **kwargs)
+                result = "not_modified" if response.status_code == 304 else "ok"
+                metrics.fetch_bytes.inc(len(response.content))
+                return response
+            finally:
+                metrics.fetches_in_flight.dec()
+                metrics.fetch_duration.observe(time.perf_counter() - started, result=result)
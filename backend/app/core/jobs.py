@@ -0,0 +1,250 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from . import metrics
+from .config import settings
+from ..utils import log_context, logger
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+# The work did not run, e.g. another node held the scrape lease.
+SKIPPED = "skipped"
+
+ACTIVE = (QUEUED, RUNNING)
+
+# Pipeline events that advance the job's progress counters.
+_PROGRESS_EVENTS = ("fetched", "summarized", "skipped", "stored", "failed")
+
+
+class Job:
+    """One submitted unit of work and its progress, as reported by ``/jobs``."""
+
+    def __init__(self, kind: str, key: str, trigger: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.trigger = trigger
+        self.status = QUEUED
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.progress: Dict[str, int] = {}
+        # Event name -> {"count", "first_at", "last_at"}: when each stage started
+        # producing and when it last did.
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._subscribers: List[asyncio.Queue] = []
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue of the ``(event, data)`` pairs recorded from now on, then ``None``
+        once the job finished."""
+        queue: asyncio.Queue = asyncio.Queue()
+        if self.status in ACTIVE:
+            self._subscribers.append(queue)
+        else:
+            queue.put_nowait(None)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def _close_subscribers(self):
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+        self._subscribers = []
+
+    def record_event(self, event: str, data: Any):
+        """Pipeline listener (see ``ScrapePipeline.add_listener``); ``article``
+        events carry a stored article and only go to subscribers."""
+        for queue in self._subscribers:
+            queue.put_nowait((event, data))
+        if event == "article":
+            return
+
+        now = datetime.now()
+        stage = self.stages.setdefault(event, {"count": 0, "first_at": now, "last_at": now})
+        stage["last_at"] = now
+
+        if event == "discovered":
+            count = data.get("pending", 0)
+            self._add("discovered", data.get("discovered", 0))
+            self._add("pending", count)
+        elif event == "stored":
+            # Identical articles are also reported one by one as "skipped" and
+            # failed writes count as "failed", so "stored" only counts writes.
+            count = data.get("inserted", 0) + data.get("updated", 0)
+            for key in ("inserted", "updated", "unchanged"):
+                self._add(key, data.get(key, 0))
+            self._add("failed", data.get("failed", 0))
+        elif event == "failed":
+            count = data.get("count", 1)
+        else:
+            count = 1
+        stage["count"] += count
+        if event in _PROGRESS_EVENTS:
+            self._add(event, count)
+
+    def _add(self, counter: str, amount: int):
+        self.progress[counter] = self.progress.get(counter, 0) + amount
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return round(((self.finished_at or datetime.now()) - self.started_at).total_seconds(), 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "trigger": self.trigger,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": self.duration_seconds,
+            "progress": dict(self.progress),
+            "stages": {
+                name: {
+                    **stage,
+                    "duration_seconds": round((stage["last_at"] - stage["first_at"]).total_seconds(), 3)
+                }
+                for name, stage in self.stages.items()
+            },
+            "result": self.result,
+            "error": self.error
+        }
+
+    async def wait(self) -> "Job":
+        if self._task is not None:
+            await asyncio.gather(asyncio.shield(self._task), return_exceptions=True)
+        return self
+
+
+class JobManager:
+    """Runs background work as tracked jobs with a cap on how many run at once.
+
+    A submission with the same ``key`` as a queued or running job is coalesced
+    into that job instead of starting another one. At most ``max_concurrent``
+    jobs run at a time and the rest wait in ``queued``; the last
+    ``history_size`` finished jobs are kept for ``GET /jobs``.
+
+    Jobs live in this process only. Scrape jobs also take the cluster-wide
+    ``scrape_run`` lease (see ``ArticleScheduler``), so they never overlap a
+    scrape on another node.
+    """
+
+    def __init__(self, max_concurrent: int, history_size: int):
+        self.max_concurrent = max(1, max_concurrent)
+        self.history_size = history_size
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        return self._slots
+
+    def submit(
+            self,
+            kind: str,
+            work: Callable[[Job], Awaitable[Any]],
+            key: Optional[str] = None,
+            trigger: str = "api"
+    ) -> tuple[Job, bool]:
+        """Start ``work(job)`` as a job; returns ``(job, created)``.
+
+        ``created`` is False when an active job with the same ``key`` (default
+        ``kind``) was returned instead. ``work`` returning ``None`` marks the job
+        skipped.
+        """
+        key = key or kind
+        job = self.find_active(key)
+        if job is not None:
+            logger.info(f"Coalescing {trigger} {kind} request into job {job.id}")
+            return job, False
+
+        job = Job(kind, key, trigger)
+        self._jobs[job.id] = job
+        with log_context(job_id=job.id, job_kind=kind):
+            job._task = asyncio.create_task(self._run(job, work))
+        self._prune()
+        logger.info(f"Job {job.id} ({kind}, {trigger}) submitted")
+        return job, True
+
+    async def _run(self, job: Job, work: Callable[[Job], Awaitable[Any]]):
+        try:
+            async with self._semaphore():
+                job.status = RUNNING
+                job.started_at = datetime.now()
+                result = await work(job)
+            job.result = result
+            job.status = SUCCEEDED if result is not None else SKIPPED
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            logger.error(f"Job {job.id} ({job.kind}) failed: {str(e)}", exc_info=True)
+        finally:
+            job.finished_at = datetime.now()
+            job._close_subscribers()
+            logger.info(f"Job {job.id} ({job.kind}) finished with status {job.status}")
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in ACTIVE]
+        for job_id in finished[:max(0, len(finished) - self.history_size)]:
+            del self._jobs[job_id]
+
+    def find_active(self, key: str) -> Optional[Job]:
+        """The queued or running job submitted with ``key``, if any."""
+        for job in self._jobs.values():
+            if job.key == key and job.status in ACTIVE:
+                return job
+        return None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        jobs = [job for job in self._jobs.values() if kind is None or job.kind == kind]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job and wait for it to stop; ``None`` if unknown."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status in ACTIVE and job._task is not None:
+            job._task.cancel()
+            await job.wait()
+        return job
+
+    def counts(self) -> Dict[tuple, int]:
+        counts = {(status,): 0 for status in ACTIVE}
+        for job in self._jobs.values():
+            if job.status in ACTIVE:
+                counts[(job.status,)] += 1
+        return counts
+
+    async def shutdown(self):
+        for job in list(self._jobs.values()):
+            if job.status in ACTIVE and job._task is not None:
+                job._task.cancel()
+        await asyncio.gather(
+            *(job._task for job in self._jobs.values() if job._task is not None),
+            return_exceptions=True
+        )
+
+
+job_manager = JobManager(settings.JOBS_MAX_CONCURRENT, settings.JOBS_HISTORY_SIZE)
+metrics.jobs_active.set_function(job_manager.counts)
@@ -0,0 +1,69 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from .config import settings
+from .database import MongoDB
+
+# Identifies this process in lease documents and run history.
+NODE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class MongoLease:
+    """Named lock held by one process at a time, stored in ``scheduler_leases``.
+
+    ``acquire()`` takes the lease when it is free or expired and extends it when
+    this process already holds it, so calling it every ``ttl_seconds / 3`` or so
+    is both the election and the heartbeat. A holder that dies simply stops
+    renewing and the lease passes to another process once it expires.
+
+    Expiry uses each node's clock, like the summary queue leases, so nodes are
+    expected to be NTP-synced to well under ``ttl_seconds``.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, owner: str = NODE_ID):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.owner = owner
+        self._held_until: Optional[datetime] = None
+
+    def _collection(self):
+        return MongoDB.get_client()[settings.MONGODB_DB_NAME]["scheduler_leases"]
+
+    @property
+    def is_held(self) -> bool:
+        return self._held_until is not None and datetime.now() < self._held_until
+
+    async def acquire(self) -> bool:
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        try:
+            await self._collection().update_one(
+                {"_id": self.name, "$or": [{"owner": self.owner}, {"expires_at": {"$lte": now}}]},
+                {
+                    "$set": {"owner": self.owner, "expires_at": expires_at, "renewed_at": now},
+                    "$setOnInsert": {"created_at": now}
+                },
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # Someone else holds an unexpired lease, so the filter did not match
+            # and the upsert collided with their document.
+            self._held_until = None
+            return False
+        self._held_until = expires_at
+        return True
+
+    async def release(self):
+        if self._held_until is None:
+            return
+        self._held_until = None
+        await self._collection().delete_one({"_id": self.name, "owner": self.owner})
+
+    async def get_owner(self) -> Optional[str]:
+        doc = await self._collection().find_one({"_id": self.name, "expires_at": {"$gt": datetime.now()}})
+        return doc["owner"] if doc else None
@@ -0,0 +1,294 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain dicts keyed by label values, updated
+from the event loop without locks; an observation is a dict lookup and an
+add (plus a ``bisect`` for histograms), so instrumenting hot paths costs next
+to nothing. ``registry.render()`` produces the body served on ``/metrics``.
+
+Keep label values to small, fixed sets (stage names, outcomes, route
+templates) -- every distinct combination is a separate series.
+"""
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; spans a fast local parse up to a slow LLM call.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, "_Metric"] = {}
+
+    def register(self, metric: "_Metric"):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            registry: Optional[MetricsRegistry] = registry
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(labels[name] for name in self.labelnames)
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """A value that goes up and down.
+
+    ``set_function`` makes the gauge read its value(s) only when rendered,
+    for numbers other code already keeps (queue sizes, waiting callers); the
+    function returns a number, or a ``{label values: number}`` dict for a
+    labelled gauge.
+    """
+    type = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], Union[float, Dict[LabelValues, float]]]] = None
+
+    def set(self, value: float, **labels: str):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], Union[float, Dict[LabelValues, float]]]):
+        self._function = function
+
+    def samples(self) -> Iterator[str]:
+        values = self._values
+        if self._function is not None:
+            result = self._function()
+            values = result if isinstance(result, dict) else {(): result}
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last slot is +Inf) and the sum.
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> Iterator[str]:
+        bucket_labels = self.labelnames + ("le",)
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(bucket_labels, key + (_format_value(bound),))} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the latency of every HTTP request.
+
+    Requests are labelled with the matched route template (``/api/v1/articles/{article_id}``),
+    never the raw path, so ids and query strings do not create new series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=_route_template(scope),
+                status=str(status)
+            )
+
+
+def _route_template(scope: Scope) -> str:
+    # Newer FastAPI versions leave the un-prefixed router route in ``scope["route"]``
+    # and keep the full path on the effective route context.
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+# -- scraping ---------------------------------------------------------------
+
+fetch_duration = Histogram(
+    "scraper_fetch_duration_seconds", "Time to download a page, by result (ok, not_modified, error).",
+    ["result"]
+)
+fetch_bytes = Counter("scraper_fetch_bytes_total", "Response body bytes downloaded.")
+fetches_in_flight = Gauge("scraper_fetches_in_flight", "Page downloads currently in progress.")
+
+parse_duration = Histogram("pipeline_parse_duration_seconds", "Time to extract an article from its HTML.")
+store_duration = Histogram("pipeline_store_duration_seconds", "Time to write one batch of articles.")
+articles_stored = Counter(
+    "pipeline_articles_total", "Articles written by the pipeline, by result (inserted, updated, unchanged, failed).",
+    ["result"]
+)
+pipeline_queue_depth = Gauge("pipeline_queue_depth", "Items waiting between pipeline stages.", ["queue"])
+
+scrape_job_duration = Histogram(
+    "scrape_job_duration_seconds", "Duration of scheduled scrape runs, by status.", ["status"],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+)
+scrape_job_last_success = Gauge(
+    "scrape_job_last_success_timestamp_seconds", "Unix time of the last successful scheduled scrape."
+)
+jobs_active = Gauge("jobs_active", "Background jobs queued or running, by status.", ["status"])
+
+# -- summarization ------------------------------------------------------------
+
+gemini_request_duration = Histogram(
+    "gemini_request_duration_seconds",
+    "Latency of each Gemini call attempt, by kind (single, batch) and outcome (success, error, rate_limited); "
+    "the _count series is the number of calls.",
+    ["kind", "outcome"]
+)
+gemini_tokens = Counter("gemini_tokens_total", "Tokens reported by Gemini, by type (prompt, completion).", ["type"])
+gemini_quota_skips = Counter(
+    "gemini_quota_skips_total", "Summaries not attempted because the local rate limiter had no quota in time."
+)
+gemini_waiting = Gauge("gemini_rate_limiter_waiting", "Callers sleeping in the Gemini rate limiter.")
+
+summary_duration = Histogram(
+    "summary_duration_seconds",
+    "Time to produce one article summary, including rate limiting and retries, by outcome.",
+    ["outcome"]
+)
+summaries = Counter(
+    "summaries_total", "Summaries produced, by source (gemini, cache, fallback); fallback / all is the fallback rate.",
+    ["source"]
+)
+summary_queue_depth = Gauge("summary_queue_depth", "Articles waiting for (or being given) a Gemini summary.")
+summary_queue_lag = Gauge("summary_queue_lag_seconds", "Age of the oldest article ready to be summarized.")
+
+# -- API --------------------------------------------------------------------
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method, route template and status.",
+    ["method", "route", "status"]
+)
+response_cache_lookups = Counter(
+    "response_cache_lookups_total", "Article read responses looked up in the response cache, by result (hit, miss).",
+    ["result"]
+)
+response_cache_not_modified = Counter(
+    "response_cache_not_modified_total", "Article read requests answered 304 because their ETag still matched."
+)
+response_cache_entries = Gauge("response_cache_entries", "Encoded responses held in the response cache.")
\ No newline at end of file
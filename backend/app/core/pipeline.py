@@ -0,0 +1,666 @@
+import asyncio
+import weakref
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Collection, Dict, Optional
+
+from pymongo.database import Database
+
+from .config import settings
+from . import extractive, metrics
+from .error_handles import ArticleScrapingError
+from .extractors import ParserPool
+from .scraper import ArticleScrapper
+from .sources import Source, default_source, load_sources
+from .summarizer import ArticleSummarizer, article_summarizer
+from .summary_queue import PENDING, SKIPPED, summary_queue
+from ..crud import (
+    bulk_upsert_articles,
+    fetch_known_urls,
+    fetch_page_snapshots,
+    save_page_snapshots
+)
+from ..models import ArticleBase, ArticleDB, PageSnapshot
+from ..utils import log_context, logger
+
+_DONE = object()
+
+# Runs in progress, for the queue depth gauge.
+_active_runs: "weakref.WeakSet[ScrapePipeline]" = weakref.WeakSet()
+
+
+def _queue_depths() -> Dict[tuple, int]:
+    depths: Dict[tuple, int] = {}
+    for pipeline in list(_active_runs):
+        for name, queue in pipeline._queues.items():
+            depths[(name,)] = depths.get((name,), 0) + queue.qsize()
+    return depths
+
+
+metrics.pipeline_queue_depth.set_function(_queue_depths)
+
+
+class ScrapePipeline:
+    """Scrape run split into fetch -> parse -> summarize -> store stages.
+
+    Stages are connected by bounded queues, so a slow stage (usually summarize)
+    applies backpressure upstream instead of letting fetched pages pile up in
+    memory. Articles are written ``MAX_ARTICLES_PER_BATCH`` at a time with one
+    ``bulk_write`` and yielded by ``run()`` as soon as their batch is stored;
+    articles whose fields did not change are neither rewritten nor yielded.
+
+    In incremental mode, listing entries whose ``link_url`` is already stored are
+    dropped before any detail fetch, unless they are older than
+    ``ARTICLE_REFRESH_AFTER_HOURS`` (0 disables refreshing).
+
+    With ``CONDITIONAL_FETCH`` every page is revalidated against the snapshot
+    (ETag, Last-Modified, body hash) saved by the previous run. The run stops
+    right after the listing when its set of links has not changed, and detail
+    pages that are unchanged never reach the parse stage.
+
+    ``SUMMARY_MODE`` picks how articles are summarized. In "queue" mode there is
+    no summarize stage: articles are stored right away with ``summary_status``
+    pending and summarized later by the summary workers. In "inline" mode the
+    summarize stage runs before the store stage and, with
+    ``SUMMARY_BATCH_ENABLED``, groups articles and sends them to Gemini together
+    (see ``ArticleSummarizer.generate_summaries``).
+
+    A pipeline scrapes one ``Source``: every page of its listing URLs and
+    category feeds, deduplicated by link, with the source's extractor and
+    politeness budget. ``MultiSourcePipeline`` runs several at once.
+
+    Listeners registered with ``add_listener`` are told about progress as it
+    happens (see ``EVENTS``), e.g. to stream it to a client.
+    """
+
+    # discovered: listing parsed; skipped: article not processed (reason known,
+    # not_modified or identical); fetched / summarized: one article went
+    # through that stage; stored: one batch written; failed: a stage raised or
+    # the page had no article to store.
+    EVENTS = ("listing_unchanged", "discovered", "skipped", "fetched", "summarized", "stored", "failed")
+
+    def __init__(
+            self,
+            db: Database,
+            scrapper: Optional[ArticleScrapper] = None,
+            summarizer: Optional[ArticleSummarizer] = None,
+            source: Optional[Source] = None,
+            feeds: Optional[Collection[str]] = None,
+            incremental: Optional[bool] = None,
+            conditional: Optional[bool] = None,
+            enqueue_summaries: Optional[bool] = None
+    ):
+        self.db = db
+        self.source = source or default_source()
+        # Listing URLs / category feeds to read; None reads all of them.
+        self.feeds = feeds
+        self.source.apply_politeness()
+        self.scrapper = scrapper or ArticleScrapper(self.source.engine, self.source.selectors, self.source.encoding)
+        self.summarizer = summarizer or article_summarizer
+        self.incremental = settings.INCREMENTAL_CRAWL if incremental is None else incremental
+        self.conditional = settings.CONDITIONAL_FETCH if conditional is None else conditional
+        self.enqueue_summaries = settings.SUMMARY_MODE == "queue" if enqueue_summaries is None else enqueue_summaries
+        self.stats = {
+            "discovered": 0,
+            "skipped": 0,
+            "refreshed": 0,
+            "fetched": 0,
+            "unchanged": 0,
+            "parsed": 0,
+            "summarized": 0,
+            "queued": 0,
+            "stored": 0,
+            "inserted": 0,
+            "updated": 0,
+            "identical": 0,
+            "failed": 0,
+            "listing_unchanged": False,
+            # Listing URL -> articles first stored from it and listing status.
+            "feeds": {}
+        }
+        self._error: Optional[Exception] = None
+        self._listing_snapshots: list[PageSnapshot] = []
+        self._article_feeds: Dict[str, str] = {}
+        self._page_snapshots: Dict[str, PageSnapshot] = {}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._listeners: list[Callable[[str, Dict[str, Any]], None]] = []
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Call ``listener(event, data)`` for every progress event.
+
+        Listeners run on the event loop in the middle of a stage, so they must
+        return quickly (e.g. ``queue.put_nowait``).
+        """
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, **data: Any):
+        data = {"source": self.source.name, **data}
+        for listener in self._listeners:
+            try:
+                listener(event, data)
+            except Exception as e:
+                logger.warning(f"Pipeline listener failed on '{event}': {str(e)}")
+
+    async def _scrape_listings(self) -> Optional[list[Dict[str, Any]]]:
+        """Read every listing page of the source; ``None`` when none of them changed.
+
+        A first page that fails is reported and left out, and the run only fails
+        when all of them do. Later pages may simply not exist (a short feed), so
+        their failures are only logged.
+        """
+        pages = self.source.listing_pages(self.feeds)
+        self.stats["feeds"] = {page.feed: {"new": 0, "status": "unchanged"} for page in pages}
+        previous = {}
+        if self.conditional:
+            snapshots = await fetch_page_snapshots(self.db["page_snapshots"], [page.url for page in pages])
+            # A refresh window means known links must be revisited even when
+            # the listing itself did not change, so the listing is always re-read.
+            if settings.ARTICLE_REFRESH_AFTER_HOURS <= 0:
+                previous = snapshots
+
+        results = await asyncio.gather(
+            *(self.scrapper.scrape_listing(page.url, previous.get(page.url)) for page in pages),
+            return_exceptions=True
+        )
+
+        listing: Optional[list[Dict[str, Any]]] = None
+        errors = []
+        for page, result in zip(pages, results):
+            if isinstance(result, Exception):
+                if page.page > 1:
+                    logger.warning(f"Skipping listing page {page.page} of '{self.source.name}': {str(result)}")
+                    continue
+                errors.append(result)
+                self.stats["feeds"][page.feed]["status"] = "error"
+                self._emit("failed", stage="listing", count=1, error=str(result), link_url=page.url)
+                continue
+            page_listing, snapshot = result
+            if snapshot:
+                self._listing_snapshots.append(snapshot)
+            if page_listing is None:
+                continue
+
+            listing = listing or []
+            if self.stats["feeds"][page.feed]["status"] == "unchanged":
+                self.stats["feeds"][page.feed]["status"] = "changed"
+            for article_data in page_listing:
+                link_url = str(article_data['link_url'])
+                if link_url in self._article_feeds:
+                    continue
+                self._article_feeds[link_url] = page.feed
+                if page.category and not article_data['category']:
+                    article_data['category'] = page.category
+                listing.append(article_data)
+
+        if errors and len(errors) == sum(1 for page in pages if page.page == 1):
+            raise errors[0]
+        if errors:
+            # Unchanged pages must not be skipped next time while a failed one is retried.
+            self._listing_snapshots = []
+        return listing
+
+    async def _discover(self, outbox: asyncio.Queue):
+        try:
+            listing = await self._scrape_listings()
+            if listing is None:
+                self.stats["listing_unchanged"] = True
+                self._emit("listing_unchanged")
+                return
+
+            self.stats["discovered"] = len(listing)
+            if self.incremental:
+                listing = await self._filter_known(listing)
+            self._emit(
+                "discovered",
+                discovered=self.stats["discovered"],
+                pending=len(listing),
+                skipped=self.stats["skipped"],
+                refreshed=self.stats["refreshed"]
+            )
+
+            if self.conditional:
+                self._page_snapshots = await fetch_page_snapshots(
+                    self.db["page_snapshots"],
+                    [article_data['link_url'] for article_data in listing]
+                )
+
+            for article_data in listing:
+                await outbox.put({"article": article_data})
+        except Exception as e:
+            self._error = e
+        finally:
+            await outbox.put(_DONE)
+
+    async def _filter_known(self, listing: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        known = await fetch_known_urls(self.db["articles"], [article_data['link_url'] for article_data in listing])
+        if not known:
+            return listing
+
+        refresh_before = None
+        if settings.ARTICLE_REFRESH_AFTER_HOURS > 0:
+            refresh_before = datetime.now() - timedelta(hours=settings.ARTICLE_REFRESH_AFTER_HOURS)
+
+        pending = []
+        for article_data in listing:
+            if article_data['link_url'] not in known:
+                pending.append(article_data)
+                continue
+
+            updated_at = known[article_data['link_url']]
+            if refresh_before and (updated_at is None or updated_at < refresh_before):
+                self.stats["refreshed"] += 1
+                pending.append(article_data)
+            else:
+                self.stats["skipped"] += 1
+                self._emit("skipped", link_url=str(article_data['link_url']), reason="known")
+
+        logger.info(
+            f"Incremental crawl: {len(pending)} to process, "
+            f"{self.stats['skipped']} already stored, {self.stats['refreshed']} to refresh"
+        )
+        return pending
+
+    async def _stage(
+            self,
+            name: str,
+            handler: Callable[[Any], Awaitable[Any]],
+            inbox: asyncio.Queue,
+            outbox: asyncio.Queue,
+            concurrency: int
+    ):
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    await inbox.put(_DONE)
+                    return
+                try:
+                    with log_context(article=str(item["article"]["link_url"])):
+                        result = await handler(item)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    logger.error(f"Pipeline stage '{name}' failed: {str(e)}")
+                    self._emit("failed", stage=name, count=1, error=str(e))
+                    continue
+                if result is not None:
+                    await outbox.put(result)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            await outbox.put(_DONE)
+
+    async def _batch_stage(
+            self,
+            name: str,
+            handler: Callable[[list[Any]], Awaitable[list[Any]]],
+            batch_size: Callable[[], int],
+            inbox: asyncio.Queue,
+            outbox: asyncio.Queue,
+            concurrency: int,
+            linger: float
+    ):
+        """Like ``_stage`` but hands the handler up to ``batch_size()`` items at once.
+
+        A worker waits at most ``linger`` seconds for a batch to fill before
+        sending what it has, so a trickle of items is not held back.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def worker():
+            finished = False
+            while not finished:
+                item = await inbox.get()
+                if item is _DONE:
+                    await inbox.put(_DONE)
+                    return
+
+                batch = [item]
+                deadline = loop.time() + linger
+                while len(batch) < batch_size():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(inbox.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is _DONE:
+                        await inbox.put(_DONE)
+                        finished = True
+                        break
+                    batch.append(item)
+
+                try:
+                    results = await handler(batch)
+                except Exception as e:
+                    self.stats["failed"] += len(batch)
+                    logger.error(f"Pipeline stage '{name}' failed for a batch of {len(batch)}: {str(e)}")
+                    self._emit("failed", stage=name, count=len(batch), error=str(e))
+                    continue
+                for result in results:
+                    if result is not None:
+                        await outbox.put(result)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            await outbox.put(_DONE)
+
+    async def _fetch(self, item: Dict[str, Any]):
+        link_url = item["article"]['link_url']
+        try:
+            if self.conditional:
+                page = await self.scrapper.fetch_page_conditional(
+                    link_url, self._page_snapshots.get(link_url), self.scrapper.encoding
+                )
+                if page.not_modified:
+                    self.stats["unchanged"] += 1
+                    logger.info(f"Article page unchanged, skipping: {link_url}")
+                    self._emit("skipped", link_url=str(link_url), reason="not_modified")
+                    return None
+                item["html"] = page.text
+                item["snapshot"] = page.snapshot
+            else:
+                item["html"] = await self.scrapper.fetch_page(link_url, self.scrapper.encoding)
+            self.stats["fetched"] += 1
+            self._emit("fetched", link_url=str(link_url))
+        except Exception as e:
+            # Dropped rather than stored without content, so the next run fetches it again.
+            self.stats["failed"] += 1
+            logger.error(f"Error fetching article {link_url}: {str(e)}")
+            self._emit("failed", stage="fetch", count=1, error=str(e), link_url=str(link_url))
+            return None
+        return item
+
+    async def _parse(self, item: Dict[str, Any]):
+        article_data = item["article"]
+        html = item.pop("html", None)
+        if html is not None:
+            with metrics.parse_duration.time():
+                content_data = await self.scrapper.parse_article_content(html, article_data['link_url'])
+            if content_data is None:
+                # Like a failed fetch: not stored, so the next run tries it again.
+                self.stats["failed"] += 1
+                self._emit("failed", stage="parse", count=1, error="no article content",
+                           link_url=str(article_data['link_url']))
+                return None
+            article_data['content'] = content_data['content']
+            article_data['category'] = content_data['category'] or article_data['category']
+            self.stats["parsed"] += 1
+        return item
+
+    async def _summarize(self, item: Dict[str, Any]):
+        article_data = item["article"]
+        if article_data['content'] and len(article_data['content']) > 100:
+            try:
+                article_data['summary'] = await self.summarizer.generate_summary(
+                    article_data['content'],
+                    article_data['title']
+                )
+                self.stats["summarized"] += 1
+                self._emit("summarized", link_url=str(article_data['link_url']))
+            except Exception as e:
+                logger.error(f"Error generating summary: {str(e)}")
+        return item
+
+    async def _summarize_batch(self, items: list[Dict[str, Any]]):
+        pending = [
+            item for item in items
+            if item["article"]['content'] and len(item["article"]['content']) > 100
+        ]
+        if pending:
+            summaries = await self.summarizer.generate_summaries(
+                [(item["article"]['content'], item["article"]['title']) for item in pending]
+            )
+            for item, summary in zip(pending, summaries):
+                item["article"]['summary'] = summary
+                self.stats["summarized"] += 1
+                self._emit("summarized", link_url=str(item["article"]['link_url']))
+        return items
+
+    async def _draft_summaries(self, articles: list[Dict[str, Any]]):
+        """Give queued articles an extractive draft right away; the summary
+        workers replace it with the Gemini summary later. The whole batch goes to
+        the parser pool as one task."""
+        if not articles:
+            return
+        drafts = await ParserPool.run(extractive.summarize_texts, [article['content'] for article in articles])
+        for article, draft in zip(articles, drafts):
+            article['summary'] = draft
+
+    async def _store_batch(self, items: list[Dict[str, Any]]) -> list[ArticleDB]:
+        summary_statuses = None
+        if self.enqueue_summaries:
+            summary_statuses = [
+                PENDING if item["article"]['content'] and len(item["article"]['content']) > 100 else SKIPPED
+                for item in items
+            ]
+            if settings.USE_FALLBACK_SUMMARY:
+                await self._draft_summaries(
+                    [item["article"] for item, status in zip(items, summary_statuses) if status == PENDING]
+                )
+
+        with metrics.store_duration.time():
+            result = await bulk_upsert_articles(
+                self.db["articles"],
+                [ArticleBase(**item["article"]) for item in items],
+                summary_statuses,
+                return_documents=True
+            )
+        metrics.articles_stored.inc(len(result.inserted), result="inserted")
+        metrics.articles_stored.inc(len(result.updated), result="updated")
+        metrics.articles_stored.inc(len(result.unchanged), result="unchanged")
+        metrics.articles_stored.inc(len(result.failed), result="failed")
+        self.stats["inserted"] += len(result.inserted)
+        for link_url in result.inserted:
+            feed = self._article_feeds.get(link_url)
+            if feed in self.stats["feeds"]:
+                self.stats["feeds"][feed]["new"] += 1
+        self.stats["updated"] += len(result.updated)
+        self.stats["identical"] += len(result.unchanged)
+        self.stats["stored"] += len(result.articles)
+        self.stats["failed"] += len(result.failed)
+
+        queued = 0
+        if summary_statuses:
+            written = set(result.inserted) | set(result.updated)
+            queued = sum(
+                1 for item, status in zip(items, summary_statuses)
+                if status == PENDING and str(item["article"]['link_url']) in written
+            )
+            if queued:
+                self.stats["queued"] += queued
+                summary_queue.notify()
+
+        failed = set(result.failed)
+        snapshots = [
+            item["snapshot"] for item in items
+            if item.get("snapshot") and str(item["article"]['link_url']) not in failed
+        ]
+        await save_page_snapshots(self.db["page_snapshots"], snapshots)
+
+        logger.info(
+            f"Stored batch of {len(items)} articles: {len(result.inserted)} inserted, "
+            f"{len(result.updated)} updated, {len(result.unchanged)} unchanged, {len(result.failed)} failed"
+        )
+        for link_url in result.unchanged:
+            self._emit("skipped", link_url=link_url, reason="identical")
+        self._emit(
+            "stored",
+            inserted=len(result.inserted),
+            updated=len(result.updated),
+            unchanged=len(result.unchanged),
+            failed=len(result.failed),
+            queued=queued
+        )
+        return result.articles
+
+    def _summarize_stage(self, inbox: asyncio.Queue, outbox: asyncio.Queue):
+        if settings.SUMMARY_BATCH_ENABLED:
+            return self._batch_stage(
+                "summarize",
+                self._summarize_batch,
+                lambda: self.summarizer.batch_sizer.size,
+                inbox,
+                outbox,
+                settings.PIPELINE_SUMMARIZE_CONCURRENCY,
+                settings.SUMMARY_BATCH_LINGER_SECONDS
+            )
+        return self._stage(
+            "summarize", self._summarize, inbox, outbox, settings.PIPELINE_SUMMARIZE_CONCURRENCY
+        )
+
+    async def run(self) -> AsyncIterator[ArticleDB]:
+        queue_size = settings.PIPELINE_QUEUE_SIZE
+        fetch_queue = asyncio.Queue(queue_size)
+        parse_queue = asyncio.Queue(queue_size)
+        summarize_queue = asyncio.Queue(queue_size)
+        store_queue = asyncio.Queue(queue_size)
+        output_queue = asyncio.Queue(queue_size)
+        self._queues = {
+            "fetch": fetch_queue,
+            "parse": parse_queue,
+            "summarize": summarize_queue,
+            "store": store_queue,
+            "output": output_queue
+        }
+        _active_runs.add(self)
+
+        # The stage tasks copy this context, so what they log carries the source.
+        with log_context(source=self.source.name):
+            tasks = [
+                asyncio.create_task(self._discover(fetch_queue)),
+                asyncio.create_task(self._stage(
+                    "fetch", self._fetch, fetch_queue, parse_queue, settings.PIPELINE_FETCH_CONCURRENCY
+                )),
+                asyncio.create_task(self._stage(
+                    "parse",
+                    self._parse,
+                    parse_queue,
+                    store_queue if self.enqueue_summaries else summarize_queue,
+                    settings.PIPELINE_PARSE_CONCURRENCY
+                )),
+                asyncio.create_task(self._batch_stage(
+                    "store",
+                    self._store_batch,
+                    lambda: settings.MAX_ARTICLES_PER_BATCH,
+                    store_queue,
+                    output_queue,
+                    settings.PIPELINE_STORE_CONCURRENCY,
+                    settings.STORE_BATCH_LINGER_SECONDS
+                )),
+            ]
+            if not self.enqueue_summaries:
+                tasks.append(asyncio.create_task(self._summarize_stage(summarize_queue, store_queue)))
+
+        try:
+            while True:
+                item = await output_queue.get()
+                if item is _DONE:
+                    break
+                yield item
+
+            if self._error:
+                raise self._error if isinstance(self._error, ArticleScrapingError) \
+                    else ArticleScrapingError(str(self._error))
+
+            # Listing snapshots are only saved once every article went through, so
+            # an interrupted run, or one where an article failed to fetch, parse
+            # or store, reads the listing again on the next tick.
+            if self.stats["failed"]:
+                logger.info(f"{self.stats['failed']} articles failed, listing of '{self.source.name}' will be re-read")
+            elif self.conditional and self._listing_snapshots:
+                await save_page_snapshots(self.db["page_snapshots"], self._listing_snapshots)
+
+            logger.info(f"Scrape pipeline for '{self.source.name}' finished: {self.stats}")
+        finally:
+            _active_runs.discard(self)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class MultiSourcePipeline:
+    """Scrapes several sources at once, one ``ScrapePipeline`` each.
+
+    Up to ``SOURCE_CONCURRENCY`` sources run together and their stored articles
+    are yielded as they come. Every host has its own connection semaphore (and
+    optional rate limit) in ``HttpClient``, so a slow or strict site only holds
+    back its own source and adding sources adds throughput rather than run time.
+
+    A source that fails is reported in ``stats["errors"]`` without stopping the
+    others; ``run()`` only raises when every source failed.
+    """
+
+    COUNTERS = ("discovered", "skipped", "refreshed", "fetched", "unchanged", "parsed", "summarized",
+                "queued", "stored", "inserted", "updated", "identical", "failed")
+
+    def __init__(
+            self,
+            db: Database,
+            sources: Optional[list[Source]] = None,
+            feeds: Optional[Dict[str, Collection[str]]] = None,
+            **options: Any
+    ):
+        """``feeds`` limits each source, by name, to some of its feeds; sources
+        missing from it are not scraped."""
+        self.pipelines = [
+            ScrapePipeline(db, source=source, feeds=feeds[source.name] if feeds is not None else None, **options)
+            for source in (sources if sources is not None else load_sources())
+            if feeds is None or feeds.get(source.name)
+        ]
+        self.errors: Dict[str, str] = {}
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        for pipeline in self.pipelines:
+            pipeline.add_listener(listener)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            counter: sum(pipeline.stats[counter] for pipeline in self.pipelines)
+            for counter in self.COUNTERS
+        }
+        stats["listing_unchanged"] = bool(self.pipelines) and all(
+            pipeline.stats["listing_unchanged"] for pipeline in self.pipelines
+        )
+        stats["sources"] = {pipeline.source.name: pipeline.stats for pipeline in self.pipelines}
+        stats["errors"] = dict(self.errors)
+        return stats
+
+    async def _run_source(self, pipeline: ScrapePipeline, semaphore: asyncio.Semaphore, output: asyncio.Queue):
+        try:
+            async with semaphore:
+                async for article in pipeline.run():
+                    await output.put(article)
+        except Exception as e:
+            self.errors[pipeline.source.name] = str(e)
+            logger.error(f"Scraping source '{pipeline.source.name}' failed: {str(e)}")
+        finally:
+            await output.put(_DONE)
+
+    async def run(self) -> AsyncIterator[ArticleDB]:
+        semaphore = asyncio.Semaphore(max(1, settings.SOURCE_CONCURRENCY))
+        output: asyncio.Queue = asyncio.Queue(settings.PIPELINE_QUEUE_SIZE)
+        tasks = [
+            asyncio.create_task(self._run_source(pipeline, semaphore, output))
+            for pipeline in self.pipelines
+        ]
+
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await output.get()
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                yield item
+
+            if self.pipelines and len(self.errors) == len(self.pipelines):
+                raise ArticleScrapingError("; ".join(f"{name}: {error}" for name, error in self.errors.items()))
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,123 @@
+"""Registered query shapes and an ``explain()`` check of their winning plans.
+
+Each shape mirrors a query the app really issues (built with the same helpers
+where there is one). ``explain_all`` flags plans that scan a whole collection
+(``COLLSCAN``) or sort in memory (``SORT``), which usually means an index from
+``database.INDEXES`` is missing or no longer matches the query.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from bson import ObjectId
+
+from .config import settings
+from .database import MongoDB
+from .search import TEXT_SCORE, build_search_query
+from ..crud import (
+    ARTICLE_LIST_PROJECTION, ARTICLE_SORT, build_article_filter, build_keyset_filter, encode_cursor
+)
+
+
+@dataclass
+class QueryShape:
+    name: str
+    collection: str
+    filter: Callable[[], Dict[str, Any]]
+    sort: Optional[List[Any]] = None
+    projection: Optional[Dict[str, Any]] = None
+    limit: int = 20
+    # Tiny collections (one document per category) are fine to scan.
+    allow_collscan: bool = False
+    # Relevance order is computed per match and can never come from an index.
+    allow_sort: bool = False
+
+
+def _feed_after_cursor(q: Optional[str] = None) -> Dict[str, Any]:
+    cursor = encode_cursor({"created_at": datetime.now(), "_id": ObjectId()})
+    return build_keyset_filter(build_article_filter(q=q), cursor)
+
+
+# Ranked searches (``$text``) sort by relevance first, see ``fetch_articles_page``.
+RANKED_SORT = [("score", TEXT_SCORE), *ARTICLE_SORT]
+RANKED_PROJECTION = {**ARTICLE_LIST_PROJECTION, "score": TEXT_SCORE}
+
+
+QUERY_SHAPES = [
+    QueryShape("articles.list", "articles", lambda: build_article_filter(),
+               ARTICLE_SORT, ARTICLE_LIST_PROJECTION),
+    QueryShape("articles.list_by_category", "articles", lambda: build_article_filter("Thời sự"),
+               ARTICLE_SORT, ARTICLE_LIST_PROJECTION),
+    QueryShape("articles.feed_after_cursor", "articles", _feed_after_cursor,
+               ARTICLE_SORT, ARTICLE_LIST_PROJECTION),
+    # Type-ahead: the ``^prefix`` range on search_terms, newest first.
+    QueryShape("articles.search_prefix", "articles", lambda: build_search_query("ha"),
+               ARTICLE_SORT, ARTICLE_LIST_PROJECTION),
+    QueryShape("articles.search_prefix_by_category", "articles", lambda: build_article_filter("Thời sự", "ha"),
+               ARTICLE_SORT, ARTICLE_LIST_PROJECTION),
+    QueryShape("articles.search_feed_after_cursor", "articles", lambda: _feed_after_cursor("ha"),
+               ARTICLE_SORT, ARTICLE_LIST_PROJECTION),
+    # Complete words plus a prefix: $text ANDed with the search_terms range.
+    QueryShape("articles.search_words_and_prefix", "articles", lambda: build_search_query("ha no"),
+               RANKED_SORT, RANKED_PROJECTION, allow_sort=True),
+    QueryShape("articles.search_text", "articles", lambda: build_search_query("ha noi", prefix=False),
+               RANKED_SORT, RANKED_PROJECTION, allow_sort=True),
+    QueryShape("articles.known_urls", "articles",
+               lambda: {"link_url": {"$in": ["https://vnexpress.net/a.html", "https://vnexpress.net/b.html"]}},
+               projection={"_id": 0, "link_url": 1, "updated_at": 1}),
+    QueryShape("articles.summary_queue_claim", "articles",
+               lambda: {"summary_status": {"$in": ["pending", "processing"]},
+                        "summary_available_at": {"$lte": datetime.now()}},
+               [("summary_available_at", 1)], limit=1),
+    QueryShape("page_snapshots.by_url", "page_snapshots",
+               lambda: {"url": {"$in": [settings.BASE_URL]}}),
+    QueryShape("summary_cache.get", "summary_cache", lambda: {"_id": "0" * 64}, limit=1),
+    QueryShape("category_stats.list", "category_stats", lambda: {"article_count": {"$gt": 0}},
+               [("_id", 1)], allow_collscan=True),
+    QueryShape("scheduler_runs.recent", "scheduler_runs", lambda: {}, [("started_at", -1)], limit=20),
+]
+
+
+def _walk(plan: Dict[str, Any]):
+    yield plan
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            yield from _walk(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _walk(child)
+
+
+def summarize_plan(explain: Dict[str, Any]) -> Dict[str, Any]:
+    winning = explain.get("queryPlanner", {}).get("winningPlan", {})
+    stages = list(_walk(winning))
+    names = [stage.get("stage") for stage in stages if stage.get("stage")]
+    return {
+        "stages": names,
+        "indexes": sorted({stage["indexName"] for stage in stages if stage.get("indexName")}),
+        "collscan": "COLLSCAN" in names,
+        "in_memory_sort": "SORT" in names,
+    }
+
+
+async def explain_shape(shape: QueryShape) -> Dict[str, Any]:
+    collection = MongoDB.get_client()[settings.MONGODB_DB_NAME][shape.collection]
+    cursor = collection.find(shape.filter(), shape.projection).limit(shape.limit)
+    if shape.sort:
+        cursor = cursor.sort(shape.sort)
+
+    report = {"name": shape.name, "collection": shape.collection}
+    try:
+        report.update(summarize_plan(await cursor.explain()))
+    except Exception as e:
+        report.update({"error": str(e), "ok": False})
+        return report
+
+    report["ok"] = not (
+        (report["collscan"] and not shape.allow_collscan)
+        or (report["in_memory_sort"] and not shape.allow_sort)
+    )
+    return report
+
+
+async def explain_all() -> List[Dict[str, Any]]:
+    return [await explain_shape(shape) for shape in QUERY_SHAPES]
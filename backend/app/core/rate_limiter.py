@@ -0,0 +1,103 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class _Bucket:
+    """Token bucket in its GCRA form: one "theoretical arrival time" per limit.
+
+    Taking ``amount`` units pushes ``tat`` forward by ``amount * interval``; the
+    caller may go as soon as ``tat`` is no more than ``burst * interval`` ahead of
+    now. Reservations are made synchronously, so concurrent callers are queued
+    in order without holding a lock while they sleep.
+    """
+
+    def __init__(self, per_second: float, burst: float):
+        if per_second <= 0:
+            raise ValueError(f"Rate must be positive, got {per_second}")
+        self.interval = 1.0 / per_second
+        self.tolerance = max(burst - 1, 0) * self.interval
+        self.tat = 0.0
+
+    def delay(self, now: float, amount: float) -> float:
+        tat = max(self.tat, now) + amount * self.interval
+        return max(0.0, tat - self.interval - self.tolerance - now)
+
+    def reserve(self, now: float, amount: float):
+        self.tat = max(self.tat, now) + amount * self.interval
+
+    def adjust(self, amount: float):
+        self.tat += amount * self.interval
+
+
+class RateLimiter:
+    """Async limiter enforcing requests/minute, tokens/minute and requests/day.
+
+    A single instance is meant to be shared by every coroutine that calls the
+    rate-limited API, so the whole process stays inside one quota. A limit of 0
+    is not enforced.
+    """
+
+    def __init__(
+            self,
+            requests_per_minute: int,
+            tokens_per_minute: int = 0,
+            requests_per_day: int = 0,
+            burst: int = 1
+    ):
+        if min(requests_per_minute, tokens_per_minute, requests_per_day) < 0:
+            raise ValueError("Rate limits must not be negative")
+        self.requests = _Bucket(requests_per_minute / 60, burst) if requests_per_minute else None
+        self.tokens = _Bucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+        self.daily = _Bucket(requests_per_day / 86400, requests_per_day) if requests_per_day else None
+        self.blocked_until = 0.0
+        self.waiting = 0
+
+    def _buckets(self, tokens: int):
+        if self.requests:
+            yield self.requests, 1
+        if self.tokens:
+            yield self.tokens, tokens
+        if self.daily:
+            yield self.daily, 1
+
+    def _start(self) -> tuple[float, float]:
+        # While penalized, reservations are queued behind the block instead of
+        # all being released at the same instant when it expires.
+        now = time.monotonic()
+        return now, max(now, self.blocked_until)
+
+    def estimate_wait(self, tokens: int = 0) -> float:
+        now, start = self._start()
+        return max((bucket.delay(start, amount) for bucket, amount in self._buckets(tokens)), default=0.0) + (start - now)
+
+    async def acquire(self, tokens: int = 0, max_wait: Optional[float] = None) -> bool:
+        """Reserve one request (and ``tokens`` tokens), sleeping until it is allowed.
+
+        Returns ``False`` without reserving anything if that would take longer
+        than ``max_wait`` seconds.
+        """
+        wait = self.estimate_wait(tokens)
+        if max_wait is not None and wait > max_wait:
+            return False
+
+        _, start = self._start()
+        for bucket, amount in self._buckets(tokens):
+            bucket.reserve(start, amount)
+
+        if wait > 0:
+            self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self.waiting -= 1
+        return True
+
+    def record_tokens(self, estimated: int, actual: int):
+        """Correct a reservation once the real token usage is known."""
+        if self.tokens and actual:
+            self.tokens.adjust(actual - estimated)
+
+    def penalize(self, seconds: float):
+        """Hold every caller back, e.g. after the API answered 429 with a retry delay."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlencode
+
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+from starlette.responses import Response
+
+from . import metrics
+from .config import settings
+from .search import fold_text
+
+# Query parameters that never change a response (old frontend cache busting).
+IGNORED_PARAMS = frozenset({"_t"})
+
+
+class ResponseCache:
+    """Read-through cache of encoded JSON responses for the article read endpoints.
+
+    Entries are tagged with the generation they were built in; ``invalidate()``
+    bumps the generation whenever articles are written, which retires every
+    entry at once without walking the LRU. The generation is per process, so
+    with several API workers a write elsewhere is only seen after ``ttl_seconds``.
+
+    Every response carries a strong ETag of its body, so clients revalidating
+    with ``If-None-Match`` get a bodiless 304 while the data is unchanged.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._entries: OrderedDict[str, tuple[int, float, bytes, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def invalidate(self):
+        self.generation += 1
+
+    @staticmethod
+    def make_key(request: Request) -> str:
+        params = sorted(
+            (name, fold_text(value) if name == "q" else value)
+            for name, value in request.query_params.multi_items()
+            if name not in IGNORED_PARAMS
+        )
+        return f"{request.url.path}?{urlencode(params)}"
+
+    def get(self, key: str) -> Optional[tuple[bytes, str]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        generation, expires_at, body, etag = entry
+        if generation != self.generation or expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return body, etag
+
+    def set(self, key: str, body: bytes, etag: str):
+        self._entries[key] = (self.generation, time.monotonic() + self.ttl_seconds, body, etag)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def respond(self, request: Request, build: Callable[[], Awaitable[Any]]) -> Response:
+        """Serve ``build()``'s result from the cache, or build, encode and cache it."""
+        key = self.make_key(request)
+        cached = self.get(key) if settings.RESPONSE_CACHE_ENABLED else None
+
+        if cached is not None:
+            self.hits += 1
+            metrics.response_cache_lookups.inc(result="hit")
+            body, etag = cached
+        else:
+            self.misses += 1
+            metrics.response_cache_lookups.inc(result="miss")
+            generation = self.generation
+            content = await build()
+            body = json.dumps(
+                jsonable_encoder(content),
+                ensure_ascii=False,
+                separators=(",", ":")
+            ).encode("utf-8")
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            # A write that landed while this response was being built makes it
+            # stale already; serve it once but do not keep it.
+            if settings.RESPONSE_CACHE_ENABLED and generation == self.generation:
+                self.set(key, body, etag)
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+            self.not_modified += 1
+            metrics.response_cache_not_modified.inc()
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS
+)
+metrics.response_cache_entries.set_function(lambda: len(response_cache._entries))
@@ -1,105 +1,361 @@
 import asyncio
+import hashlib
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.triggers.cron import CronTrigger
 from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.mongodb import MongoDBJobStore
 from apscheduler.executors.asyncio import AsyncIOExecutor
+from bson import ObjectId
+from pymongo import DESCENDING, MongoClient
 
+from . import metrics
 from .config import settings
+from .crawl_planner import crawl_planner
 from .database import MongoDB
-from .scraper import ArticleScrapper
-from ..crud import create_articles
+from .error_handles import ArticleScrapingError
+from .jobs import Job, job_manager
+from .lease import NODE_ID, MongoLease
+from .pipeline import MultiSourcePipeline
+from .sources import load_sources
+from ..models import SchedulerRun
 from ..utils import logger
 
+JOB_ID = "scrape_and_store_job"
+
+# "fixed" scrapes every feed each interval; "adaptive" ticks every
+# SCHEDULER_ADAPTIVE_TICK_SECONDS and scrapes the feeds the crawl planner says are due.
+MODES = ("fixed", "adaptive")
+
+# Job key of a scrape of every feed; scrapes of some feeds get their own key.
+FULL_SCRAPE_KEY = "scrape"
+
+
+def scrape_key(due_feeds: Optional[dict] = None) -> str:
+    """Job key for a scrape of ``due_feeds`` (every feed when ``None``), so only
+    requests for the same feeds are coalesced into one job."""
+    if due_feeds is None:
+        return FULL_SCRAPE_KEY
+    feeds = "\n".join(f"{name} {feed}" for name in sorted(due_feeds) for feed in sorted(due_feeds[name]))
+    return f"{FULL_SCRAPE_KEY}:{hashlib.sha1(feeds.encode('utf-8')).hexdigest()[:12]}"
+
+
+async def run_scheduled_scrape(mode: str = "fixed"):
+    """Job function of the scrape schedule.
+
+    Jobs in the MongoDB job store are saved by reference, so this has to be a
+    module-level function rather than a method of ``article_scheduler``.
+    """
+    await article_scheduler.run_scheduled(mode)
+
 
 class ArticleScheduler:
+    """Interval scraping that is safe to run in several processes at once.
+
+    With the ``mongodb`` job store the schedule lives in ``scheduler_jobs`` and
+    every process runs an APScheduler instance on it, but only the holder of
+    the ``scheduler_leader`` lease (see ``MongoLease``) is unpaused; the others
+    take over within ``SCHEDULER_LEASE_SECONDS`` when it goes away. Each run
+    additionally holds the ``scrape_run`` lease, so a manual trigger never
+    overlaps a scheduled run on another node.
+
+    Runs are recorded in ``scheduler_runs`` and cumulative counts in
+    ``scheduler_state``, so every process reports the same status. Every run
+    also reports its per-feed yield to ``crawl_planner``, whose decisions drive
+    the ``adaptive`` mode.
+    """
+
     def __init__(self):
-        job_stores = {
-            'default': MemoryJobStore()
-        }
         executors = {
             'default': AsyncIOExecutor()
         }
         job_defaults = {
-            'coalesce': False,
+            'coalesce': True,
             'max_instances': 1,
             'misfire_grace_time': 300
         }
 
         self.scheduler = AsyncIOScheduler(
-            jobstores=job_stores,
             executors=executors,
             job_defaults=job_defaults,
             timezone='Asia/Ho_Chi_Minh'
         )
+        self.distributed = settings.SCHEDULER_JOBSTORE == "mongodb"
+        self.leader_lease = MongoLease("scheduler_leader", settings.SCHEDULER_LEASE_SECONDS)
+        self.run_lease = MongoLease("scrape_run", settings.SCHEDULER_LEASE_SECONDS)
+        self._sync_client: Optional[MongoClient] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._run_lock: Optional[asyncio.Lock] = None
+
+    def _db(self):
+        return MongoDB.get_client()[settings.MONGODB_DB_NAME]
+
+    async def _blocking(self, func, *args):
+        # The MongoDB job store uses the synchronous driver.
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def startup(self):
+        """Start this process's scheduler; it stays paused until it holds the leader lease."""
+        if self.scheduler.running:
+            return
+        if self.distributed:
+            self._sync_client = MongoClient(settings.MONGODB_URI)
+            self.scheduler.add_jobstore(
+                MongoDBJobStore(
+                    database=settings.MONGODB_DB_NAME,
+                    collection="scheduler_jobs",
+                    client=self._sync_client
+                ),
+                'default'
+            )
+            self.scheduler.start(paused=True)
+            self._heartbeat_task = asyncio.create_task(self._lead())
+        else:
+            self.scheduler.add_jobstore(MemoryJobStore(), 'default')
+            self.scheduler.start()
+        logger.info(f"Article scheduler started on {NODE_ID} (job store: {settings.SCHEDULER_JOBSTORE})")
+
+    async def shutdown(self):
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+            self._heartbeat_task = None
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        if self.distributed:
+            await self.leader_lease.release()
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+        logger.info("🛑 Article scheduler stopped")
+
+    async def _lead(self):
+        was_leader = False
+        while True:
+            try:
+                is_leader = await self.leader_lease.acquire()
+                if is_leader and not was_leader:
+                    logger.info(f"{NODE_ID} is now the scheduler leader")
+                    self.scheduler.resume()
+                elif was_leader and not is_leader:
+                    logger.warning(f"{NODE_ID} lost the scheduler lease")
+                    self.scheduler.pause()
+                elif is_leader:
+                    # Pick up jobs added or changed through another process.
+                    self.scheduler.wakeup()
+                was_leader = is_leader
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduler lease heartbeat failed: {str(e)}")
+                if was_leader and not self.leader_lease.is_held:
+                    self.scheduler.pause()
+                    was_leader = False
+            await asyncio.sleep(settings.SCHEDULER_HEARTBEAT_SECONDS)
+
+    async def _renew(self, lease: MongoLease):
+        while True:
+            await asyncio.sleep(settings.SCHEDULER_HEARTBEAT_SECONDS)
+            try:
+                await lease.acquire()
+            except Exception as e:
+                logger.error(f"Failed to renew lease {lease.name}: {str(e)}")
+
+    async def run_scheduled(self, mode: str = "fixed"):
+        """Scheduled tick: submit a scrape job if this node leads and, in adaptive mode, a feed is due."""
+        if self.distributed and not self.leader_lease.is_held:
+            logger.info("Not the scheduler leader, skipping scheduled run")
+            return
+
+        due_feeds = None
+        if mode == "adaptive":
+            if job_manager.find_active(FULL_SCRAPE_KEY) is not None:
+                logger.info("A full scrape is queued or running, skipping adaptive tick")
+                return
+            due_feeds = await crawl_planner.due_feeds(load_sources())
+            if not due_feeds:
+                return
 
-        self.is_running = False
-        self.last_run_time = None
-        self.last_run_status = None
-        self.articles_scraped_count = 0
-
-    async def scrape_and_store_job(self):
+        job, _ = self.submit_scrape(trigger="scheduled", mode=mode, due_feeds=due_feeds)
+        await job.wait()
+
+    def submit_scrape(
+            self,
+            trigger: str = "manual",
+            mode: str = "fixed",
+            due_feeds: Optional[dict] = None
+    ) -> tuple[Job, bool]:
+        """Run a scrape as a tracked job (see ``JobManager``); a scrape of the
+        same feeds already queued or running is returned instead of starting
+        another. Scrapes of different feeds run one after the other."""
+        if self._run_lock is None:
+            self._run_lock = asyncio.Lock()
+        run_lock = self._run_lock
+
+        async def work(job: Job) -> Optional[dict]:
+            # The scrape_run lease keeps other nodes out, not this one.
+            async with run_lock:
+                run = await self.scrape_and_store_job(trigger, mode, due_feeds, listener=job.record_event)
+            if run is None:
+                return None
+            if run["status"] == "error":
+                raise ArticleScrapingError(run.get("error") or "Scrape failed")
+            return SchedulerRun(**run).model_dump(mode="json")
+
+        return job_manager.submit("scrape", work, key=scrape_key(due_feeds), trigger=trigger)
+
+    async def scrape_and_store_job(
+            self,
+            trigger: str = "scheduled",
+            mode: str = "fixed",
+            due_feeds: Optional[dict] = None,
+            listener: Optional[Callable[[str, Any], None]] = None
+    ) -> Optional[dict]:
+        """Run one scrape and record it; ``None`` when a run is already going on elsewhere.
+
+        ``due_feeds`` limits the run to some feeds of each source (adaptive
+        mode) and ``listener`` receives the pipeline's progress events, plus an
+        ``article`` event with each stored article.
+        """
+        sources = load_sources()
+        if not await self.run_lease.acquire():
+            logger.info("A scrape is already running on another node, skipping")
+            return None
+
+        renew_task = asyncio.create_task(self._renew(self.run_lease))
         job_start_time = datetime.now()
+        run = {
+            "_id": ObjectId(),
+            "node": self.run_lease.owner,
+            "trigger": trigger,
+            "mode": mode,
+            "started_at": job_start_time,
+            "status": "running"
+        }
         logger.info("🤖 Scheduled article scraping started")
 
+        pipeline = None
         try:
-            client = MongoDB.get_client()
-            db = client[settings.MONGODB_DB_NAME]
+            await self._db().scheduler_runs.insert_one(dict(run))
 
-            scaper = ArticleScrapper()
-
-            articles = await scaper.scrape_articles(batch_size=settings.MAX_ARTICLES_PER_BATCH)
-
-            if not articles:
-                logger.warning("No new articles found during scheduled scraping")
-                self.last_run_status = "no_articles"
-                return
+            pipeline = MultiSourcePipeline(self._db(), sources, feeds=due_feeds)
+            if listener is not None:
+                pipeline.add_listener(listener)
 
             stored_count = 0
-            skipped_count = 0
+            async for article in pipeline.run():
+                stored_count += 1
+                if listener is not None:
+                    listener("article", article)
+
+            stats = pipeline.stats
+            run.update(
+                stored=stored_count,
+                discovered=stats["discovered"],
+                skipped=stats["skipped"],
+                refreshed=stats["refreshed"],
+                failed=stats["failed"],
+                sources={
+                    name: {key: source_stats[key] for key in ("discovered", "stored", "skipped", "refreshed", "failed")}
+                    for name, source_stats in stats["sources"].items()
+                }
+            )
+            if stats["errors"]:
+                run["error"] = "; ".join(f"{name}: {error}" for name, error in stats["errors"].items())
 
-            for article in articles:
-                try:
-                    stored_article = await create_articles(db["articles"], article)
-                    if stored_article:
-                        stored_count += 1
-                    else:
-                        skipped_count += 1
-                except Exception as e:
-                    logger.error(f"Error storing article: {str(e)}")
-                    skipped_count += 1
+            if stats["listing_unchanged"]:
+                logger.info("Listing unchanged since last run, nothing to scrape")
+                run["status"] = "unchanged"
+            elif not pipeline.stats["discovered"]:
+                logger.warning("No new articles found during scheduled scraping")
+                run["status"] = "no_articles"
+            else:
+                # Some sources or articles failed; they are retried on the next run.
+                run["status"] = "partial" if stats["errors"] or stats["failed"] else "success"
+                metrics.scrape_job_last_success.set(time.time())
+
+        except asyncio.CancelledError:
+            run["status"] = "cancelled"
+            logger.warning("Scraping run cancelled")
+            raise
+        except Exception as e:
+            run["status"] = "error"
+            run["error"] = str(e)
+            logger.error(f"❌ Scheduled scraping failed: {str(e)}", exc_info=True)
+        finally:
+            renew_task.cancel()
+            await asyncio.gather(renew_task, return_exceptions=True)
+            await self.run_lease.release()
+
+            run["finished_at"] = datetime.now()
+            run["duration_seconds"] = round((run["finished_at"] - job_start_time).total_seconds(), 3)
+            metrics.scrape_job_duration.observe(run["duration_seconds"], status=run["status"])
+            logger.info(f"Scheduled scraping finished in {run['duration_seconds']:.1f}s with status {run['status']}")
+            if pipeline is not None:
+                await self._plan(pipeline.stats)
+            await self._record(run)
+        return run
+
+    async def _plan(self, stats: dict):
+        try:
+            for name, source_stats in stats["sources"].items():
+                for decision in await crawl_planner.record(name, source_stats["feeds"]):
+                    logger.info(
+                        f"Next poll of {name} {decision['feed']} in {decision['interval_minutes']} min "
+                        f"({decision['reason']}, {decision['last_new']} new)"
+                    )
+        except Exception as e:
+            logger.error(f"Failed to update the crawl plan: {str(e)}")
 
-            self.articles_scraped_count += stored_count
-            self.last_run_time = job_start_time
-            self.last_run_status = "success"
+    async def _record(self, run: dict):
+        try:
+            db = self._db()
+            await db.scheduler_runs.replace_one({"_id": run["_id"]}, run, upsert=True)
+            await db.scheduler_state.update_one(
+                {"_id": JOB_ID},
+                {"$inc": {
+                    "total_articles_scraped": run.get("stored", 0),
+                    "total_articles_skipped": run.get("skipped", 0),
+                    "total_articles_refreshed": run.get("refreshed", 0),
+                    "total_runs": 1
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to record scheduler run: {str(e)}")
 
-            duration = (datetime.now() - job_start_time).total_seconds()
+    async def _get_job(self):
+        return await self._blocking(self.scheduler.get_job, JOB_ID)
 
-        except Exception as e:
-            self.last_run_status = "error"
-            self.last_run_time = job_start_time
-            logger.error(f"❌ Scheduled scraping failed: {str(e)}", exc_info=True)
+    @staticmethod
+    def _trigger(interval_minutes: int, mode: str) -> IntervalTrigger:
+        if mode not in MODES:
+            raise ValueError(f"Unknown scheduler mode '{mode}', expected one of {MODES}")
+        if mode == "adaptive":
+            return IntervalTrigger(seconds=settings.SCHEDULER_ADAPTIVE_TICK_SECONDS)
+        return IntervalTrigger(minutes=interval_minutes)
 
-    async def start_scheduler(self, interval_minutes: int = 30):
-        if self.is_running:
+    async def start_scheduler(self, interval_minutes: int = 30, mode: str = "fixed"):
+        if await self._get_job() is not None:
             logger.warning("Scheduler is already running")
             return False
 
         try:
-            self.scheduler.add_job(
-                func=self.scrape_and_store_job,
-                trigger=IntervalTrigger(minutes=interval_minutes),
-                id="scrape_and_store_job",
+            await self._blocking(lambda: self.scheduler.add_job(
+                func=run_scheduled_scrape,
+                trigger=self._trigger(interval_minutes, mode),
+                kwargs={"mode": mode},
+                id=JOB_ID,
                 name="Automatic Article Scraping",
                 replace_existing=True
-            )
+            ))
 
-            self.scheduler.start()
-            self.is_running = True
-
-            logger.info(f"🚀 Article scheduler started - will run every {interval_minutes} minutes")
+            if mode == "adaptive":
+                logger.info("🚀 Article scheduler started - adaptive per-feed intervals")
+            else:
+                logger.info(f"🚀 Article scheduler started - will run every {interval_minutes} minutes")
             return True
 
         except Exception as e:
@@ -107,60 +363,68 @@ class ArticleScheduler:
             return False
 
     async def stop_scheduler(self):
-        if not self.is_running:
+        if await self._get_job() is None:
             logger.warning("Scheduler is not running")
             return False
 
         try:
-            self.scheduler.shutdown(wait=True)
-            self.is_running = False
-            logger.info("🛑 Article scheduler stopped")
+            await self._blocking(self.scheduler.remove_job, JOB_ID)
+            logger.info("🛑 Article scraping schedule removed")
             return True
 
         except Exception as e:
             logger.error(f"Failed to stop scheduler: {str(e)}")
             return False
 
-    async def trigger_immediate_run(self):
-        try:
-            await self.scrape_and_store_job()
-            return True
-        except Exception as e:
-            logger.error(f"Failed to trigger immediate run: {str(e)}")
-            return False
+    def trigger_immediate_run(self) -> tuple[Job, bool]:
+        """Start a scrape job now (or join the one already queued or running)."""
+        return self.submit_scrape(trigger="manual")
 
-    def get_scheduler_status(self) -> dict:
-        next_run_time = None
-        if self.is_running and self.scheduler.get_jobs():
-            job = self.scheduler.get_job("article_scraping_job")
-            if job:
-                next_run_time = job.next_run_time
+    async def get_runs(self, limit: int = 20) -> list[dict]:
+        cursor = self._db().scheduler_runs.find({}).sort("started_at", DESCENDING).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def get_scheduler_status(self) -> dict:
+        job = await self._get_job()
+        mode = job.kwargs.get("mode", "fixed") if job else None
+        runs = await self.get_runs(limit=1)
+        last_run = runs[0] if runs else {}
+        state = await self._db().scheduler_state.find_one({"_id": JOB_ID}) or {}
+        node_id = self.leader_lease.owner
+        leader = await self.leader_lease.get_owner() if self.distributed else node_id
 
         return {
-            "is_running": self.is_running,
-            "last_run_time": self.last_run_time.isoformat() if self.last_run_time else None,
-            "last_run_status": self.last_run_status,
-            "next_run_time": next_run_time.isoformat() if next_run_time else None,
-            "total_articles_scraped": self.articles_scraped_count,
-            "active_jobs": len(self.scheduler.get_jobs()) if self.is_running else 0
+            "is_running": job is not None,
+            "mode": mode,
+            "interval_minutes": int(job.trigger.interval.total_seconds() // 60) if mode == "fixed" else None,
+            "last_run_time": last_run["started_at"].isoformat() if last_run else None,
+            "last_run_status": last_run.get("status"),
+            "last_run_duration_seconds": last_run.get("duration_seconds"),
+            "next_run_time": job.next_run_time.isoformat() if job and job.next_run_time else None,
+            "total_articles_scraped": state.get("total_articles_scraped", 0),
+            "last_run_skipped": last_run.get("skipped", 0),
+            "last_run_refreshed": last_run.get("refreshed", 0),
+            "total_articles_skipped": state.get("total_articles_skipped", 0),
+            "total_articles_refreshed": state.get("total_articles_refreshed", 0),
+            "active_jobs": 1 if job else 0,
+            "node_id": node_id,
+            "leader": leader,
+            "is_leader": leader == node_id,
+            "crawl_plan": await crawl_planner.get_plan()
         }
 
-    async def update_schedule(self, interval_minutes: int):
-        if not self.is_running:
-            return await self.start_scheduler(interval_minutes)
+    async def update_schedule(self, interval_minutes: int, mode: str = "fixed"):
+        if await self._get_job() is None:
+            return await self.start_scheduler(interval_minutes, mode)
 
         try:
-            self.scheduler.remove_job('article_scraping_job')
-
-            self.scheduler.add_job(
-                func=self.scrape_and_store_job,
-                trigger=IntervalTrigger(minutes=interval_minutes),
-                id="article_scraping_job",
-                name="Automatic Article Scraping",
-                replace_existing=True
-            )
+            await self._blocking(lambda: self.scheduler.modify_job(JOB_ID, kwargs={"mode": mode}))
+            await self._blocking(lambda: self.scheduler.reschedule_job(
+                JOB_ID,
+                trigger=self._trigger(interval_minutes, mode)
+            ))
 
-            logger.info(f"📅 Scheduler updated - new interval: {interval_minutes} minutes")
+            logger.info(f"📅 Scheduler updated - mode: {mode}, interval: {interval_minutes} minutes")
             return True
 
         except Exception as e:
@@ -1,164 +1,141 @@
-import asyncio
+import hashlib
+from datetime import datetime
 from typing import Optional, Dict, Any, List
-import time
-from bs4 import BeautifulSoup
-import requests
+from urllib.parse import urljoin
+import httpx
 
-from ..models import ArticleBase
+from ..models import FetchedPage, PageSnapshot
 from .config import settings
 from ..utils import logger
 from .error_handles import ArticleScrapingError
-from .summarizer import ArticleSummarizer
+from . import extractors
+from .extractors import ParserPool
+from .http_client import HttpClient
 
 
 class ArticleScrapper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; ArticleScraper/1.0;)'
-        })
-
-    async def get_article_content(self, article_url: str) -> Optional[Dict[str, str]]:
-        try:
-            result = self.session.get(
-                article_url,
-                timeout=settings.REQUEST_TIMEOUT
+    def __init__(
+            self,
+            engine: Optional[str] = None,
+            selectors: Optional[Dict[str, str]] = None,
+            encoding: Optional[str] = None
+    ):
+        self.engine = engine or settings.HTML_EXTRACTOR
+        self.selectors = selectors or None
+        self.encoding = encoding
+
+    async def fetch_page(self, url: str, encoding: Optional[str] = None) -> str:
+        result = await HttpClient.get(url)
+        result.raise_for_status()
+        if encoding:
+            result.encoding = encoding
+        return result.text
+
+    async def fetch_page_conditional(
+            self,
+            url: str,
+            snapshot: Optional[PageSnapshot] = None,
+            encoding: Optional[str] = None
+    ) -> FetchedPage:
+        """Fetch ``url`` revalidating against a previous snapshot.
+
+        Sends If-None-Match / If-Modified-Since when the snapshot has validators,
+        and also treats a 200 whose body hashes to the stored fingerprint as
+        unchanged, for servers that ignore conditional headers.
+        """
+        headers = {}
+        if snapshot:
+            if snapshot.etag:
+                headers['If-None-Match'] = snapshot.etag
+            if snapshot.last_modified:
+                headers['If-Modified-Since'] = snapshot.last_modified
+
+        result = await HttpClient.get(url, headers=headers)
+        if result.status_code == 304 and snapshot:
+            return FetchedPage(
+                url=url,
+                not_modified=True,
+                snapshot=snapshot.model_copy(update={'checked_at': datetime.now()})
             )
-            result.raise_for_status()
-            article_soup = BeautifulSoup(result.text, 'html5lib')
-
-            article = article_soup.find('article', class_="fck_detail")
-
-            if not article:
-                logger.warning(f"No article found for URL: {article_url}")
-                return {
-                    'content': '',
-                    'category': ''
-                }
-
-            content_paragraphs = article_soup.find_all('p', class_='Normal')
-            content = [p.get_text(strip=True) for p in content_paragraphs]
-            full_text = ' '.join(content)
 
-            ul = article_soup.find('ul', class_='breadcrumb')
-            category_tag = ul.find('a', {'data-medium': True}) if ul else None
-            category = category_tag.get_text(strip=True) if category_tag else None
-
-            logger.info(f"Successfully extracted content from: {article_url}")
-            return {
-                'content': full_text,
-                'category': category
-            }
-
-        except Exception as e:
-            logger.error(f"Error extracting content: {e}")
+        result.raise_for_status()
+        if encoding:
+            result.encoding = encoding
+
+        content_hash = hashlib.sha256(result.content).hexdigest()
+        new_snapshot = PageSnapshot(
+            url=url,
+            etag=result.headers.get('etag'),
+            last_modified=result.headers.get('last-modified'),
+            content_hash=content_hash,
+            links_hash=snapshot.links_hash if snapshot else None
+        )
+        return FetchedPage(
+            url=url,
+            text=result.text,
+            not_modified=bool(snapshot and snapshot.content_hash == content_hash),
+            snapshot=new_snapshot
+        )
+
+    async def parse_article_content(self, html: str, article_url: str) -> Optional[Dict[str, str]]:
+        content_data = await ParserPool.run(extractors.parse_article, html, self.engine, self.selectors)
+
+        if content_data is None:
+            logger.warning(f"No article found for URL: {article_url}")
             return None
 
-    async def extract_article_info(self, article: Any) -> Optional[ArticleBase]:
-        try:
-            title_tag = article.find('h3', class_='title-news')
-            if not title_tag:
-                logger.warning("No title found in article")
-                return None
-
-            title_tag_next = title_tag.find('a')
-            if not title_tag_next:
-                logger.warning("No link found in article title")
-                return None
-
-            article_data = {
-                'title': title_tag.get_text(strip=True),
-                'link_url': title_tag_next['href'],
-                'location': None,
-                'datetime': None,
-                'description': None,
-                'image_url': None,
-                'category': None,
-                'content': None,
-                'summary': None
-            }
-
-            location_tag = article.find('span', class_='location-stamp')
-            if location_tag:
-                article_data['location'] = location_tag.get_text(strip=True)
-
-            time_tag = article.find('span', class_='time-ago')
-            if time_tag and 'datetime' in time_tag.attrs:
-                datetime_str = str(time_tag['datetime'])
-                article_data['datetime'] = datetime_str
-
-            description_tag = article.find('p', class_='description')
-            if description_tag:
-                description_link = description_tag.find('a')
-                if description_link:
-                    article_data['description'] = description_link.get_text(strip=True)
-
-            image_tag = article.find('div', class_='thumb-art')
-            if image_tag:
-                img = image_tag.find('img')
-                if img:
-                    article_data['image_url'] = img.get('data-src') or img.get('src')
-
-            content_data = await self.get_article_content(article_data['link_url'])
-            if content_data:
-                article_data['content'] = content_data['content']
-                article_data['category'] = content_data['category']
-
-                if article_data['content'] and len(article_data['content']) > 100:
-                    try:
-                        summarizer = ArticleSummarizer()
-
-                        article_data['summary'] = await summarizer.generate_summary(
-                            article_data['content'],
-                            article_data['title']
-                        )
-                    except Exception as e:
-                        logger.error(f"Error generating summary: {str(e)}")
-                        pass
-
-            logger.info(f"Successfully extracted article info: {article_data['title']}")
-            return ArticleBase(**article_data)
+        logger.info(f"Successfully extracted content from: {article_url}")
+        return content_data
 
+    async def get_article_content(self, article_url: str) -> Optional[Dict[str, str]]:
+        try:
+            html = await self.fetch_page(article_url, self.encoding)
+            return await self.parse_article_content(html, article_url)
         except Exception as e:
-            logger.error(f"Error extracting article info: {str(e)}")
+            logger.error(f"Error extracting content: {e}")
             return None
 
-    async def scrape_articles(self, batch_size: int = 5) -> list[ArticleBase]:
-        articles_data = []
-
+    async def parse_listing(self, html: str, base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        listing = await ParserPool.run(extractors.parse_listing, html, self.engine, self.selectors)
+        if base_url:
+            for article_data in listing:
+                article_data['link_url'] = urljoin(base_url, article_data['link_url'])
+                if article_data['image_url']:
+                    article_data['image_url'] = urljoin(base_url, article_data['image_url'])
+        logger.info(f"Found {len(listing)} articles to process")
+        return listing
+
+    @staticmethod
+    def links_fingerprint(listing: List[Dict[str, Any]]) -> str:
+        links = sorted(str(article_data['link_url']) for article_data in listing)
+        return hashlib.sha256('\n'.join(links).encode('utf-8')).hexdigest()
+
+    async def scrape_listing(
+            self,
+            url: str = None,
+            snapshot: Optional[PageSnapshot] = None
+    ) -> tuple[Optional[List[Dict[str, Any]]], Optional[PageSnapshot]]:
+        """Fetch and parse a listing page.
+
+        Returns ``(None, snapshot)`` when the page, or the set of article links on
+        it, is unchanged since ``snapshot`` was taken.
+        """
+        url = url or settings.BASE_URL
         try:
-            logger.info(f"Scraping articles from {settings.BASE_URL}")
-            result = self.session.get(
-                settings.BASE_URL,
-                timeout=settings.REQUEST_TIMEOUT
-            )
-            result.raise_for_status()
-
-            result.encoding = 'utf-8'
-
-            soup = BeautifulSoup(result.text, "html5lib")
-            articles = soup.find_all("article", class_="thumb-left")
-
-            logger.info(f"Found {len(articles)} articles to process")
-
-            for i, article in enumerate(articles):
-                if article.find('ins', class_='adsbyeclick') or article.find('script'):
-                    continue
-
-                if article.find('h3', class_='title-news'):
-                    article_info = await self.extract_article_info(article)
-                    if article_info:
-                        articles_data.append(article_info)
-
-                        await asyncio.sleep(settings.RATE_LIMIT_DELAY)
-
-                        if len(articles_data) % batch_size == 0:
-                            logger.info(f"Processed {len(articles_data)} articles. Taking a batch delay...")
-                            await asyncio.sleep(settings.RATE_LIMIT_DELAY * 3)
-
-            logger.info(f"Successfully scraped {len(articles_data)} articles")
-            return articles_data
-        except requests.RequestException as e:
+            logger.info(f"Scraping articles from {url}")
+            page = await self.fetch_page_conditional(url, snapshot, encoding=self.encoding or 'utf-8')
+            if page.not_modified:
+                logger.info(f"Listing page not modified since last run: {url}")
+                return None, page.snapshot
+
+            listing = await self.parse_listing(page.text, url)
+            page.snapshot.links_hash = self.links_fingerprint(listing)
+            if snapshot and snapshot.links_hash == page.snapshot.links_hash:
+                logger.info(f"Listing page has the same article links as last run: {url}")
+                return None, page.snapshot
+
+            return listing, page.snapshot
+        except httpx.HTTPError as e:
             logger.error(f"Failed to fetch main page: {str(e)}")
             raise ArticleScrapingError(f"Failed to fetch main page: {str(e)}")
         except Exception as e:
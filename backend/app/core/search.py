@@ -0,0 +1,71 @@
+"""Diacritic-folded search fields for articles and the queries that use them.
+
+Every stored article carries:
+
+- ``search_title`` / ``search_body``: folded title and description + content,
+  covered by the weighted ``search_text`` TEXT index (language
+  ``none``, so there is no stemming to get wrong for Vietnamese)
+- ``search_terms``: unique folded syllables of the title, description and
+  content, a multikey index used for anchored prefix matches while the user
+  is typing
+
+Queries are folded the same way, so "ha noi", "Hà Nội" and "HÀ NỘI" all match.
+"""
+import re
+import unicodedata
+from typing import Any, Dict, Optional
+
+# 2: search_terms include the content (run ``python -m app.cli backfill-search``).
+SEARCH_VERSION = 2
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def fold_text(text: Optional[str]) -> str:
+    """Lowercase, strip Vietnamese diacritics (including đ) and collapse punctuation."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFD", text.lower().replace("đ", "d").replace("Đ", "d"))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_NON_WORD.sub(" ", stripped).split())
+
+
+def search_fields(article: Dict[str, Any]) -> Dict[str, Any]:
+    title = fold_text(article.get("title"))
+    description = fold_text(article.get("description"))
+    body = " ".join(filter(None, (description, fold_text(article.get("content")))))
+    return {
+        "search_title": title,
+        "search_body": body,
+        "search_terms": sorted(set(f"{title} {body}".split())),
+        "search_version": SEARCH_VERSION
+    }
+
+
+def build_search_query(q: str, prefix: bool = True) -> Optional[Dict[str, Any]]:
+    """Translate a user query into a Mongo filter; ``None`` if nothing is searchable.
+
+    Complete words must all match (quoted ``$text`` terms are ANDed). With
+    ``prefix`` the last word is still being typed and only has to start a word
+    of the title, description or content; a one-word prefix query is a pure
+    index range scan on ``search_terms``.
+    """
+    tokens = fold_text(q).split()
+    if not tokens:
+        return None
+
+    words, partial = (tokens[:-1], tokens[-1]) if prefix else (tokens, None)
+
+    query: Dict[str, Any] = {}
+    if words:
+        query["$text"] = {"$search": " ".join(f'"{word}"' for word in words)}
+    if partial:
+        query["search_terms"] = {"$regex": f"^{re.escape(partial)}"}
+    return query
+
+
+def is_ranked(query: Dict[str, Any]) -> bool:
+    return "$text" in query
+
+
+TEXT_SCORE = {"$meta": "textScore"}
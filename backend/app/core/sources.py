@@ -0,0 +1,150 @@
+"""Sites the scraper reads from.
+
+Without ``SOURCES_FILE`` there is a single source, ``vnexpress``, built from
+``BASE_URL`` and ``HTML_EXTRACTOR``. Otherwise the file is a JSON list of
+sources, for example::
+
+    [
+        {
+            "name": "vnexpress",
+            "listing_urls": ["https://vnexpress.net/tin-tuc-24h"],
+            "pages": 3,
+            "categories": {"Thể thao": "https://vnexpress.net/the-thao"},
+            "max_concurrency": 4,
+            "requests_per_minute": 120
+        },
+        {
+            "name": "example",
+            "listing_urls": ["https://news.example.com/latest"],
+            "page_url": "{url}?page={page}",
+            "selectors": {"listing_item": "div.story", "title": "h2",
+                          "detail_article": "main.post", "paragraph": "div.body p"}
+        }
+    ]
+
+Keys are the fields of ``Source``. ``selectors`` override the CSS selectors of
+the lxml extractor (see ``LxmlExtractor.SELECTORS``); ``engine`` may also name
+an extractor class as ``"package.module:ClassName"``.
+"""
+import json
+from dataclasses import MISSING, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Collection, Dict, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from .config import settings
+from .extractors import get_extractor
+from .http_client import HttpClient
+
+
+class ListingPage(NamedTuple):
+    url: str
+    # Listing URL or category feed the page belongs to.
+    feed: str
+    category: Optional[str]
+    page: int
+
+
+@dataclass
+class Source:
+    name: str
+    listing_urls: List[str]
+    # Category name -> listing URL; articles found there get that category
+    # when their page does not name one.
+    categories: Dict[str, str] = field(default_factory=dict)
+    # Listing pages read per listing URL; page N > 1 is ``page_url`` formatted
+    # with the listing ``url`` and ``page``.
+    pages: int = 1
+    page_url: str = "{url}-p{page}"
+    engine: Optional[str] = None
+    selectors: Dict[str, str] = field(default_factory=dict)
+    encoding: str = "utf-8"
+    # Politeness budget for each host of the source; 0 keeps
+    # HTTP_MAX_CONNECTIONS_PER_HOST / no rate limit.
+    max_concurrency: int = 0
+    requests_per_minute: int = 0
+    enabled: bool = True
+
+    def __post_init__(self):
+        self.engine = self.engine or settings.HTML_EXTRACTOR
+        if not isinstance(self.name, str) or not self.name.strip():
+            raise ValueError(f"Source name must be a non-empty string, got {self.name!r}")
+        if not isinstance(self.listing_urls, list) or not all(isinstance(url, str) and url for url in self.listing_urls):
+            raise ValueError(f"Source '{self.name}': listing_urls must be a list of URLs")
+        if not isinstance(self.categories, dict) or not all(isinstance(url, str) for url in self.categories.values()):
+            raise ValueError(f"Source '{self.name}': categories must map category names to URLs")
+        if not self.listing_urls and not self.categories:
+            raise ValueError(f"Source '{self.name}' has no listing_urls or categories")
+        for name in ("pages", "max_concurrency", "requests_per_minute"):
+            value = getattr(self, name)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"Source '{self.name}': {name} must be a non-negative integer, got {value!r}")
+        if self.pages < 1:
+            raise ValueError(f"Source '{self.name}' must read at least one page")
+        # Fails early on an unknown engine or selector key.
+        try:
+            get_extractor(self.engine, self.selectors)
+        except (ValueError, ImportError) as e:
+            raise ValueError(f"Source '{self.name}': {e}") from e
+
+    @property
+    def feeds(self) -> Dict[str, Optional[str]]:
+        """Listing URL -> category (``None`` for plain listing URLs)."""
+        return {**{url: None for url in self.listing_urls}, **{url: category for category, url in self.categories.items()}}
+
+    def listing_pages(self, feeds: Optional[Collection[str]] = None) -> List[ListingPage]:
+        """Every listing page to read, optionally only those of ``feeds``."""
+        return [
+            ListingPage(url if page == 1 else self.page_url.format(url=url, page=page), url, category, page)
+            for url, category in self.feeds.items()
+            if feeds is None or url in feeds
+            for page in range(1, self.pages + 1)
+        ]
+
+    @property
+    def hosts(self) -> set[str]:
+        return {urlsplit(page.url).netloc.lower() for page in self.listing_pages()}
+
+    def apply_politeness(self):
+        for host in self.hosts:
+            HttpClient.configure_host(host, self.max_concurrency, self.requests_per_minute)
+
+
+def default_source() -> Source:
+    return Source(name="vnexpress", listing_urls=[settings.BASE_URL])
+
+
+def parse_sources(config: Any) -> List[Source]:
+    """Sources from the decoded ``SOURCES_FILE``; anything malformed raises
+    ``ValueError`` naming the source."""
+    if not isinstance(config, list):
+        raise ValueError(f"Sources config must be a JSON list of sources, got {type(config).__name__}")
+    known = {f.name for f in fields(Source)}
+    required = {f.name for f in fields(Source) if f.default is MISSING and f.default_factory is MISSING}
+    sources = []
+    for position, entry in enumerate(config, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Source #{position} must be a JSON object, got {type(entry).__name__}")
+        label = f"#{position} {entry['name']!r}" if "name" in entry else f"#{position}"
+        unknown = set(entry) - known
+        if unknown:
+            raise ValueError(f"Unknown keys {sorted(unknown)} in source {label}")
+        missing = required - set(entry)
+        if missing:
+            raise ValueError(f"Source {label} is missing {sorted(missing)}")
+        sources.append(Source(**entry))
+
+    names = [source.name for source in sources]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate source names: {sorted(duplicates)}")
+    return sources
+
+
+def load_sources(path: Optional[str] = None) -> List[Source]:
+    """Enabled sources from ``path`` (default ``SOURCES_FILE``)."""
+    path = path if path is not None else settings.SOURCES_FILE
+    if not path:
+        return [default_source()]
+    config = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [source for source in parse_sources(config) if source.enabled]
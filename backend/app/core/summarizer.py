@@ -1,81 +1,135 @@
 import asyncio
+import json
 import random
 import time
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple, TypedDict
 import google.generativeai as genai
 from .config import settings
+from . import extractive, metrics
+from .rate_limiter import RateLimiter
+from .summary_cache import SummaryCache, summary_cache
 from ..utils import logger
 
+# Rough characters-per-token ratio for Vietnamese text, used to reserve
+# tokens-per-minute quota before the real usage is known.
+CHARS_PER_TOKEN = 3
+RESPONSE_TOKEN_BUDGET = 400
 
-class ArticleSummarizer:
-    def __init__(self):
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
-        self.last_request_time = 0
-        self.min_delay = settings.RATE_LIMIT_DELAY * 2
-        self.max_retries = 3
-        self.backoff_factor = 2
+# Bump whenever the summary prompt changes so cached summaries are not reused.
+PROMPT_VERSION = "v1"
 
-        self.usage_count = 0
-        self.max_usage_per_batch = 10
+gemini_rate_limiter = RateLimiter(
+    requests_per_minute=settings.GEMINI_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.GEMINI_TOKENS_PER_MINUTE,
+    requests_per_day=settings.GEMINI_REQUESTS_PER_DAY,
+    burst=settings.GEMINI_BURST
+)
+metrics.gemini_waiting.set_function(lambda: gemini_rate_limiter.waiting)
 
-        if not hasattr(ArticleSummarizer, '_global_usage_count'):
-            ArticleSummarizer._global_usage_count = 0
-            ArticleSummarizer._last_reset_time = time.time()
 
+def is_rate_limit_error(error: Exception) -> bool:
+    return "429" in str(error) or "quota" in str(error).lower()
 
-    @classmethod
-    def increment_global_usage(cls):
-        cls._global_usage_count  += 1
-        if time.time() - cls._last_reset_time  > 3600:
-            cls._global_usage_count = 1
-            cls.last_reset_time = time.time()
-        return cls._global_usage_count
 
-    @classmethod
-    def should_use_fallback(cls):
-        return cls._global_usage_count > 15
+class BatchSummary(TypedDict):
+    id: str
+    summary: str
 
-    async def _wait_for_rate_limit(self):
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
 
-        if elapsed < self.min_delay:
-            wait_time = self.min_delay - elapsed
-            logger.debug(f"Rate limiting: waiting {wait_time:.2f}s before API call")
-            await asyncio.sleep(wait_time)
+class AdaptiveBatchSizer:
+    """AIMD control of the batch size: grow by one while batches come back fast
+    and clean, shrink multiplicatively on slow replies and halve on errors."""
 
-        self.last_request_time = time.time()
+    def __init__(self, max_size: int, target_latency: float, min_size: int = 1):
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.target_latency = target_latency
+        self.size = max(self.min_size, min(2, self.max_size))
 
-    async def generate_summary_with_retry(self, article_content: str, title: str) -> Optional[str]:
-        if ArticleSummarizer.should_use_fallback():
-            logger.info(f"Skipping API request and use fallback for: {title}")
-            return None
+    def record_success(self, latency: float):
+        if latency <= self.target_latency:
+            self.size = min(self.max_size, self.size + 1)
+        else:
+            self.size = max(self.min_size, int(self.size * 0.75))
 
-        convert_to_summarize = article_content[:1500] if article_content else ""
+    def record_failure(self):
+        self.size = max(self.min_size, self.size // 2)
 
-        for attempt in range(self.max_retries):
-            try:
-                await self._wait_for_rate_limit()
 
-                prompt = f"""
+class ArticleSummarizer:
+    def __init__(
+            self,
+            rate_limiter: Optional[RateLimiter] = None,
+            cache: Optional[SummaryCache] = None
+    ):
+        if settings.GEMINI_API_ENDPOINT:
+            genai.configure(
+                api_key=settings.GEMINI_API_KEY,
+                transport="rest",
+                client_options={"api_endpoint": settings.GEMINI_API_ENDPOINT}
+            )
+        else:
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+        self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
+        self.rate_limiter = rate_limiter or gemini_rate_limiter
+        self.cache = cache or summary_cache
+        self.min_delay = settings.RATE_LIMIT_DELAY * 2
+        self.max_retries = settings.MAX_API_RETRIES
+        self.backoff_factor = 2
+        self.batch_sizer = AdaptiveBatchSizer(
+            max_size=settings.SUMMARY_BATCH_MAX_SIZE,
+            target_latency=settings.SUMMARY_BATCH_TARGET_LATENCY
+        )
+
+    @staticmethod
+    def estimate_tokens(prompt: str) -> int:
+        return len(prompt) // CHARS_PER_TOKEN + RESPONSE_TOKEN_BUDGET
+
+    def _record_usage(self, estimated_tokens: int, response: Any):
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            self.rate_limiter.record_tokens(estimated_tokens, usage.total_token_count)
+            metrics.gemini_tokens.inc(usage.prompt_token_count, type="prompt")
+            metrics.gemini_tokens.inc(usage.candidates_token_count, type="completion")
+
+    async def generate_summary_with_retry(self, article_content: str, title: str) -> Optional[str]:
+        prompt = f"""
                 Tóm gôn nội dung chính của nội dung sau(3-5 dòng): {article_content}
                 """
+        estimated_tokens = self.estimate_tokens(prompt)
+
+        for attempt in range(self.max_retries):
+            started = None
+            try:
+                if not await self.rate_limiter.acquire(estimated_tokens, settings.GEMINI_MAX_WAIT_SECONDS):
+                    logger.info(f"Gemini quota exhausted for now, using fallback for: {title}")
+                    metrics.gemini_quota_skips.inc()
+                    return None
 
                 loop = asyncio.get_running_loop()
+                started = time.perf_counter()
                 response = await loop.run_in_executor(
                     None,
                     lambda: self.model.generate_content(prompt)
                 )
+                metrics.gemini_request_duration.observe(
+                    time.perf_counter() - started, kind="single", outcome="success"
+                )
 
-                ArticleSummarizer.increment_global_usage()
+                self._record_usage(estimated_tokens, response)
 
                 if response and hasattr(response, 'text'):
                     logger.info(f"Generated summary for {title}")
                     return response.text.strip()
                 return None
             except Exception as e:
-                is_rate_limit = "429" in str(e) or "quota" in str(e).lower()
+                is_rate_limit = is_rate_limit_error(e)
+                if started is not None:
+                    metrics.gemini_request_duration.observe(
+                        time.perf_counter() - started,
+                        kind="single",
+                        outcome="rate_limited" if is_rate_limit else "error"
+                    )
 
                 retry_seconds = 0
                 if "retry_delay" in str(e) and "seconds:" in str(e):
@@ -96,37 +150,217 @@ class ArticleSummarizer:
                 )
 
                 if is_rate_limit:
-                    for _ in range(5):
-                        ArticleSummarizer.increment_global_usage()
+                    # Back off every caller sharing the quota; the next acquire()
+                    # waits out the penalty.
+                    self.rate_limiter.penalize(retry_seconds)
 
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(retry_seconds)
+                    if not is_rate_limit:
+                        await asyncio.sleep(retry_seconds)
                 else:
                     logger.error(f"All {self.max_retries} attempts to generate summary failed")
                     return None
 
-    async def generate_summary(self, article_content: str, title: str) -> str | None:
+    async def generate_summary(
+            self,
+            article_content: str,
+            title: str,
+            use_fallback: bool = True,
+            check_cache: bool = True
+    ) -> str | None:
+        """Summarize one article. ``check_cache=False`` skips the cache lookup
+        (the caller already missed it) but still caches the new summary."""
         if not article_content or len(article_content) < 100:
             logger.warning("Article content is too short to summarize: " + title)
             return None
 
+        started = time.perf_counter()
+        cache_key = None
+        if settings.SUMMARY_CACHE_ENABLED:
+            cache_key = SummaryCache.make_key(article_content, settings.GEMINI_MODEL, PROMPT_VERSION)
+            cached_summary = await self.cache.get(cache_key) if check_cache else None
+            if cached_summary:
+                logger.info(f"Summary cache hit for: {title}")
+                self._record_summary("cache", started)
+                return cached_summary
+
         api_summary = await self.generate_summary_with_retry(article_content, title)
 
         if api_summary:
+            if cache_key:
+                await self.cache.set(cache_key, api_summary, settings.GEMINI_MODEL, PROMPT_VERSION)
+            self._record_summary("gemini", started)
             return api_summary
 
+        if not use_fallback:
+            metrics.summary_duration.observe(time.perf_counter() - started, outcome="failed")
+            return None
+
         logger.info(f"Using fallback summarization for: {title}")
-        return await self.generate_fallback_summary(article_content, title)
+        summary = await self.generate_fallback_summary(article_content, title)
+        metrics.summary_duration.observe(time.perf_counter() - started, outcome="fallback")
+        return summary
+
+    @staticmethod
+    def _record_summary(source: str, started: float):
+        metrics.summaries.inc(source=source)
+        metrics.summary_duration.observe(time.perf_counter() - started, outcome=source)
+
+    def _pack_batches(self, pending: List[Tuple[int, str, str]]) -> List[List[Tuple[int, str, str]]]:
+        batches = []
+        current = []
+        current_tokens = 0
+        for entry in pending:
+            tokens = len(entry[1]) // CHARS_PER_TOKEN + RESPONSE_TOKEN_BUDGET
+            if current and (
+                    len(current) >= self.batch_sizer.size
+                    or current_tokens + tokens > settings.SUMMARY_BATCH_TOKEN_BUDGET
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(entry)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _generate_batch(self, batch: List[Tuple[int, str, str]]) -> Dict[int, str]:
+        """Summarize several articles in one request; raises if the reply is unusable."""
+        sections = '\n\n'.join(
+            f"### id={index}\nTiêu đề: {title}\nNội dung: {content}"
+            for index, content, title in batch
+        )
+        prompt = f"""
+                Tóm gọn nội dung chính của từng bài báo sau (3-5 dòng mỗi bài).
+                Trả về một mảng JSON, mỗi phần tử gồm "id" (giữ nguyên id của bài) và "summary".
+
+                {sections}
+                """
+        estimated_tokens = len(prompt) // CHARS_PER_TOKEN + RESPONSE_TOKEN_BUDGET * len(batch)
+
+        if not await self.rate_limiter.acquire(estimated_tokens, settings.GEMINI_MAX_WAIT_SECONDS):
+            metrics.gemini_quota_skips.inc()
+            raise RuntimeError("Gemini quota exhausted for batch request")
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            response = await loop.run_in_executor(
+                None,
+                lambda: self.model.generate_content(
+                    prompt,
+                    generation_config=genai.GenerationConfig(
+                        response_mime_type="application/json",
+                        response_schema=list[BatchSummary]
+                    )
+                )
+            )
+        except Exception as e:
+            metrics.gemini_request_duration.observe(
+                time.perf_counter() - started,
+                kind="batch",
+                outcome="rate_limited" if is_rate_limit_error(e) else "error"
+            )
+            raise
+        metrics.gemini_request_duration.observe(time.perf_counter() - started, kind="batch", outcome="success")
+
+        self._record_usage(estimated_tokens, response)
+
+        items = json.loads(response.text)
+        if not isinstance(items, list):
+            raise ValueError("Batch reply is not a JSON array")
+
+        expected = {str(index): index for index, _, _ in batch}
+        summaries = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index = expected.get(str(item.get('id')))
+            summary = item.get('summary')
+            if index is not None and isinstance(summary, str) and summary.strip():
+                summaries[index] = summary.strip()
+        return summaries
+
+    async def generate_summaries(
+            self,
+            articles: List[Tuple[str, str]],
+            use_fallback: bool = True
+    ) -> List[Optional[str]]:
+        """Summarize ``(content, title)`` pairs, packing several articles per request.
+
+        Batches are bounded by the adaptive batch size and SUMMARY_BATCH_TOKEN_BUDGET.
+        Articles missing from a batch reply, or from a batch that failed
+        entirely, go through ``generate_summary`` one by one, without looking
+        them up in the cache again.
+        """
+        results: List[Optional[str]] = [None] * len(articles)
+        pending = []
+
+        for index, (content, title) in enumerate(articles):
+            if not content or len(content) < 100:
+                logger.warning("Article content is too short to summarize: " + title)
+                continue
+            if settings.SUMMARY_CACHE_ENABLED:
+                started = time.perf_counter()
+                cache_key = SummaryCache.make_key(content, settings.GEMINI_MODEL, PROMPT_VERSION)
+                cached_summary = await self.cache.get(cache_key)
+                if cached_summary:
+                    results[index] = cached_summary
+                    self._record_summary("cache", started)
+                    continue
+            pending.append((index, content, title))
+
+        retry_individually = []
+        for batch in self._pack_batches(pending):
+            if len(batch) == 1:
+                retry_individually.extend(batch)
+                continue
+
+            started = time.perf_counter()
+            try:
+                summaries = await self._generate_batch(batch)
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    self.rate_limiter.penalize(self.min_delay)
+                logger.warning(f"Batch summarization of {len(batch)} articles failed: {str(e)}")
+                self.batch_sizer.record_failure()
+                retry_individually.extend(batch)
+                continue
+
+            if len(summaries) < len(batch):
+                self.batch_sizer.record_failure()
+            else:
+                self.batch_sizer.record_success(time.perf_counter() - started)
+            logger.info(f"Batch summarized {len(summaries)}/{len(batch)} articles")
+
+            for index, content, title in batch:
+                if index not in summaries:
+                    retry_individually.append((index, content, title))
+                    continue
+                results[index] = summaries[index]
+                self._record_summary("gemini", started)
+                if settings.SUMMARY_CACHE_ENABLED:
+                    await self.cache.set(
+                        SummaryCache.make_key(content, settings.GEMINI_MODEL, PROMPT_VERSION),
+                        summaries[index],
+                        settings.GEMINI_MODEL,
+                        PROMPT_VERSION
+                    )
+
+        for index, content, title in retry_individually:
+            results[index] = await self.generate_summary(content, title, use_fallback, check_cache=False)
+
+        return results
 
     async def generate_fallback_summary(self, article_content: str, title: str) -> str | None:
         logger.info(f"Generating fallback summary for: {title}")
+        metrics.summaries.inc(source="fallback")
 
         if not article_content or len(article_content) < 50:
             return f"[Tóm tắt tự động] {title}"
 
-        sentences = article_content.split('.')
+        return extractive.summarize_text(article_content) or f"[Tóm tắt tự động] {title}"
 
-        max_sentences = min(3, len(sentences))
-        summary = '. '.join(sentences[:max_sentences]).strip() + '.'
 
-        return summary
\ No newline at end of file
+article_summarizer = ArticleSummarizer()
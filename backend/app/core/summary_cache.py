@@ -0,0 +1,103 @@
+import hashlib
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from .config import settings
+from .database import MongoDB
+from ..utils import logger
+
+
+def normalize_content(content: str) -> str:
+    return ' '.join(unicodedata.normalize('NFC', content).split())
+
+
+class SummaryCache:
+    """Two-tier cache of LLM summaries keyed by normalized content + prompt/model version.
+
+    The in-process LRU answers repeat lookups without a round-trip; the
+    ``summary_cache`` collection (TTL-indexed on ``created_at``) shares entries
+    across processes and restarts.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(content: str, model: str, prompt_version: str) -> str:
+        payload = f"{model}\x00{prompt_version}\x00{normalize_content(content)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _collection(self):
+        return MongoDB.get_client()[settings.MONGODB_DB_NAME]["summary_cache"]
+
+    def _remember(self, key: str, summary: str):
+        self._entries[key] = (summary, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            summary, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return summary
+            del self._entries[key]
+
+        try:
+            doc = await self._collection().find_one({"_id": key}, {"summary": 1})
+        except Exception as e:
+            logger.warning(f"Summary cache lookup failed: {str(e)}")
+            doc = None
+
+        if doc and doc.get("summary"):
+            self._remember(key, doc["summary"])
+            self.db_hits += 1
+            return doc["summary"]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, summary: str, model: str, prompt_version: str):
+        self._remember(key, summary)
+        try:
+            await self._collection().update_one(
+                {"_id": key},
+                {"$set": {
+                    "summary": summary,
+                    "model": model,
+                    "prompt_version": prompt_version,
+                    "created_at": datetime.now()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Summary cache write failed: {str(e)}")
+
+    def get_stats(self) -> dict:
+        hits = self.memory_hits + self.db_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
+
+
+summary_cache = SummaryCache(
+    max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS
+)
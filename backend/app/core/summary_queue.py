@@ -0,0 +1,233 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+
+from .config import settings
+from .database import MongoDB
+from .response_cache import response_cache
+from .summarizer import ArticleSummarizer, article_summarizer
+from ..utils import logger
+
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+FALLBACK = "fallback"
+SKIPPED = "skipped"
+
+
+class SummaryQueue:
+    """Summarization work queue kept on the article documents themselves.
+
+    ``summary_available_at`` is the single ordering field: for a pending article
+    it is when it may be tried (again), for a claimed one it is when its lease
+    runs out. Claiming is one atomic ``find_one_and_update``, so an article whose
+    worker died simply becomes claimable again once the lease expires.
+    """
+
+    def __init__(self, lease_seconds: int, max_attempts: int, retry_delay_seconds: int):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self._wakeup = asyncio.Event()
+
+    def _collection(self):
+        return MongoDB.get_client()[settings.MONGODB_DB_NAME]["articles"]
+
+    def notify(self):
+        """Wake idle workers, e.g. right after the scraper stored new articles."""
+        self._wakeup.set()
+
+    async def wait(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        now = datetime.now()
+        return await self._collection().find_one_and_update(
+            {
+                "summary_status": {"$in": [PENDING, PROCESSING]},
+                "summary_available_at": {"$lte": now}
+            },
+            {
+                "$set": {
+                    "summary_status": PROCESSING,
+                    "summary_available_at": now + timedelta(seconds=self.lease_seconds),
+                    "summary_lease": uuid.uuid4().hex,
+                    "summary_worker": worker_id
+                },
+                "$inc": {"summary_attempts": 1}
+            },
+            projection={"title": 1, "content": 1, "summary_attempts": 1, "summary_lease": 1},
+            sort=[("summary_available_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def claim_batch(self, worker_id: str, limit: int) -> List[Dict[str, Any]]:
+        claimed = []
+        while len(claimed) < limit:
+            doc = await self.claim(worker_id)
+            if doc is None:
+                break
+            claimed.append(doc)
+        return claimed
+
+    async def _finish(self, doc: Dict[str, Any], update: Dict[str, Any]) -> bool:
+        # Matching on the lease token makes a late worker whose lease already
+        # expired (and was re-claimed) unable to overwrite the newer result.
+        result = await self._collection().update_one(
+            {"_id": doc["_id"], "summary_status": PROCESSING, "summary_lease": doc["summary_lease"]},
+            update
+        )
+        return result.modified_count == 1
+
+    async def complete(self, doc: Dict[str, Any], summary: str, status: str = DONE) -> bool:
+        completed = await self._finish(doc, {
+            "$set": {
+                "summary": summary,
+                "summary_status": status,
+                "summary_error": None,
+                "updated_at": datetime.now()
+            },
+            "$unset": {"summary_available_at": "", "summary_lease": "", "summary_worker": ""}
+        })
+        if completed:
+            # Summaries are shown on the article cards.
+            response_cache.invalidate()
+        return completed
+
+    async def retry(self, doc: Dict[str, Any], error: str) -> bool:
+        delay = self.retry_delay_seconds * (2 ** max(doc.get("summary_attempts", 1) - 1, 0))
+        return await self._finish(doc, {
+            "$set": {
+                "summary_status": PENDING,
+                "summary_available_at": datetime.now() + timedelta(seconds=delay),
+                "summary_error": error
+            },
+            "$unset": {"summary_lease": "", "summary_worker": ""}
+        })
+
+    async def get_stats(self) -> dict:
+        now = datetime.now()
+        counts = {PENDING: 0, PROCESSING: 0, DONE: 0, FALLBACK: 0, SKIPPED: 0}
+        oldest_ready = None
+        try:
+            async for row in self._collection().aggregate([
+                {"$match": {"summary_status": {"$ne": None}}},
+                {"$group": {"_id": "$summary_status", "count": {"$sum": 1}}}
+            ]):
+                counts[row["_id"]] = row["count"]
+
+            # Claimable articles, including those whose worker died holding the
+            # lease: they wait from the moment it expired.
+            oldest = await self._collection().find_one(
+                {"summary_status": {"$in": [PENDING, PROCESSING]}, "summary_available_at": {"$lte": now}},
+                {"summary_available_at": 1},
+                sort=[("summary_available_at", ASCENDING)]
+            )
+            if oldest:
+                oldest_ready = oldest["summary_available_at"]
+        except Exception as e:
+            logger.warning(f"Summary queue stats failed: {str(e)}")
+
+        return {
+            "depth": counts[PENDING] + counts[PROCESSING],
+            "by_status": counts,
+            "lag_seconds": round((now - oldest_ready).total_seconds(), 1) if oldest_ready else 0.0
+        }
+
+
+class SummaryWorkerPool:
+    """Background tasks that drain ``SummaryQueue`` through the shared summarizer.
+
+    Every worker goes through the same ``ArticleSummarizer`` (and so the same
+    Gemini rate limiter), claiming as many articles as the current batch size.
+    Articles the API could not summarize are retried with exponential delay; on
+    the last attempt the local fallback summary is stored instead.
+    """
+
+    def __init__(self, queue: SummaryQueue, summarizer: Optional[ArticleSummarizer] = None):
+        self.queue = queue
+        self.summarizer = summarizer or article_summarizer
+        self._tasks: List[asyncio.Task] = []
+        self.summarized = 0
+        self.retried = 0
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self, workers: int):
+        if self.is_running:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(f"summary-worker-{index}"))
+            for index in range(workers)
+        ]
+        logger.info(f"Started {workers} summary workers")
+
+    async def stop(self):
+        # Articles claimed by a cancelled worker keep their lease and are picked
+        # up again once it expires.
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, worker_id: str):
+        while True:
+            try:
+                limit = self.summarizer.batch_sizer.size if settings.SUMMARY_BATCH_ENABLED else 1
+                docs = await self.queue.claim_batch(worker_id, limit)
+                if not docs:
+                    await self.queue.wait(settings.SUMMARY_POLL_INTERVAL_SECONDS)
+                    continue
+                await self._process(docs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Summary worker {worker_id} failed: {str(e)}", exc_info=True)
+                await asyncio.sleep(settings.SUMMARY_POLL_INTERVAL_SECONDS)
+
+    async def _process(self, docs: List[Dict[str, Any]]):
+        articles = [(doc.get("content") or "", doc.get("title") or "") for doc in docs]
+        if len(docs) > 1:
+            summaries = await self.summarizer.generate_summaries(articles, use_fallback=False)
+        else:
+            summaries = [await self.summarizer.generate_summary(*articles[0], use_fallback=False)]
+
+        for doc, (content, title), summary in zip(docs, articles, summaries):
+            if summary:
+                if await self.queue.complete(doc, summary):
+                    self.summarized += 1
+                continue
+
+            if doc.get("summary_attempts", 1) >= self.queue.max_attempts:
+                fallback = await self.summarizer.generate_fallback_summary(content, title)
+                await self.queue.complete(doc, fallback, FALLBACK)
+                logger.warning(f"Giving up on Gemini summary after {doc['summary_attempts']} attempts: {title}")
+                continue
+
+            self.retried += 1
+            await self.queue.retry(doc, "Gemini summary unavailable")
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": sum(1 for task in self._tasks if not task.done()),
+            "summarized": self.summarized,
+            "retried": self.retried
+        }
+
+
+summary_queue = SummaryQueue(
+    lease_seconds=settings.SUMMARY_LEASE_SECONDS,
+    max_attempts=settings.SUMMARY_MAX_ATTEMPTS,
+    retry_delay_seconds=settings.SUMMARY_RETRY_DELAY_SECONDS
+)
+
+summary_workers = SummaryWorkerPool(summary_queue)
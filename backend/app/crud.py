@@ -1,74 +1,410 @@
+import base64
+import hashlib
+import json
+import time
 from datetime import datetime
 from typing import Optional
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
 from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
 
+from .core.response_cache import response_cache
+from .core.search import TEXT_SCORE, build_search_query, is_ranked, search_fields
 from .utils import logger
-from .models import ArticleBase, ArticleDB
+from .models import ArticleBase, ArticleDB, BulkUpsertResult, CategoryStats, PageSnapshot
 
 
-async def create_articles(db: Collection, article: ArticleBase) -> Optional[ArticleDB]:
-    article_dict = article.model_dump()
-    now = datetime.now()
+def _article_update(
+        article: ArticleBase,
+        now: datetime,
+        summary_status: Optional[str] = None
+) -> tuple[dict, dict]:
+    """Build the upsert for one article and the fingerprint of the fields it sets.
+
+    With ``summary_status`` the article is (re)queued for summarization instead:
+    a stored summary is left in place until the summary workers replace it, and
+    ``article.summary`` (a draft) is only written for new articles.
+    """
+    article_dict = article.model_dump(mode="json")
 
     update_data = {
-        "$set": {
-            **article_dict,
-            "updated_at": now
-        },
+        "$set": article_dict,
         "$setOnInsert": {
             "created_at": now
         }
     }
 
+    if summary_status is not None:
+        update_data["$setOnInsert"]["summary"] = article_dict.pop("summary")
+
+    article_dict["content_hash"] = hashlib.sha256(
+        json.dumps(article_dict, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    article_dict["updated_at"] = now
+    article_dict.update(search_fields(article_dict))
+
+    if summary_status is not None:
+        article_dict.update({
+            "summary_status": summary_status,
+            "summary_attempts": 0,
+            "summary_available_at": now,
+            "summary_error": None
+        })
+
+    return update_data, article_dict["content_hash"]
+
+
+async def create_articles(
+        db: Collection,
+        article: ArticleBase,
+        summary_status: Optional[str] = None
+) -> Optional[ArticleDB]:
+    """Upsert a single article by ``link_url`` and return the stored document.
+
+    The previous version of the document is needed for the category counts, so
+    the stored document is rebuilt from it and the update instead of being read
+    back; the ``_id`` of a new article is chosen up front for the same reason.
+    """
+    update_data, _ = _article_update(article, datetime.now(), summary_status)
+    update_data["$setOnInsert"]["_id"] = ObjectId()
+
     try:
-        result = await db.update_one(
-            {"link_url": article_dict["link_url"]},
+        previous = await db.find_one_and_update(
+            {"link_url": update_data["$set"]["link_url"]},
             update_data,
             upsert=True,
+            return_document=ReturnDocument.BEFORE
         )
+        stored_article = {**(previous or update_data["$setOnInsert"]), **update_data["$set"]}
 
-        if result.upserted_id:
-            article_id = result.upserted_id
+        changes = CategoryChanges()
+        if previous is None:
+            changes.add(stored_article.get("category"), 1, stored_article["created_at"])
         else:
-            existing_article = await db.find_one({"link_url": article_dict["link_url"]})
-            article_id = existing_article["_id"]
+            changes.move(previous, stored_article.get("category"))
+        await apply_category_changes(db, changes)
 
-        updated_article = await db.find_one({"_id": article_id})
-        if updated_article:
-            return ArticleDB(**updated_article)
-        return None
+        response_cache.invalidate()
+        return ArticleDB(**stored_article)
     except Exception as e:
-        print(f"Error saving article: {e}")
+        logger.error(f"Error saving article: {e}")
         return None
 
 
-async def fetch_articles_from_db(
+async def bulk_upsert_articles(
+        db: Collection,
+        articles: list[ArticleBase],
+        summary_statuses: Optional[list[Optional[str]]] = None,
+        return_documents: bool = False
+) -> BulkUpsertResult:
+    """Upsert a batch of articles with one unordered ``bulk_write``.
+
+    Stored ``content_hash`` fingerprints are read first, so articles whose
+    fields did not change are reported as unchanged and not written at all.
+    Whether an article was inserted comes from the upserts the write reports,
+    not from that read, since another writer may store the same URL in between.
+    Stored documents are only read back when ``return_documents`` is set.
+    """
+    result = BulkUpsertResult()
+    if not articles:
+        return result
+
+    now = datetime.now()
+    statuses = summary_statuses or [None] * len(articles)
+
+    updates = {}
+    for article, summary_status in zip(articles, statuses):
+        update_data, content_hash = _article_update(article, now, summary_status)
+        # A later duplicate of the same URL in one batch wins, as it would with
+        # sequential upserts.
+        updates[update_data["$set"]["link_url"]] = (update_data, content_hash)
+
+    try:
+        cursor = db.find(
+            {"link_url": {"$in": list(updates)}},
+            {"_id": 0, "link_url": 1, "content_hash": 1, "category": 1, "created_at": 1}
+        )
+        stored = {doc["link_url"]: doc async for doc in cursor}
+    except Exception as e:
+        logger.error(f"Error reading article fingerprints: {e}")
+        result.failed = list(updates)
+        return result
+
+    operations, operation_urls = [], []
+    for link_url, (update_data, content_hash) in updates.items():
+        if link_url in stored and stored[link_url].get("content_hash") == content_hash:
+            result.unchanged.append(link_url)
+            continue
+        operations.append(UpdateOne({"link_url": link_url}, update_data, upsert=True))
+        operation_urls.append(link_url)
+
+    if operations:
+        failed_indexes, upserted_indexes = set(), set()
+        try:
+            write_result = await db.bulk_write(operations, ordered=False)
+            upserted_indexes = set(write_result.upserted_ids or {})
+        except BulkWriteError as e:
+            failed_indexes = {error["index"] for error in e.details.get("writeErrors", [])}
+            upserted_indexes = {upsert["index"] for upsert in e.details.get("upserted", [])}
+            logger.error(f"Bulk write failed for {len(failed_indexes)} of {len(operations)} articles")
+        except Exception as e:
+            logger.error(f"Error saving articles: {e}")
+            failed_indexes = set(range(len(operations)))
+
+        changes = CategoryChanges()
+        for index, link_url in enumerate(operation_urls):
+            category = updates[link_url][0]["$set"].get("category")
+            if index in failed_indexes:
+                result.failed.append(link_url)
+            elif index in upserted_indexes:
+                result.inserted.append(link_url)
+                changes.add(category, 1, now)
+            else:
+                result.updated.append(link_url)
+                # Inserted by another writer after the read: it counted the
+                # article under its own category.
+                if link_url in stored:
+                    changes.move(stored[link_url], category)
+
+        try:
+            await apply_category_changes(db, changes)
+        except Exception as e:
+            logger.error(f"Error updating category stats, run 'python -m app.cli rebuild-category-stats': {e}")
+
+    if result.inserted or result.updated:
+        response_cache.invalidate()
+
+    if return_documents and (result.inserted or result.updated):
+        cursor = db.find({"link_url": {"$in": result.inserted + result.updated}})
+        result.articles = [ArticleDB(**doc) async for doc in cursor]
+
+    return result
+
+
+async def fetch_known_urls(db: Collection, urls: list[str]) -> dict[str, Optional[datetime]]:
+    """Return ``{link_url: updated_at}`` for the given URLs that are already stored."""
+    if not urls:
+        return {}
+    cursor = db.find(
+        {"link_url": {"$in": urls}},
+        {"_id": 0, "link_url": 1, "updated_at": 1}
+    )
+    return {doc["link_url"]: doc.get("updated_at") async for doc in cursor}
+
+
+async def fetch_page_snapshots(db: Collection, urls: list[str]) -> dict[str, PageSnapshot]:
+    if not urls:
+        return {}
+    cursor = db.find({"url": {"$in": urls}}, {"_id": 0})
+    return {doc["url"]: PageSnapshot(**doc) async for doc in cursor}
+
+
+async def save_page_snapshot(db: Collection, snapshot: PageSnapshot):
+    await db.update_one(
+        {"url": snapshot.url},
+        {"$set": snapshot.model_dump()},
+        upsert=True
+    )
+
+
+async def save_page_snapshots(db: Collection, snapshots: list[PageSnapshot]):
+    if not snapshots:
+        return
+    await db.bulk_write(
+        [UpdateOne({"url": snapshot.url}, {"$set": snapshot.model_dump()}, upsert=True) for snapshot in snapshots],
+        ordered=False
+    )
+
+
+def build_article_filter(category: str | None = None, q: str | None = None, prefix: bool = True) -> dict:
+    filter_query = {}
+    if category:
+        filter_query['category'] = category
+    if q:
+        search_query = build_search_query(q, prefix)
+        if search_query:
+            filter_query.update(search_query)
+    return filter_query
+
+
+ARTICLE_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# Fields of ``ArticleListItem``; ``content`` is by far the largest field and only
+# the detail endpoint needs it.
+ARTICLE_LIST_PROJECTION = {
+    "title": 1, "link_url": 1, "location": 1, "datetime": 1, "description": 1, "image_url": 1,
+    "category": 1, "summary": 1, "summary_status": 1, "created_at": 1, "updated_at": 1
+}
+
+
+async def fetch_articles_page(
         db: Collection,
-        category: str | None = None,
-        q: str | None = None
-):
+        filter_query: dict,
+        skip: int,
+        limit: int,
+        projection: Optional[dict] = None
+) -> list[dict]:
+    """Offset page in ``ARTICLE_SORT`` order, or by relevance first for ``$text``
+    searches; only ``limit`` documents are read."""
+    sort = ARTICLE_SORT
+    if is_ranked(filter_query):
+        projection = {**(projection or {}), "score": TEXT_SCORE}
+        sort = [("score", TEXT_SCORE), *ARTICLE_SORT]
+    cursor = db.find(filter_query, projection).sort(sort).skip(skip).limit(limit)
+    return await cursor.to_list(length=limit)
+
+
+def encode_cursor(doc: dict) -> str:
+    payload = f"{doc['created_at'].isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    """Raise ``ValueError`` for a cursor that was not produced by ``encode_cursor``."""
     try:
-        filter_query = {}
-        if category:
-            filter_query['category'] = category
-        if q:
-            filter_query['$or'] = [
-                {'title': {'$regex': q, '$options': 'i'}},
-                {'content': {'$regex': q, '$options': 'i'}}
-            ]
-        cursor = db.find(filter_query).sort("created_at", -1)
-        articles = await cursor.to_list(length=None)
-
-        return articles
+        created_at, article_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), ObjectId(article_id)
     except Exception as e:
-        print(f"Error fetching articles: {e}")
-        return []
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def build_keyset_filter(filter_query: dict, cursor: str | None) -> dict:
+    """Restrict ``filter_query`` to the articles after ``cursor`` in ``ARTICLE_SORT`` order."""
+    if not cursor:
+        return dict(filter_query)
+    created_at, article_id = decode_cursor(cursor)
+    keyset = {'$or': [
+        {'created_at': {'$lt': created_at}},
+        {'created_at': created_at, '_id': {'$lt': article_id}}
+    ]}
+    return {'$and': [filter_query, keyset]} if filter_query else keyset
+
+
+async def fetch_articles_after(
+        db: Collection,
+        filter_query: dict,
+        cursor: str | None,
+        limit: int,
+        projection: Optional[dict] = None
+) -> tuple[list[dict], str | None]:
+    """Keyset page on ``(created_at, _id)`` descending; searches in the feed are
+    filtered but stay in chronological order.
+
+    Returns the documents and the cursor of the next page (``None`` on the last
+    page). Each page is an index range scan, whatever its depth.
+    """
+    query = build_keyset_filter(filter_query, cursor)
+    docs = await db.find(query, projection).sort(ARTICLE_SORT).limit(limit + 1).to_list(length=limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+
+_count_cache: dict[str, tuple[int, float]] = {}
+
+
+async def count_articles(db: Collection, filter_query: dict, ttl_seconds: float) -> int:
+    """Total for ``filter_query``: collection metadata when unfiltered, otherwise a
+    ``count_documents`` result cached for ``ttl_seconds``."""
+    if not filter_query:
+        return await db.estimated_document_count()
+
+    key = json.dumps(filter_query, sort_keys=True, default=str)
+    cached = _count_cache.get(key)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+
+    total = await db.count_documents(filter_query)
+    if len(_count_cache) >= 1024:
+        _count_cache.clear()
+    _count_cache[key] = (total, time.monotonic() + ttl_seconds)
+    return total
+
+
+async def fetch_article(db: Collection, article_id: str) -> Optional[dict]:
+    if not ObjectId.is_valid(article_id):
+        return None
+    return await db.find_one({"_id": ObjectId(article_id)})
+
+
+class CategoryChanges:
+    """Per-category article count deltas and newest ``created_at`` of one write."""
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+        self.latest: dict[str, datetime] = {}
+
+    def add(self, category: Optional[str], amount: int, created_at: Optional[datetime] = None):
+        if not category:
+            return
+        self.counts[category] = self.counts.get(category, 0) + amount
+        if created_at and amount > 0:
+            current = self.latest.get(category)
+            if current is None or created_at > current:
+                self.latest[category] = created_at
+
+    def move(self, previous: dict, category: Optional[str]):
+        if previous.get("category") != category:
+            self.add(previous.get("category"), -1)
+            self.add(category, 1, previous.get("created_at"))
+
+
+def _category_stats(db: Collection) -> Collection:
+    return db.database["category_stats"]
+
+
+async def apply_category_changes(db: Collection, changes: CategoryChanges):
+    """Apply ``changes`` to ``category_stats``; ``db`` is the articles collection."""
+    operations = []
+    for category, amount in changes.counts.items():
+        update = {
+            "$inc": {"article_count": amount},
+            "$set": {"updated_at": datetime.now()}
+        }
+        if category in changes.latest:
+            update["$max"] = {"latest_article_at": changes.latest[category]}
+        if amount or category in changes.latest:
+            operations.append(UpdateOne({"_id": category}, update, upsert=True))
+    if operations:
+        await _category_stats(db).bulk_write(operations, ordered=False)
+
+
+async def rebuild_category_stats(db: Collection) -> int:
+    """Recompute ``category_stats`` from the articles collection; returns the number of categories.
+
+    Latest article times only ever move forward incrementally, so this is also
+    the repair for counts after articles were deleted or edited by hand.
+    """
+    now = datetime.now()
+    rows = await db.aggregate([
+        {"$match": {"category": {"$nin": [None, ""]}}},
+        {"$group": {
+            "_id": "$category",
+            "article_count": {"$sum": 1},
+            "latest_article_at": {"$max": "$created_at"}
+        }}
+    ]).to_list(length=None)
+
+    stats = _category_stats(db)
+    await stats.delete_many({})
+    if rows:
+        await stats.insert_many([{**row, "updated_at": now} for row in rows])
+    response_cache.invalidate()
+    return len(rows)
+
+
+async def ensure_category_stats(db: Collection):
+    """Build ``category_stats`` once for databases that predate it."""
+    if await _category_stats(db).estimated_document_count() == 0 and await db.estimated_document_count() > 0:
+        count = await rebuild_category_stats(db)
+        logger.info(f"Built category stats for {count} categories")
 
 
-async def get_distinct_categories(db: Collection):
+async def fetch_category_stats(db: Collection) -> list[CategoryStats]:
+    """Categories that have articles, by name; reads one small document per category."""
     try:
-        categories = await db.distinct("category", {"category": {"$ne": None}})
-        return sorted(filter(None, categories))
+        cursor = _category_stats(db).find({"article_count": {"$gt": 0}}).sort("_id", ASCENDING)
+        return [CategoryStats(name=doc["_id"], **doc) async for doc in cursor]
     except Exception as e:
-        logger.error(f"Error fetching distinct categories: {e}")
-        raise
\ No newline at end of file
+        logger.error(f"Error fetching category stats: {e}")
+        raise
@@ -8,8 +8,15 @@ from starlette.middleware.cors import CORSMiddleware
 
 from .core.database import MongoDB
 from .core.config import settings
+from .core.extractors import ParserPool
+from .core.http_client import HttpClient
+from .core.jobs import job_manager
+from .core.metrics import MetricsMiddleware
 from .core.scheduler import article_scheduler
+from .core.summary_queue import summary_workers
 from .api.main import api_router
+from .api.routes import metrics
+from .crud import ensure_category_stats
 from .core.error_handles import (
     ArticleException,
     article_exception_handler,
@@ -30,7 +37,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.info("Connected to MongoDB")
 
         await MongoDB.setup_indexes()
+        await ensure_category_stats(MongoDB.get_client()[settings.MONGODB_DB_NAME]["articles"])
 
+        ParserPool.configure(settings.PARSER_PROCESS_WORKERS)
+
+        logger.info(f"Summaries are made in '{settings.SUMMARY_MODE}' mode")
+        if settings.SUMMARY_MODE == "queue":
+            summary_workers.start(settings.SUMMARY_WORKERS)
+
+        await article_scheduler.startup()
         # await article_scheduler.start_scheduler(interval_minutes=30)
 
         yield
@@ -39,9 +54,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         raise HTTPException(status_code=500, detail="Failed to connect to MongoDB")
     finally:
         try:
-            if article_scheduler.is_running:
-                await article_scheduler.stop_scheduler()
-                logger.info("Article scheduler stopped")
+            await job_manager.shutdown()
+            # Leaves the shared schedule in place for the other nodes.
+            await article_scheduler.shutdown()
+
+            await summary_workers.stop()
+            await HttpClient.close_client()
+            ParserPool.shutdown()
 
             MongoDB.close_client()
             logger.info("Disconnected from MongoDB")
@@ -71,6 +90,11 @@ if settings.all_cors_origins:
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+if settings.METRICS_ENABLED:
+    # Outermost, so the latency includes CORS and the exception handlers.
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
 
 @app.exception_handler(HTTPException)
 async def custom_http_exception_handler(request, exc):
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, Annotated
+from typing import Literal, Optional, Annotated
 from bson import ObjectId
 from pydantic import BaseModel, HttpUrl, Field, ConfigDict, BeforeValidator
 
@@ -34,17 +34,87 @@ class ArticleDB(ArticleBase):
     )
 
     id: PyObjectId = Field(default=None, alias="_id")
+    summary_status: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: Optional[datetime] = Field(default_factory=datetime.now)
 
 
+class ArticleListItem(BaseModel):
+    """What a news card needs; list endpoints project away ``content``."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PyObjectId = Field(default=None, alias="_id")
+    # Declared before the ``datetime`` field, which shadows the type in the class body.
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    title: str
+    link_url: str
+    location: Optional[str] = None
+    datetime: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    category: Optional[str] = None
+    summary: Optional[str] = None
+    summary_status: Optional[str] = None
+
+
+class ArticleFeed(BaseModel):
+    items: list[ArticleListItem]
+    next_cursor: Optional[str] = None
+
+
+class CategoryStats(BaseModel):
+    name: str
+    article_count: int
+    latest_article_at: Optional[datetime] = None
+
+
+class BulkUpsertResult(BaseModel):
+    inserted: list[str] = []
+    updated: list[str] = []
+    unchanged: list[str] = []
+    failed: list[str] = []
+    articles: list[ArticleDB] = []
+
+
+class PageSnapshot(BaseModel):
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    links_hash: Optional[str] = None
+    checked_at: datetime = Field(default_factory=datetime.now)
+
+
+class FetchedPage(BaseModel):
+    url: str
+    text: Optional[str] = None
+    not_modified: bool = False
+    snapshot: PageSnapshot
+
+
 class SchedulerConfig(BaseModel):
     interval_minutes: int = Field(
         default=30,
         ge=5,
         le=1440,
-        description="Interval between scraping runs in minutes"
+        description="Interval between scraping runs in minutes (fixed mode)"
     )
+    mode: Literal["fixed", "adaptive"] = Field(
+        default="fixed",
+        description="fixed: every feed each interval; adaptive: each feed on its own learned interval"
+    )
+
+
+class CrawlDecision(BaseModel):
+    source: str
+    feed: str
+    interval_minutes: float
+    rate_per_minute: Optional[float] = None
+    last_new: int
+    last_polled_at: datetime
+    next_poll_at: datetime
+    reason: str
 
 
 class SchedulerStatus(BaseModel):
@@ -53,4 +123,61 @@ class SchedulerStatus(BaseModel):
     last_run_status: Optional[str]
     next_run_time: Optional[str]
     total_articles_scraped: int
+    last_run_skipped: int = 0
+    last_run_refreshed: int = 0
+    total_articles_skipped: int = 0
+    total_articles_refreshed: int = 0
     active_jobs: int
+    mode: Optional[str] = None
+    interval_minutes: Optional[int] = None
+    last_run_duration_seconds: Optional[float] = None
+    node_id: Optional[str] = None
+    leader: Optional[str] = None
+    is_leader: bool = False
+    crawl_plan: list[CrawlDecision] = []
+
+
+class SchedulerRun(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PyObjectId = Field(default=None, alias="_id")
+    node: str
+    trigger: str
+    mode: str = "fixed"
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    discovered: int = 0
+    stored: int = 0
+    skipped: int = 0
+    refreshed: int = 0
+    failed: int = 0
+    # Per-source counts, by source name.
+    sources: dict[str, dict[str, int]] = {}
+    error: Optional[str] = None
+
+
+class JobStage(BaseModel):
+    count: int
+    first_at: datetime
+    last_at: datetime
+    duration_seconds: float
+
+
+class JobStatus(BaseModel):
+    id: str
+    kind: str
+    trigger: str
+    status: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    progress: dict[str, int] = {}
+    stages: dict[str, JobStage] = {}
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    # False when the request joined a job that was already queued or running.
+    created: Optional[bool] = None
+
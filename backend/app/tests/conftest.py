@@ -0,0 +1,90 @@
+import os
+import tempfile
+
+# Settings are read at import time; the tests never talk to Gemini or a real
+# MongoDB (see the ``db`` fixture).
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("PROJECT_NAME", "Summary Articles API")
+os.environ.setdefault("SCHEDULER_JOBSTORE", "memory")
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="article-tests-logs-"))
+
+import httpx  # noqa: E402
+import mongomock.collection  # noqa: E402
+import pytest  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+from pymongo.errors import BulkWriteError  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import MongoDB  # noqa: E402
+from app.core.http_client import HttpClient  # noqa: E402
+from app.core.response_cache import response_cache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.tests.scripts.fixture_server import FixtureServer  # noqa: E402
+
+# pymongo >= 4.11 passes ``sort`` to bulk updates, which mongomock does not accept.
+_add_update = mongomock.collection.BulkOperationBuilder.add_update
+mongomock.collection.BulkOperationBuilder.add_update = (
+    lambda self, *args, sort=None, **kwargs: _add_update(self, *args, **kwargs)
+)
+
+_execute = mongomock.collection.BulkOperationBuilder.execute
+
+
+def _execute_with_upsert_indexes(self, write_concern=None):
+    """mongomock numbers ``upserted`` entries 0, 1, ... instead of by operation
+    index as MongoDB does."""
+    upserted_at = []
+
+    def track(index, execute_func):
+        def tracked():
+            result = execute_func()
+            if result.get("upserted"):
+                upserted_at.append(index)
+            return result
+        tracked.__name__ = execute_func.__name__
+        return tracked
+
+    def renumber(result):
+        for entry, index in zip(result["upserted"], upserted_at):
+            entry["index"] = index
+        return result
+
+    self.executors = [track(index, execute_func) for index, execute_func in enumerate(self.executors)]
+    try:
+        return renumber(_execute(self, write_concern))
+    except BulkWriteError as e:
+        renumber(e.details)
+        raise
+
+
+mongomock.collection.BulkOperationBuilder.execute = _execute_with_upsert_indexes
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """Articles database on a fresh in-memory client, also used by ``MongoDB.get_client()``."""
+    MongoDB._client = AsyncMongoMockClient()
+    response_cache.invalidate()
+    yield MongoDB._client[settings.MONGODB_DB_NAME]
+    MongoDB._client = None
+    await HttpClient.close_client()
+
+
+@pytest.fixture
+async def api(db):
+    """Client for the API on ``db``; the app's lifespan (scheduler, workers) is not run."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        yield client
+
+
+@pytest.fixture
+def fixture_server():
+    with FixtureServer() as server:
+        yield server
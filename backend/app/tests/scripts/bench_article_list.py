@@ -0,0 +1,143 @@
+"""Compare the article list payload with and without the slim list projection.
+
+Seeds a scratch database with articles of realistic size and, for one page of
+``--size`` articles, measures read + validation + JSON encoding latency and the
+response size of:
+
+- ``full``: every field, serialized as ``ArticleDB`` (the list response before)
+- ``slim``: ``ARTICLE_LIST_PROJECTION`` serialized as ``ArticleListItem``
+
+It then times the first page of ``q`` searches (type-ahead prefix, words plus
+a prefix, complete words) through ``build_article_filter`` and
+``fetch_articles_page`` as GET /articles runs them, with the app's own
+indexes, and reports p50/p99 against ``--target-ms``.
+
+Needs a reachable mongod (``MONGODB_URI``); the scratch database is dropped afterwards.
+
+    python -m app.tests.scripts.bench_article_list --articles 5000 --size 50
+    python -m app.tests.scripts.bench_article_list --articles 1000000 --size 20 --rounds 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+
+from ...core.config import settings
+from ...core.database import INDEXES, MongoDB
+from ...core.search import search_fields
+from ...crud import ARTICLE_LIST_PROJECTION, build_article_filter, fetch_articles_page
+from ...models import ArticleDB, ArticleListItem
+
+SCRATCH_DB = f"{settings.MONGODB_DB_NAME}_bench_article_list"
+
+# Title words, so search terms have a realistic spread of selectivity.
+TOPICS = ["Hà Nội", "mưa lớn", "giá vàng", "bóng đá", "Sài Gòn", "giao thông", "học sinh", "bão số 3",
+          "chứng khoán", "xuất khẩu", "y tế", "du lịch", "Đà Nẵng", "nắng nóng", "lãi suất", "nhà ở"]
+SEARCHES = {
+    "prefix": ["h", "ha", "gia", "bao", "chung"],
+    "words_and_prefix": ["ha no", "gia va", "chung kh"],
+    "words": ["ha noi", "gia vang", "bong da"],
+}
+
+
+def make_documents(count: int, start: int = 0) -> list[dict]:
+    started = datetime(2025, 1, 1)
+    paragraph = "Nội dung chi tiết của bài báo với nhiều câu văn dài để mô phỏng một bài viết thật. " * 6
+    documents = [
+        {
+            "title": f"{TOPICS[index % len(TOPICS)]}: {TOPICS[index * 7 % len(TOPICS)]} bài số {index}",
+            "link_url": f"https://vnexpress.net/bench-{index}.html",
+            "location": "Hà Nội",
+            "datetime": "18/10/2024, 08:00 (GMT+7)",
+            "description": "Mô tả ngắn gọn cho thẻ tin tức trên trang chủ.",
+            "image_url": f"https://i1-vnexpress.vnecdn.net/bench-{index}.jpg",
+            "category": "Thời sự",
+            "content": paragraph * 12,
+            "summary": "Tóm tắt ba câu của bài viết. " * 3,
+            "summary_status": "done",
+            "created_at": started + timedelta(minutes=index),
+            "updated_at": started + timedelta(minutes=index),
+        }
+        for index in range(start, start + count)
+    ]
+    for document in documents:
+        document.update(search_fields(document))
+    return documents
+
+
+async def measure(collection, model, projection, size: int, rounds: int) -> tuple[list[float], int]:
+    adapter = TypeAdapter(list[model])
+    latencies, payload = [], b""
+    for round_index in range(rounds):
+        started = time.perf_counter()
+        docs = await fetch_articles_page(collection, {}, skip=round_index * size, limit=size, projection=projection)
+        payload = adapter.dump_json([model(**doc) for doc in docs], by_alias=True)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, len(payload)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def measure_search(collection, size: int, rounds: int) -> dict[str, list[float]]:
+    latencies: dict[str, list[float]] = {}
+    for kind, queries in SEARCHES.items():
+        for round_index in range(rounds):
+            q = queries[round_index % len(queries)]
+            started = time.perf_counter()
+            await fetch_articles_page(
+                collection, build_article_filter(q=q), skip=0, limit=size, projection=ARTICLE_LIST_PROJECTION
+            )
+            latencies.setdefault(kind, []).append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def run(count: int, size: int, rounds: int, target_ms: float):
+    client = MongoDB.get_client()
+    await client.drop_database(SCRATCH_DB)
+    collection = client[SCRATCH_DB]["articles"]
+    try:
+        for start in range(0, count, 10000):
+            await collection.insert_many(make_documents(min(10000, count - start), start))
+        await collection.create_indexes(INDEXES["articles"])
+
+        for name, model, projection in (
+                ("full", ArticleDB, None),
+                ("slim", ArticleListItem, ARTICLE_LIST_PROJECTION),
+        ):
+            latencies, payload = await measure(collection, model, projection, size, rounds)
+            print(
+                f"{name}: {payload / 1024:8.1f} KiB/page  "
+                f"p50 {statistics.median(latencies):6.2f} ms  max {max(latencies):6.2f} ms"
+            )
+
+        for kind, latencies in (await measure_search(collection, size, rounds)).items():
+            p99 = _percentile(latencies, 0.99)
+            print(
+                f"search {kind}: p50 {statistics.median(latencies):6.2f} ms  p99 {p99:6.2f} ms  "
+                f"{'ok' if p99 <= target_ms else 'OVER'} (target {target_ms:g} ms)"
+            )
+    finally:
+        await client.drop_database(SCRATCH_DB)
+        MongoDB.close_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--target-ms", type=float, default=20.0, help="p99 latency target of a search page")
+    args = parser.parse_args()
+    asyncio.run(run(args.articles, args.size, min(args.rounds, args.articles // args.size), args.target_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compare article write throughput: per-article upserts vs one ``bulk_write`` per batch.
+
+Needs a reachable mongod (``MONGODB_URI``). Everything is written to a scratch
+database that is dropped afterwards.
+
+- ``legacy``: the old ``create_articles`` (update_one, find_one, find_one)
+- ``single``: the current ``create_articles`` (one find_one_and_update)
+- ``bulk``: ``bulk_upsert_articles`` per batch, first run (inserts) and a
+  rerun of the same batch (all unchanged)
+
+    python -m app.tests.scripts.bench_bulk_write --articles 2000 --batch-size 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from ...core.config import settings
+from ...core.database import MongoDB
+from ...crud import bulk_upsert_articles, create_articles
+from ...models import ArticleBase, ArticleDB
+
+SCRATCH_DB = f"{settings.MONGODB_DB_NAME}_bench_bulk_write"
+
+
+def make_articles(count: int, revision: int = 0) -> list[ArticleBase]:
+    return [
+        ArticleBase(
+            title=f"Bài viết số {index}",
+            link_url=f"https://vnexpress.net/bench-{index}.html",
+            description="Mô tả ngắn " * 5,
+            category="Thời sự",
+            content=f"Nội dung bản {revision}. " + "Câu văn mẫu để đo tốc độ ghi. " * 60,
+        )
+        for index in range(count)
+    ]
+
+
+async def legacy_create_article(collection, article: ArticleBase):
+    article_dict = article.model_dump()
+    now = datetime.now()
+    result = await collection.update_one(
+        {"link_url": article_dict["link_url"]},
+        {"$set": {**article_dict, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+        upsert=True,
+    )
+    if result.upserted_id:
+        article_id = result.upserted_id
+    else:
+        article_id = (await collection.find_one({"link_url": article_dict["link_url"]}))["_id"]
+    return ArticleDB(**await collection.find_one({"_id": article_id}))
+
+
+async def timed(label: str, count: int, coroutine):
+    started = time.perf_counter()
+    await coroutine
+    elapsed = time.perf_counter() - started
+    print(f"{label:>26}: {count / elapsed:10.1f} articles/s ({elapsed:.2f}s)")
+
+
+async def run(count: int, batch_size: int):
+    client = MongoDB.get_client()
+    await client.drop_database(SCRATCH_DB)
+    db = client[SCRATCH_DB]
+    await db.articles.create_index("link_url", unique=True)
+
+    async def sequential(writer, articles):
+        for article in articles:
+            await writer(db.articles, article)
+
+    async def bulk(articles, return_documents):
+        for offset in range(0, len(articles), batch_size):
+            await bulk_upsert_articles(db.articles, articles[offset:offset + batch_size],
+                                       return_documents=return_documents)
+
+    try:
+        await timed("legacy insert", count, sequential(legacy_create_article, make_articles(count, 0)))
+        await timed("legacy update", count, sequential(legacy_create_article, make_articles(count, 1)))
+        await timed("single update", count, sequential(create_articles, make_articles(count, 2)))
+
+        await db.articles.delete_many({})
+        await timed(f"bulk x{batch_size} insert", count, bulk(make_articles(count, 0), False))
+        await timed(f"bulk x{batch_size} update", count, bulk(make_articles(count, 1), False))
+        await timed(f"bulk x{batch_size} unchanged", count, bulk(make_articles(count, 1), False))
+        await timed(f"bulk x{batch_size} update+docs", count, bulk(make_articles(count, 2), True))
+    finally:
+        await client.drop_database(SCRATCH_DB)
+        MongoDB.close_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.articles, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
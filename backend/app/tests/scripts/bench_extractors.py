@@ -0,0 +1,91 @@
+"""Check extraction engines against the html5lib reference and measure parse throughput.
+
+Every page of the corpus is run through ``parse_listing`` and ``parse_article`` of
+each engine; any difference from the html5lib output is printed and makes the
+script exit non-zero. Throughput is measured inline and through ``ParserPool``.
+
+    python -m app.tests.scripts.bench_extractors
+    python -m app.tests.scripts.bench_extractors --corpus /path/to/saved/pages --workers 4
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from .fixture_server import FIXTURES_DIR
+from ...core import extractors
+from ...core.extractors import EXTRACTORS, ParserPool
+
+REFERENCE = "html5lib"
+
+
+def load_corpus(corpus: Path) -> dict[str, str]:
+    return {page.name: page.read_text(encoding="utf-8") for page in sorted(corpus.glob("**/*.html"))}
+
+
+def check_equivalence(pages: dict[str, str]) -> int:
+    mismatches = 0
+    for engine in EXTRACTORS:
+        if engine == REFERENCE:
+            continue
+        for name, html in pages.items():
+            for func in (extractors.parse_listing, extractors.parse_article):
+                expected = func(html, REFERENCE)
+                actual = func(html, engine)
+                if actual != expected:
+                    mismatches += 1
+                    print(f"MISMATCH {engine} {func.__name__} {name}\n  expected={expected!r}\n  actual={actual!r}")
+    return mismatches
+
+
+def bench_inline(pages: dict[str, str], engine: str, repeat: int) -> float:
+    documents = list(pages.values())
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for html in documents:
+            extractors.parse_listing(html, engine)
+            extractors.parse_article(html, engine)
+    return len(documents) * repeat / (time.perf_counter() - started)
+
+
+async def bench_pool(pages: dict[str, str], engine: str, repeat: int, workers: int) -> float:
+    ParserPool.configure(workers)
+    documents = list(pages.values()) * repeat
+    # Warm the pool so process start-up is not part of the measurement.
+    await asyncio.gather(*(ParserPool.run(extractors.parse_article, "", engine) for _ in range(workers)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(ParserPool.run(extractors.parse_article, html, engine) for html in documents))
+    elapsed = time.perf_counter() - started
+    ParserPool.shutdown()
+    return len(documents) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=FIXTURES_DIR / "vnexpress")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        sys.exit(f"No .html pages found in {args.corpus}")
+
+    mismatches = check_equivalence(pages)
+    print(f"corpus={len(pages)} pages, mismatches vs {REFERENCE}: {mismatches}")
+
+    for engine in EXTRACTORS:
+        rate = bench_inline(pages, engine, args.repeat)
+        print(f"{engine:>9} inline: {rate:8.1f} pages/s (listing + article parse)")
+
+    for engine in EXTRACTORS:
+        rate = asyncio.run(bench_pool(pages, engine, args.repeat, args.workers))
+        print(f"{engine:>9} pool({args.workers}): {rate:8.1f} article pages/s")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
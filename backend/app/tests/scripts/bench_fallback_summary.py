@@ -0,0 +1,114 @@
+"""Measure the extractive fallback summarizer and compare it with stored Gemini summaries.
+
+Throughput is measured on the fixture articles (repeated to fill the batch) for
+the old ``split('.')`` fallback and for ``extractive`` at several batch sizes.
+With ``--from-db`` the quality check reads articles whose Gemini summary is
+stored (``summary_status`` done) and reports ROUGE-1/ROUGE-2 F1 over syllables
+for both fallbacks, using the Gemini summary as the reference.
+
+    python -m app.tests.scripts.bench_fallback_summary
+    python -m app.tests.scripts.bench_fallback_summary --from-db --limit 500
+"""
+import argparse
+import asyncio
+import re
+import time
+from collections import Counter
+
+from .fixture_server import FIXTURES_DIR
+from ...core import extractive, extractors
+
+_SYLLABLE = re.compile(r"\w+", re.UNICODE)
+
+
+def naive_summary(content: str) -> str:
+    # The fallback this module replaced.
+    sentences = content.split('.')
+    return '. '.join(sentences[:min(3, len(sentences))]).strip() + '.'
+
+
+def load_fixture_articles() -> list[str]:
+    articles = []
+    for page in sorted((FIXTURES_DIR / "vnexpress").glob("*.html")):
+        parsed = extractors.parse_article(page.read_text(encoding="utf-8"), "lxml")
+        if parsed and parsed["content"]:
+            articles.append(parsed["content"])
+    return articles
+
+
+def rouge_f1(candidate: str, reference: str, n: int) -> float:
+    def grams(text):
+        syllables = _SYLLABLE.findall(text.lower())
+        return Counter(tuple(syllables[i:i + n]) for i in range(len(syllables) - n + 1))
+
+    candidate_grams, reference_grams = grams(candidate), grams(reference)
+    overlap = sum((candidate_grams & reference_grams).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate_grams.values())
+    recall = overlap / sum(reference_grams.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def bench_throughput(articles: list[str], total: int, batch_sizes: list[int]):
+    corpus = (articles * (total // len(articles) + 1))[:total]
+
+    started = time.perf_counter()
+    for content in corpus:
+        naive_summary(content)
+    print(f"{'naive split':>18}: {total / (time.perf_counter() - started):10.1f} articles/s")
+
+    for batch_size in batch_sizes:
+        summarizer = extractive.ExtractiveSummarizer()
+        started = time.perf_counter()
+        for offset in range(0, total, batch_size):
+            summarizer.summarize_batch(corpus[offset:offset + batch_size])
+        rate = total / (time.perf_counter() - started)
+        print(f"{f'extractive x{batch_size}':>18}: {rate:10.1f} articles/s")
+
+
+async def load_reference_summaries(limit: int) -> list[tuple[str, str]]:
+    from ...core.config import settings
+    from ...core.database import MongoDB
+
+    collection = MongoDB.get_client()[settings.MONGODB_DB_NAME]["articles"]
+    cursor = collection.find(
+        {"summary_status": "done", "summary": {"$ne": None}, "content": {"$ne": None}},
+        {"content": 1, "summary": 1}
+    ).limit(limit)
+    return [(doc["content"], doc["summary"]) async for doc in cursor]
+
+
+def check_quality(pairs: list[tuple[str, str]]):
+    contents = [content for content, _ in pairs]
+    candidates = {
+        "naive split": [naive_summary(content) for content in contents],
+        "extractive": extractive.summarize_texts(contents),
+    }
+    print(f"quality vs {len(pairs)} stored Gemini summaries (syllable ROUGE F1)")
+    for name, summaries in candidates.items():
+        rouge1 = sum(rouge_f1(s, ref, 1) for s, (_, ref) in zip(summaries, pairs)) / len(pairs)
+        rouge2 = sum(rouge_f1(s, ref, 2) for s, (_, ref) in zip(summaries, pairs)) / len(pairs)
+        print(f"{name:>18}: ROUGE-1 {rouge1:.3f}  ROUGE-2 {rouge2:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--total", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--from-db", action="store_true", help="Check quality against stored Gemini summaries")
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    bench_throughput(load_fixture_articles(), args.total, args.batch_sizes)
+
+    if args.from_db:
+        pairs = asyncio.run(load_reference_summaries(args.limit))
+        if not pairs:
+            print("No articles with a stored Gemini summary found")
+            return
+        check_quality(pairs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Show that the event loop keeps serving GET /articles while a scrape is running.
+
+Runs the listing + detail fetches of a scrape against the local fixture server
+(with artificial latency) and, concurrently, probes ``GET /articles`` through the
+ASGI app and a 10 ms heartbeat task. ``--mode blocking`` reproduces the old
+``requests.Session`` behaviour for comparison.
+
+    python -m app.tests.scripts.bench_http_client --latency 0.3
+    python -m app.tests.scripts.bench_http_client --mode blocking --skip-api
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from .fixture_server import FixtureServer
+from ...core.config import settings
+from ...core.http_client import HttpClient
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _fetch_blocking(urls: list[str]):
+    import requests
+
+    session = requests.Session()
+    for url in urls:
+        session.get(url, timeout=settings.REQUEST_TIMEOUT)
+
+
+async def _fetch_async(urls: list[str]):
+    async def fetch(url):
+        response = await HttpClient.get(url)
+        response.raise_for_status()
+
+    await asyncio.gather(*(fetch(url) for url in urls))
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list[float], interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def _probe_api(stop: asyncio.Event, latencies: list[float]):
+    from ...main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            await client.get(f"{settings.API_V1_STR}/articles/", params={"size": 10})
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.02)
+
+
+async def run(mode: str, rounds: int, skip_api: bool, server: FixtureServer):
+    listing_url = server.url("/tin-tuc-24h")
+    detail_urls = [server.url(page.name) for page in sorted(server.fixtures_dir.glob("*-*.html"))]
+    urls = [listing_url] + detail_urls * rounds
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    api_latencies: list[float] = []
+    background = [asyncio.create_task(_heartbeat(stop, lags))]
+    if not skip_api:
+        background.append(asyncio.create_task(_probe_api(stop, api_latencies)))
+
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    if mode == "blocking":
+        await _fetch_blocking(urls)
+    else:
+        await _fetch_async(urls)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await asyncio.gather(*background)
+    await HttpClient.close_client()
+
+    print(f"mode={mode} pages={len(urls)} latency={server.latency:.3f}s scrape_time={elapsed:.2f}s")
+    print(f"  loop lag   max={max(lags) * 1000:.1f}ms p99={_percentile(lags, 0.99) * 1000:.1f}ms "
+          f"heartbeats={len(lags)}")
+    if not skip_api:
+        print(f"  GET /articles requests={len(api_latencies)} "
+              f"p50={statistics.median(api_latencies) * 1000 if api_latencies else 0:.1f}ms "
+              f"p99={_percentile(api_latencies, 0.99) * 1000:.1f}ms "
+              f"max={max(api_latencies, default=0) * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["async", "blocking"], default="async")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fixture server latency per request (seconds)")
+    parser.add_argument("--rounds", type=int, default=3, help="How many times each detail page is fetched")
+    parser.add_argument("--skip-api", action="store_true", help="Only measure event loop lag (no MongoDB needed)")
+    args = parser.parse_args()
+
+    with FixtureServer(latency=args.latency) as server:
+        asyncio.run(run(args.mode, args.rounds, args.skip_api, server))
+
+
+if __name__ == "__main__":
+    main()
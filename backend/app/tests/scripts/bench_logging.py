@@ -0,0 +1,147 @@
+"""Measure what a log call costs the caller: direct handlers vs the queue.
+
+``direct`` attaches the console and file handlers to the logger as
+``app/utils.py`` used to, so every call writes on the calling thread; ``queue``
+and ``json`` go through ``ContextQueueHandler`` and a listener thread. Each
+mode logs the mix of one scrape request (INFO lines plus an occasional error
+with a traceback, repeated errors included) from inside an event loop, while
+a 1 ms heartbeat task records how late the loop wakes up.
+
+    python -m app.tests.scripts.bench_logging --requests 5000
+    python -m app.tests.scripts.bench_logging --modes direct queue --fsync
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from ...utils import create_handlers, log_context, start_queue_logging
+
+
+class _FsyncHandler(logging.Handler):
+    """Wraps a file handler and fsyncs after each record (a slow disk)."""
+
+    def __init__(self, handler: logging.StreamHandler):
+        super().__init__(handler.level)
+        self.handler = handler
+
+    def emit(self, record):
+        self.handler.emit(record)
+        os.fsync(self.handler.stream.fileno())
+
+    def close(self):
+        self.handler.close()
+        super().close()
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _build(mode: str, log_dir: Path, console, fsync: bool):
+    handlers = create_handlers(log_dir, json_format=mode == "json", max_bytes=5 * 1024 * 1024,
+                               backup_count=2, stream=console)
+    if fsync:
+        handlers = [handlers[0]] + [_FsyncHandler(handler) for handler in handlers[1:]]
+
+    bench_logger = logging.getLogger(f"bench.{mode}")
+    bench_logger.handlers.clear()
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+    if mode == "direct":
+        for handler in handlers:
+            bench_logger.addHandler(handler)
+        return bench_logger, None, handlers
+
+    queue_handler, listener = start_queue_logging(handlers, queue_size=0, repeat_window=60)
+    bench_logger.addHandler(queue_handler)
+    return bench_logger, listener, handlers
+
+
+def _one_request(bench_logger: logging.Logger, i: int):
+    url = f"https://vnexpress.net/article-{i}.html"
+    with log_context(job_id="bench", article=url):
+        bench_logger.info(f"Fetching article {url}")
+        bench_logger.info(f"Parsed article {url}: 1234 chars")
+        if i % 20 == 0:
+            try:
+                raise ValueError(f"unexpected markup in {url}")
+            except ValueError as e:
+                bench_logger.error(f"Error parsing article {url}: {str(e)}", exc_info=True)
+        if i % 5 == 0:
+            # The same line over and over, e.g. a rate-limited API.
+            bench_logger.warning("Gemini rate limit reached, falling back to extractive summary")
+        bench_logger.info(f"Stored article {url}")
+
+
+async def _run(bench_logger: logging.Logger, requests: int) -> dict:
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    beat = asyncio.create_task(heartbeat())
+    per_request: list[float] = []
+    start = time.perf_counter()
+    for i in range(requests):
+        t0 = time.perf_counter()
+        _one_request(bench_logger, i)
+        per_request.append(time.perf_counter() - t0)
+        if i % 50 == 0:
+            # Let the heartbeat run, as the scrape loop would between awaits.
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+
+    return {
+        "elapsed": elapsed,
+        "p50_us": _percentile(per_request, 0.5) * 1e6,
+        "p99_us": _percentile(per_request, 0.99) * 1e6,
+        "max_us": max(per_request) * 1e6,
+        "mean_us": statistics.mean(per_request) * 1e6,
+        "lag_p99_ms": _percentile(lags, 0.99) * 1e3
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--modes", nargs="+", default=["direct", "queue", "json"],
+                        choices=["direct", "queue", "json"])
+    parser.add_argument("--fsync", action="store_true", help="fsync the log files after every record")
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'req/s':>9} {'mean µs':>9} {'p50 µs':>8} {'p99 µs':>8} {'max µs':>9} "
+          f"{'drain s':>8} {'loop lag p99 ms':>16}")
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w", encoding="utf-8") as console:
+            bench_logger, listener, handlers = _build(mode, Path(tmp), console, args.fsync)
+            result = asyncio.run(_run(bench_logger, args.requests))
+
+            # Time for the listener to write out what the callers queued.
+            start = time.perf_counter()
+            if listener is not None:
+                listener.stop()
+            drain = time.perf_counter() - start
+            for handler in handlers:
+                handler.close()
+
+            print(f"{mode:<8} {args.requests / result['elapsed']:>9.0f} {result['mean_us']:>9.1f} "
+                  f"{result['p50_us']:>8.1f} {result['p99_us']:>8.1f} {result['max_us']:>9.0f} "
+                  f"{drain:>8.2f} {result['lag_p99_ms']:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""End-to-end scrape and read benchmark against local stand-ins for every external service.
+
+Starts the fixture server (recorded vnexpress pages, repeated ``--copies`` times,
+with ``--page-latency``) and the fake Gemini server (``--gemini-latency``,
+``--gemini-429`` share of rate-limited replies, ``--gemini-quota``), points the
+app at both and at an empty scratch database, then:
+
+1. runs ``ArticleScheduler.scrape_and_store_job`` once; in queue mode it also
+   waits for the summary workers to drain the queue
+2. sends ``--requests`` requests to each read endpoint through the ASGI app
+
+It prints articles/min, p50/p99 per stage (from the ``core.metrics``
+histograms, split by label) and per endpoint, and the peak RSS of this process.
+Parser worker processes are not included in the RSS; use ``--parser-workers 0``
+to parse in-process.
+
+``--sources N`` starts N fixture servers, each on its own port and so its own
+host for the per-host connection limits, and scrapes them as N sources in one
+run; compare articles/min with ``--sources 1`` to see the fan-out scale.
+
+Copies share their recorded content, so most of their summaries come from the
+summary cache; add ``--set SUMMARY_CACHE_ENABLED=false`` to send every one to Gemini.
+
+``--mongo memory`` uses mongomock-motor instead of ``MONGODB_URI``. Multi-word
+``$text`` searches are not supported there, so the search endpoint is only
+exercised with a prefix query.
+
+    python -m app.tests.scripts.bench_scrape
+    python -m app.tests.scripts.bench_scrape --copies 10 --gemini-latency 0.8 --gemini-429 0.1
+    python -m app.tests.scripts.bench_scrape --sources 4 --set HTTP_MAX_CONNECTIONS_PER_HOST=2
+    python -m app.tests.scripts.bench_scrape --mongo memory --summary-mode inline --json
+    python -m app.tests.scripts.bench_scrape --set SUMMARY_BATCH_ENABLED=false
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from .fake_gemini import FakeGemini
+from .fixture_server import FixtureServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _summarize(samples: dict[str, list[float]]) -> dict[str, dict]:
+    return {
+        name: {
+            "count": len(values),
+            "p50_ms": round(statistics.median(values) * 1000, 2),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 2)
+        }
+        for name, values in sorted(samples.items())
+    }
+
+
+class StageRecorder:
+    """Keeps every observation of the given histograms, for exact percentiles."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def attach(self, name: str, histogram):
+        observe = histogram.observe
+
+        def recording_observe(value: float, **labels: str):
+            key = f"{name}[{','.join(labels.values())}]" if labels else name
+            self.samples[key].append(value)
+            observe(value, **labels)
+
+        histogram.observe = recording_observe
+
+
+def _write_sources_file(fixture_servers: list[FixtureServer]) -> str:
+    sources = [
+        {"name": f"fixtures-{index}", "listing_urls": [fixtures.url("/tin-tuc-24h")]}
+        for index, fixtures in enumerate(fixture_servers, 1)
+    ]
+    with tempfile.NamedTemporaryFile("w", suffix=".json", prefix="bench_sources_", delete=False) as sources_file:
+        json.dump(sources, sources_file)
+    return sources_file.name
+
+
+def _configure_environment(args, fixtures: FixtureServer, gemini: FakeGemini, sources_file: str | None = None):
+    """Settings are read when ``app.core.config`` is first imported, so this runs before any app import."""
+    os.environ.setdefault("GEMINI_API_KEY", "bench")
+    os.environ.setdefault("PROJECT_NAME", "bench")
+    if args.mongo == "memory":
+        os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+    os.environ["MONGODB_DB_NAME"] = f"{os.environ.get('MONGODB_DB_NAME', 'article_db')}_bench_scrape"
+    os.environ["BASE_URL"] = fixtures.url("/tin-tuc-24h")
+    if sources_file:
+        os.environ["SOURCES_FILE"] = sources_file
+        os.environ["SOURCE_CONCURRENCY"] = str(args.sources)
+    os.environ["GEMINI_API_ENDPOINT"] = gemini.base_url
+    os.environ["GEMINI_REQUESTS_PER_MINUTE"] = str(args.gemini_rpm)
+    os.environ["GEMINI_REQUESTS_PER_DAY"] = "0"
+    os.environ["SUMMARY_MODE"] = args.summary_mode
+    os.environ["PARSER_PROCESS_WORKERS"] = str(args.parser_workers)
+    for assignment in args.set:
+        name, _, value = assignment.partition("=")
+        os.environ[name] = value
+
+
+def _use_mongomock():
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("--mongo memory needs the mongomock-motor package")
+    import inspect
+    import mongomock.collection
+
+    from ...core.database import MongoDB
+
+    # pymongo >= 4.9 passes ``sort`` to bulk updates, which older mongomock rejects.
+    builder = mongomock.collection.BulkOperationBuilder
+    if "sort" not in inspect.signature(builder.add_update).parameters:
+        add_update = builder.add_update
+        builder.add_update = lambda self, *a, sort=None, **kw: add_update(self, *a, **kw)
+    MongoDB._client = AsyncMongoMockClient()
+
+
+async def _drain_summary_queue(timeout: float) -> float:
+    from ...core.summary_queue import summary_queue
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if (await summary_queue.get_stats())["depth"] == 0:
+            break
+        await asyncio.sleep(0.2)
+    return time.perf_counter() - started
+
+
+async def _bench_reads(db, requests: int) -> dict[str, list[float]]:
+    import httpx
+
+    from ...core.config import settings
+    from ...main import app
+
+    sample = await db["articles"].find_one({}, {"category": 1})
+    if sample is None:
+        return {}
+
+    api = settings.API_V1_STR
+    endpoints = {
+        "list": (f"{api}/articles/", {"page": 1, "size": 20}),
+        "list_category": (f"{api}/articles/", {"page": 1, "size": 20, "category": sample.get("category") or ""}),
+        "feed": (f"{api}/articles/feed", {"limit": 20}),
+        "search_prefix": (f"{api}/articles/", {"q": "ha", "size": 20}),
+        "categories": (f"{api}/articles/categories", {"with_counts": True}),
+        "article": (f"{api}/articles/{sample['_id']}", {}),
+    }
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, (path, params) in endpoints.items():
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = await client.get(path, params=params)
+                latencies[name].append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+    return latencies
+
+
+async def run(args, gemini: FakeGemini) -> dict:
+    from ...core import metrics
+    from ...core.config import settings
+    from ...core.database import MongoDB
+    from ...core.extractors import ParserPool
+    from ...core.http_client import HttpClient
+    from ...core.scheduler import article_scheduler
+    from ...core.summary_queue import summary_workers
+
+    if args.mongo == "memory":
+        _use_mongomock()
+
+    recorder = StageRecorder()
+    recorder.attach("fetch", metrics.fetch_duration)
+    recorder.attach("parse", metrics.parse_duration)
+    recorder.attach("gemini", metrics.gemini_request_duration)
+    recorder.attach("summary", metrics.summary_duration)
+    recorder.attach("store", metrics.store_duration)
+
+    client = MongoDB.get_client()
+    await client.drop_database(settings.MONGODB_DB_NAME)
+    db = client[settings.MONGODB_DB_NAME]
+    report = {}
+    try:
+        await MongoDB.setup_indexes()
+        ParserPool.configure(settings.PARSER_PROCESS_WORKERS)
+        if settings.SUMMARY_MODE == "queue":
+            summary_workers.start(settings.SUMMARY_WORKERS)
+
+        started = time.perf_counter()
+        scrape_run = await article_scheduler.scrape_and_store_job(trigger="manual")
+        scrape_seconds = time.perf_counter() - started
+        stored = scrape_run.get("stored", 0)
+
+        drain_seconds = None
+        if settings.SUMMARY_MODE == "queue":
+            drain_seconds = await _drain_summary_queue(args.drain_timeout)
+            await summary_workers.stop()
+
+        report["scrape"] = {
+            "status": scrape_run["status"],
+            "sources": scrape_run.get("sources", {}),
+            "articles": stored,
+            "seconds": round(scrape_seconds, 3),
+            "articles_per_min": round(stored / scrape_seconds * 60, 1) if scrape_seconds else 0.0,
+            "summary_mode": args.summary_mode,
+            "summary_drain_seconds": round(drain_seconds, 3) if drain_seconds is not None else None,
+            "summaries": {
+                source: int(metrics.summaries.value(source=source))
+                for source in ("gemini", "cache", "fallback")
+            },
+            "gemini": {
+                "requests": gemini.request_count,
+                "rate_limited": gemini.rate_limited_count,
+                "tokens": int(metrics.gemini_tokens.value(type="prompt") + metrics.gemini_tokens.value(type="completion"))
+            },
+            "peak_rss_mb": _peak_rss_mb()
+        }
+        report["stages"] = _summarize(recorder.samples)
+
+        report["reads"] = _summarize(await _bench_reads(db, args.requests))
+        report["peak_rss_mb"] = _peak_rss_mb()
+    finally:
+        await summary_workers.stop()
+        await HttpClient.close_client()
+        ParserPool.shutdown()
+        if args.mongo != "memory" and not args.keep_db:
+            await client.drop_database(settings.MONGODB_DB_NAME)
+        MongoDB.close_client()
+    return report
+
+
+def _print_report(report: dict):
+    scrape = report["scrape"]
+    print(
+        f"scrape: {scrape['articles']} articles in {scrape['seconds']:.2f}s -> "
+        f"{scrape['articles_per_min']:.1f} articles/min (status {scrape['status']}, "
+        f"summaries {scrape['summary_mode']})"
+    )
+    if len(scrape["sources"]) > 1:
+        print(f"  per source {scrape['sources']}")
+    if scrape["summary_drain_seconds"] is not None:
+        print(f"  summary queue drained in {scrape['summary_drain_seconds']:.2f}s")
+    print(f"  summaries {scrape['summaries']}  gemini {scrape['gemini']}")
+
+    for title, rows in (("stage", report["stages"]), ("endpoint", report["reads"])):
+        print(f"\n{title:<32} {'n':>6} {'p50 ms':>10} {'p99 ms':>10}")
+        for name, row in rows.items():
+            print(f"{name:<32} {row['count']:>6} {row['p50_ms']:>10.2f} {row['p99_ms']:>10.2f}")
+
+    if report["peak_rss_mb"] is not None:
+        print(f"\npeak RSS: {scrape['peak_rss_mb']:.1f} MB after scrape, {report['peak_rss_mb']:.1f} MB after reads")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=5, help="Times each recorded article is listed")
+    parser.add_argument("--sources", type=int, default=1, help="Fixture sites scraped together")
+    parser.add_argument("--page-latency", type=float, default=0.05, help="Fixture server latency (seconds)")
+    parser.add_argument("--gemini-latency", type=float, default=0.3, help="Fake Gemini latency (seconds)")
+    parser.add_argument("--gemini-429", type=float, default=0.0, help="Share of Gemini calls answered with 429")
+    parser.add_argument("--gemini-quota", type=int, default=None, help="Successful Gemini calls before every call is 429")
+    parser.add_argument("--gemini-rpm", type=int, default=600, help="GEMINI_REQUESTS_PER_MINUTE for the run")
+    parser.add_argument("--summary-mode", choices=["queue", "inline"], default="queue")
+    parser.add_argument("--parser-workers", type=int, default=2)
+    parser.add_argument("--mongo", choices=["uri", "memory"], default="uri",
+                        help="MONGODB_URI (scratch database, dropped afterwards) or in-memory mongomock")
+    parser.add_argument("--keep-db", action="store_true", help="Do not drop the scratch database")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per read endpoint")
+    parser.add_argument("--drain-timeout", type=float, default=300.0)
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Override any setting for the run, e.g. SUMMARY_BATCH_ENABLED=false")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's log output")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        fixture_servers = [
+            stack.enter_context(FixtureServer(latency=args.page_latency, copies=args.copies))
+            for _ in range(max(1, args.sources))
+        ]
+        gemini = stack.enter_context(FakeGemini(
+            latency=args.gemini_latency, rate_limit_ratio=args.gemini_429, quota=args.gemini_quota
+        ))
+        sources_file = _write_sources_file(fixture_servers) if args.sources > 1 else None
+        if sources_file:
+            stack.callback(os.unlink, sources_file)
+        _configure_environment(args, fixture_servers[0], gemini, sources_file)
+        if not args.verbose:
+            logging.disable(logging.WARNING)
+        # The app prints connection notices; keep stdout for the report.
+        with contextlib.redirect_stdout(sys.stderr):
+            report = asyncio.run(run(args, gemini))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Local stand-in for the Gemini REST API (``models/*:generateContent``).
+
+Point the app at it with ``GEMINI_API_ENDPOINT=server.base_url``; the SDK then
+talks REST to localhost instead of Google. Each reply waits ``latency`` seconds,
+a ``rate_limit_ratio`` share of calls (and every call after ``quota`` successful
+ones) answers 429 RESOURCE_EXHAUSTED, like the real free tier. With
+``fail_batches`` every batch prompt gets a reply that is not a JSON array.
+
+Batch prompts (``responseMimeType: application/json``) get one summary per
+``### id=N`` section, so ``ArticleSummarizer.generate_summaries`` works unchanged.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+BATCH_ID = re.compile(r"### id=(\w+)")
+CHARS_PER_TOKEN = 3
+
+
+class FakeGemini:
+    def __init__(
+            self,
+            latency: float = 0.0,
+            rate_limit_ratio: float = 0.0,
+            quota: Optional[int] = None,
+            seed: int = 0,
+            fail_batches: bool = False,
+            host: str = "127.0.0.1",
+            port: int = 0
+    ):
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.quota = quota
+        self.fail_batches = fail_batches
+        self.request_count = 0
+        self.success_count = 0
+        self.rate_limited_count = 0
+        self.batch_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _admit(self) -> bool:
+        with self._lock:
+            self.request_count += 1
+            exhausted = self.quota is not None and self.success_count >= self.quota
+            if exhausted or self._random.random() < self.rate_limit_ratio:
+                self.rate_limited_count += 1
+                return False
+            self.success_count += 1
+            return True
+
+    def _reply(self, request: dict) -> dict:
+        prompt = " ".join(
+            part.get("text", "")
+            for content in request.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        config = request.get("generationConfig") or request.get("generation_config") or {}
+        mime_type = config.get("responseMimeType") or config.get("response_mime_type")
+
+        if mime_type == "application/json":
+            with self._lock:
+                self.batch_count += 1
+            if self.fail_batches:
+                text = json.dumps({"error": "batch not understood"})
+            else:
+                text = json.dumps([
+                    {"id": batch_id, "summary": f"Tóm tắt giả lập cho bài {batch_id}."}
+                    for batch_id in BATCH_ID.findall(prompt)
+                ], ensure_ascii=False)
+        else:
+            text = "Tóm tắt giả lập: " + " ".join(prompt.split()[:40])
+
+        prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+        completion_tokens = len(text) // CHARS_PER_TOKEN
+        return {
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": text}]},
+                "finishReason": "STOP",
+                "index": 0
+            }],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": completion_tokens,
+                "totalTokenCount": prompt_tokens + completion_tokens
+            }
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send_json(self, status: int, payload: dict):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if not self.path.split("?", 1)[0].endswith(":generateContent"):
+                    self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+                    return
+
+                if not server._admit():
+                    self._send_json(429, {"error": {
+                        "code": 429,
+                        "message": "Resource has been exhausted (e.g. check quota).",
+                        "status": "RESOURCE_EXHAUSTED"
+                    }})
+                    return
+
+                self._send_json(200, server._reply(request))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeGemini":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeGemini":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
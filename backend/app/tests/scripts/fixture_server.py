@@ -0,0 +1,137 @@
+"""Local HTTP server that replays the recorded vnexpress pages in app/tests/fixtures.
+
+Absolute links pointing at the original site are rewritten to the fixture server
+so a scraper configured with ``server.url("/tin-tuc-24h")`` never leaves localhost.
+
+With ``copies > 1`` every listing entry is repeated under distinct links
+(``thoi-su-4790000-copy3.html``) that serve the same recorded detail page, to
+give benchmarks more articles than were recorded.
+"""
+import hashlib
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "fixtures"
+
+_LISTING_ITEM = re.compile(r'<article class="[^"]*thumb-left[^"]*".*?</article>', re.DOTALL)
+_COPY_SUFFIX = re.compile(r"-copy\d+$")
+
+
+class FixtureServer:
+    def __init__(
+            self,
+            fixtures_dir: Path = FIXTURES_DIR / "vnexpress",
+            origin: str = "https://vnexpress.net",
+            latency: float = 0.0,
+            conditional: bool = True,
+            copies: int = 1,
+            host: str = "127.0.0.1",
+            port: int = 0
+    ):
+        self.fixtures_dir = Path(fixtures_dir)
+        self.origin = origin
+        self.latency = latency
+        self.conditional = conditional
+        self.copies = copies
+        # Paths answered with 503, to simulate a page that is briefly unavailable.
+        self.fail_paths: set[str] = set()
+        # Paths served with this HTML instead of the recorded page.
+        self.pages: dict[str, str] = {}
+        self.request_count = 0
+        self.not_modified_count = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str = "") -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def load_page(self, path: str) -> bytes | None:
+        name = path.split("?", 1)[0].strip("/") or "index"
+        name = _COPY_SUFFIX.sub("", name.removesuffix(".html")) + ".html"
+        page = self.fixtures_dir / name
+        if not page.is_file():
+            return None
+        html = page.read_text(encoding="utf-8")
+        if self.copies > 1:
+            html = self._replicate_listing(html)
+        return html.replace(self.origin, self.base_url).encode("utf-8")
+
+    def _replicate_listing(self, html: str) -> str:
+        items = list(_LISTING_ITEM.finditer(html))
+        if not items:
+            return html
+        link = re.compile(rf'({re.escape(self.origin)}/[^"]+?)\.html"')
+        extra = "".join(
+            link.sub(rf'\1-copy{copy}.html"', item.group(0))
+            for copy in range(1, self.copies)
+            for item in items
+        )
+        end = items[-1].end()
+        return html[:end] + extra + html[end:]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if self.path.split("?", 1)[0] in server.fail_paths:
+                    self.send_error(503)
+                    return
+
+                override = server.pages.get(self.path.split("?", 1)[0])
+                body = override.encode("utf-8") if override is not None else server.load_page(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+
+                etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+                if server.conditional and self.headers.get("If-None-Match") == etag:
+                    with server._lock:
+                        server.not_modified_count += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                if server.conditional:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
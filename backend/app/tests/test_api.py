@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.core.jobs import job_manager
+from app.core.scheduler import article_scheduler
+from app.crud import bulk_upsert_articles
+from app.models import ArticleBase
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(api, fixture_server, monkeypatch):
+    monkeypatch.setattr(settings, "BASE_URL", fixture_server.url("/tin-tuc-24h"))
+    monkeypatch.setattr(settings, "SUMMARY_MODE", "queue")
+    # The job manager is process-wide; start every test with a clean one.
+    job_manager._slots = None
+    job_manager._jobs.clear()
+    monkeypatch.setattr(article_scheduler, "_run_lock", None)
+    yield api
+    await job_manager.shutdown()
+
+
+async def stream(client) -> tuple[str, list]:
+    async with client.stream("POST", "/api/v1/articles/stream") as response:
+        assert response.status_code == 200
+        return response.headers["X-Job-Id"], [json.loads(line) async for line in response.aiter_lines() if line]
+
+
+async def test_stream_runs_as_a_job(client):
+    job_id, messages = await stream(client)
+    events = [message["event"] for message in messages]
+
+    assert events[-1] == "done"
+    assert "discovered" in events
+    stored = messages[-1]["data"]["stored"]
+    assert stored > 0
+    assert events.count("article") == stored
+
+    job = (await client.get(f"/api/v1/jobs/{job_id}")).json()
+    assert (job["trigger"], job["status"]) == ("stream", "succeeded")
+
+
+async def test_concurrent_streams_share_one_scrape(client):
+    (first_id, first), (second_id, second) = await asyncio.gather(stream(client), stream(client))
+
+    assert first_id == second_id
+    assert first[-1] == second[-1]
+    assert first[-1]["event"] == "done"
+    assert [job["id"] for job in (await client.get("/api/v1/jobs/")).json()] == [first_id]
+
+
+async def test_categories_with_and_without_counts(db, api):
+    await bulk_upsert_articles(db["articles"], [
+        ArticleBase(title=f"Bài {n}", link_url=f"https://vnexpress.net/{n}.html", category=category)
+        for n, category in enumerate(["Thể thao", "Kinh doanh", "Thể thao"])
+    ])
+
+    names = await api.get("/api/v1/articles/categories")
+    assert names.json() == ["Kinh doanh", "Thể thao"]
+
+    counted = (await api.get("/api/v1/articles/categories", params={"with_counts": True})).json()
+    assert [(row["name"], row["article_count"]) for row in counted] == [("Kinh doanh", 1), ("Thể thao", 2)]
+    assert all(row["latest_article_at"] for row in counted)
+
+
+async def test_submit_job_and_wait_for_the_scrape(client):
+    submitted = await client.post("/api/v1/jobs/")
+    assert submitted.status_code == 202
+    job = submitted.json()
+    assert submitted.headers["location"].endswith(f"/api/v1/jobs/{job['id']}")
+
+    scrape = (await client.post("/api/v1/articles/")).json()
+    # Joined the job that was already queued instead of starting another.
+    assert scrape["job_id"] == job["id"]
+    assert scrape["status"] == "completed" and scrape["articles_count"] > 0
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.crawl_planner import CrawlPlanner
+from app.core.sources import Source
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime(2025, 1, 8, 10)
+
+
+@pytest.fixture
+def planner() -> CrawlPlanner:
+    return CrawlPlanner(min_minutes=5, max_minutes=180, target_new=5, backoff=2)
+
+
+def state(interval: float, rate: float, minutes_ago: float) -> dict:
+    return {"interval_minutes": interval, "rate_per_minute": rate, "last_polled_at": NOW - timedelta(minutes=minutes_ago)}
+
+
+def test_busy_feed_is_polled_sooner(planner):
+    # 20 new in 10 minutes: 2/min, smoothed with the old 0.5/min -> 1.25/min.
+    decision = planner.next_interval(state(10, 0.5, 10), new=20, failed=False, now=NOW)
+    assert decision["rate_per_minute"] == 1.25
+    assert decision["interval_minutes"] == 5
+    assert decision["reason"] == "tighten"
+    assert decision["next_poll_at"] == NOW + timedelta(minutes=5)
+
+
+def test_quiet_feed_backs_off_up_to_the_maximum(planner):
+    decision = planner.next_interval(state(30, 0.1, 30), new=0, failed=False, now=NOW)
+    assert (decision["interval_minutes"], decision["reason"]) == (60, "backoff")
+
+    decision = planner.next_interval(state(120, 0.1, 120), new=0, failed=False, now=NOW)
+    assert decision["interval_minutes"] == 180
+
+
+def test_failed_poll_backs_off_without_touching_the_rate(planner):
+    decision = planner.next_interval(state(10, 0.5, 10), new=0, failed=True, now=NOW)
+    assert (decision["interval_minutes"], decision["reason"]) == (20, "error")
+    assert decision["rate_per_minute"] == 0.5
+
+
+def test_new_feed_starts_at_the_minimum(planner):
+    decision = planner.next_interval(None, new=1, failed=False, now=NOW)
+    # 1 new in an assumed 5 minutes: 5 more are expected in 25.
+    assert decision["interval_minutes"] == 25
+
+
+async def test_due_feeds_follow_recorded_polls(db, planner):
+    source = Source(name="news", listing_urls=["https://news.example/a", "https://news.example/b"])
+    assert await planner.due_feeds([source], now=NOW) == {"news": ["https://news.example/a", "https://news.example/b"]}
+
+    await planner.record("news", {"https://news.example/a": {"new": 0, "status": "unchanged"}}, now=NOW)
+    assert await planner.due_feeds([source], now=NOW) == {"news": ["https://news.example/b"]}
+    assert await planner.due_feeds([source], now=NOW + timedelta(minutes=10)) == {
+        "news": ["https://news.example/a", "https://news.example/b"]
+    }
+
+    plan = await planner.get_plan()
+    assert [(entry["feed"], entry["reason"]) for entry in plan] == [("https://news.example/a", "backoff")]
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.crud import (
+    bulk_upsert_articles,
+    create_articles,
+    decode_cursor,
+    ensure_category_stats,
+    fetch_articles_after,
+    fetch_category_stats,
+    fetch_known_urls,
+    rebuild_category_stats
+)
+from app.models import ArticleBase
+
+pytestmark = pytest.mark.anyio
+
+
+def article(n: int, category: str = "Thể thao", **fields) -> ArticleBase:
+    return ArticleBase(**{
+        "title": f"Bài viết {n}",
+        "link_url": f"https://vnexpress.net/bai-viet-{n}.html",
+        "category": category,
+        "content": f"Nội dung bài viết {n}",
+        **fields
+    })
+
+
+async def category_counts(db) -> dict:
+    return {stats.name: stats.article_count for stats in await fetch_category_stats(db["articles"])}
+
+
+async def test_bulk_upsert_classifies_articles(db):
+    articles = db["articles"]
+    result = await bulk_upsert_articles(articles, [article(1), article(2), article(3, "Kinh doanh")])
+    assert len(result.inserted) == 3
+    assert await articles.count_documents({}) == 3
+    assert await category_counts(db) == {"Thể thao": 2, "Kinh doanh": 1}
+
+    result = await bulk_upsert_articles(
+        articles, [article(1), article(2, title="Tiêu đề mới"), article(3, "Thể thao")], return_documents=True
+    )
+    assert result.unchanged == ["https://vnexpress.net/bai-viet-1.html"]
+    assert sorted(result.updated) == ["https://vnexpress.net/bai-viet-2.html", "https://vnexpress.net/bai-viet-3.html"]
+    assert result.inserted == []
+    assert {stored.title for stored in result.articles} == {"Tiêu đề mới", "Bài viết 3"}
+    assert await category_counts(db) == {"Thể thao": 3}
+
+
+async def test_bulk_upsert_keeps_the_last_duplicate(db):
+    result = await bulk_upsert_articles(db["articles"], [article(1), article(1, title="Sau cùng")])
+    assert result.inserted == ["https://vnexpress.net/bai-viet-1.html"]
+    assert (await db["articles"].find_one())["title"] == "Sau cùng"
+
+
+async def test_fetch_known_urls(db):
+    await bulk_upsert_articles(db["articles"], [article(1)])
+    known = await fetch_known_urls(
+        db["articles"], ["https://vnexpress.net/bai-viet-1.html", "https://vnexpress.net/bai-viet-2.html"]
+    )
+    assert list(known) == ["https://vnexpress.net/bai-viet-1.html"]
+
+
+async def test_keyset_pages_cover_every_article_once(db):
+    start = datetime(2025, 1, 8, 10)
+    # Pairs of articles share a created_at, so pages must also break ties on _id.
+    await db["articles"].insert_many([
+        {"_id": ObjectId(), "title": f"{n}", "created_at": start + timedelta(minutes=n // 2)}
+        for n in range(25)
+    ])
+
+    seen, cursor = [], None
+    while True:
+        docs, cursor = await fetch_articles_after(db["articles"], {}, cursor, 10)
+        seen.extend(docs)
+        if cursor is None:
+            break
+
+    assert len(seen) == 25
+    assert len({doc["_id"] for doc in seen}) == 25
+    keys = [(doc["created_at"], doc["_id"]) for doc in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+class RacingCollection:
+    """Articles collection where another writer stores ``articles`` right
+    before each ``bulk_write``."""
+
+    def __init__(self, collection, articles):
+        self.collection = collection
+        self.articles = articles
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    async def bulk_write(self, operations, **kwargs):
+        await bulk_upsert_articles(self.collection, self.articles)
+        return await self.collection.bulk_write(operations, **kwargs)
+
+
+async def test_bulk_upsert_counts_concurrent_inserts_once(db):
+    articles = RacingCollection(db["articles"], [article(1, title="Ghi trước")])
+    result = await bulk_upsert_articles(articles, [article(1), article(2)])
+
+    assert result.inserted == ["https://vnexpress.net/bai-viet-2.html"]
+    assert result.updated == ["https://vnexpress.net/bai-viet-1.html"]
+    assert await db["articles"].count_documents({}) == 2
+    assert await category_counts(db) == {"Thể thao": 2}
+
+
+async def test_category_change_moves_the_article_between_counts(db):
+    articles = db["articles"]
+    await bulk_upsert_articles(articles, [article(1, "Kinh doanh"), article(2, "Kinh doanh")])
+    moved = await articles.find_one({"link_url": "https://vnexpress.net/bai-viet-2.html"})
+
+    await bulk_upsert_articles(articles, [article(2, "Thể thao")])
+    stats = {category.name: category for category in await fetch_category_stats(articles)}
+    assert {name: category.article_count for name, category in stats.items()} == {"Kinh doanh": 1, "Thể thao": 1}
+    assert stats["Thể thao"].latest_article_at == moved["created_at"]
+
+    # The single-article path keeps the same counts; an emptied category is not listed.
+    await create_articles(articles, article(1, "Thể thao"))
+    assert await category_counts(db) == {"Thể thao": 2}
+
+
+async def test_rebuild_matches_the_articles(db):
+    articles = db["articles"]
+    start = datetime(2025, 1, 8, 10)
+    # Written without going through crud, so category_stats knows nothing about them.
+    await articles.insert_many([
+        {"title": f"{n}", "category": category, "created_at": start + timedelta(minutes=n)}
+        for n, category in enumerate(["Thể thao", "Kinh doanh", "Thể thao", None, "", "Thời sự", "Thể thao"])
+    ])
+    assert await category_counts(db) == {}
+
+    await ensure_category_stats(articles)
+    expected = {
+        category: await articles.count_documents({"category": category})
+        for category in await articles.distinct("category") if category
+    }
+    assert await category_counts(db) == expected == {"Thể thao": 3, "Kinh doanh": 1, "Thời sự": 1}
+    latest = {category.name: category.latest_article_at for category in await fetch_category_stats(articles)}
+    assert latest["Thể thao"] == start + timedelta(minutes=6)
+
+    # Only built once; a repair is an explicit rebuild.
+    await articles.delete_many({"category": "Thời sự"})
+    await ensure_category_stats(articles)
+    assert "Thời sự" in await category_counts(db)
+    assert await rebuild_category_stats(articles) == 2
+    assert "Thời sự" not in await category_counts(db)
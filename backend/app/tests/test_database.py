@@ -0,0 +1,41 @@
+import pytest
+from pymongo import ASCENDING
+
+from app.core.database import INDEX_VERSION, MongoDB
+
+pytestmark = pytest.mark.anyio
+
+
+async def applied_version(db) -> int:
+    return (await db.schema_migrations.find_one({"_id": "indexes"}))["version"]
+
+
+async def test_indexes_are_created_and_version_recorded(db):
+    await MongoDB.setup_indexes()
+
+    assert await applied_version(db) == INDEX_VERSION
+    assert "link_url_index" in await db["articles"].index_information()
+    assert "page_url_index" in await db["page_snapshots"].index_information()
+
+
+async def test_obsolete_indexes_are_only_dropped_by_a_migration(db):
+    await MongoDB.setup_indexes()
+    await db["articles"].create_index([("created_at", ASCENDING)], name="created_at_sort")
+
+    # Already at INDEX_VERSION: nothing is migrated.
+    await MongoDB.setup_indexes()
+    assert "created_at_sort" in await db["articles"].index_information()
+
+    await db.schema_migrations.update_one({"_id": "indexes"}, {"$set": {"version": INDEX_VERSION - 1}})
+    await MongoDB.setup_indexes()
+    assert "created_at_sort" not in await db["articles"].index_information()
+    assert await applied_version(db) == INDEX_VERSION
+
+
+async def test_newer_index_set_is_not_downgraded(db):
+    await db.schema_migrations.insert_one({"_id": "indexes", "version": INDEX_VERSION + 1})
+    await db["articles"].create_index([("created_at", ASCENDING)], name="created_at_sort")
+
+    await MongoDB.setup_indexes()
+    assert await applied_version(db) == INDEX_VERSION + 1
+    assert "created_at_sort" in await db["articles"].index_information()
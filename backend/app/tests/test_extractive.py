@@ -0,0 +1,47 @@
+from app.core import extractive
+from app.core.extractive import split_sentences
+
+
+def test_split_sentences_keeps_abbreviations_initials_and_decimals():
+    text = (
+        "TS. Nguyễn Văn A. cho biết giá vàng tăng lên 2.650 USD. "
+        "Ông nói thêm: “Thị trường còn biến động. Nhà đầu tư nên thận trọng.” "
+        "UBND TP. Hà Nội đã họp."
+    )
+    assert split_sentences(text) == [
+        "TS. Nguyễn Văn A. cho biết giá vàng tăng lên 2.650 USD.",
+        "Ông nói thêm: “Thị trường còn biến động. Nhà đầu tư nên thận trọng.”",
+        "UBND TP. Hà Nội đã họp."
+    ]
+
+
+def test_split_sentences_needs_a_capital_after_the_boundary():
+    assert split_sentences("Giá tăng 1,2 lần. so với năm ngoái.") == ["Giá tăng 1,2 lần. so với năm ngoái."]
+    assert split_sentences("Mưa lớn! Đường ngập?  Xe chết máy…") == ["Mưa lớn!", "Đường ngập?", "Xe chết máy…"]
+
+
+def test_summarize_texts_keeps_order_and_leading_sentences():
+    article = " ".join(
+        f"Câu thứ {n} nói về lũ lụt ở miền Trung và công tác cứu hộ của chính quyền địa phương."
+        for n in range(1, 11)
+    )
+    summaries = extractive.summarize_texts([article, "", "Một câu ngắn."])
+
+    assert len(summaries) == 3
+    chosen = split_sentences(summaries[0])
+    assert 0 < len(chosen) <= 3
+    assert all(sentence in article for sentence in chosen)
+    assert summaries[1] == ""
+
+
+def test_one_letter_words_end_sentences():
+    assert split_sentences("Tôi đồng ý. Rất tốt.") == ["Tôi đồng ý.", "Rất tốt."]
+    assert split_sentences("Chúng tôi vẫn ở. Sáng mai mới về.") == ["Chúng tôi vẫn ở.", "Sáng mai mới về."]
+    assert split_sentences("Sản phẩm đạt loại A. Giá bán tăng.") == ["Sản phẩm đạt loại A.", "Giá bán tăng."]
+
+
+def test_capital_initials_in_names_do_not_end_sentences():
+    assert split_sentences("Ông Nguyễn Văn A. Trần cho biết.") == ["Ông Nguyễn Văn A. Trần cho biết."]
+    assert split_sentences("J. K. Rowling ra sách mới. Độc giả chờ đợi.") == [
+        "J. K. Rowling ra sách mới.", "Độc giả chờ đợi."
+    ]
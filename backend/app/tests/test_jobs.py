@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from app.core.jobs import CANCELLED, FAILED, QUEUED, RUNNING, SKIPPED, SUCCEEDED, JobManager
+
+pytestmark = pytest.mark.anyio
+
+
+def blocking_work(release: asyncio.Event, result="done"):
+    async def work(job):
+        await release.wait()
+        return result
+    return work
+
+
+async def test_same_key_is_coalesced():
+    manager = JobManager(max_concurrent=2, history_size=10)
+    release = asyncio.Event()
+    job, created = manager.submit("scrape", blocking_work(release))
+    again, created_again = manager.submit("scrape", blocking_work(release))
+    other, created_other = manager.submit("scrape", blocking_work(release), key="scrape:adaptive")
+
+    assert created and not created_again and created_other
+    assert again is job and other is not job
+
+    release.set()
+    await job.wait()
+    await other.wait()
+    assert (job.status, job.result) == (SUCCEEDED, "done")
+
+    # Finished jobs are not joined.
+    _, created = manager.submit("scrape", blocking_work(release))
+    assert created
+    await manager.shutdown()
+
+
+async def test_jobs_beyond_the_cap_wait_queued():
+    manager = JobManager(max_concurrent=1, history_size=10)
+    release = asyncio.Event()
+    first, _ = manager.submit("a", blocking_work(release))
+    second, _ = manager.submit("b", blocking_work(release))
+    await asyncio.sleep(0)
+
+    assert (first.status, second.status) == (RUNNING, QUEUED)
+    assert manager.counts() == {(QUEUED,): 1, (RUNNING,): 1}
+
+    release.set()
+    await second.wait()
+    assert (first.status, second.status) == (SUCCEEDED, SUCCEEDED)
+
+
+async def test_cancel_failure_and_skip():
+    manager = JobManager(max_concurrent=1, history_size=10)
+
+    running, _ = manager.submit("a", blocking_work(asyncio.Event()))
+    await asyncio.sleep(0)
+    assert (await manager.cancel(running.id)).status == CANCELLED
+    assert running.finished_at is not None
+    assert await manager.cancel("unknown") is None
+
+    async def fail(job):
+        raise RuntimeError("listing unavailable")
+
+    failed, _ = manager.submit("b", fail)
+    await failed.wait()
+    assert (failed.status, failed.error) == (FAILED, "listing unavailable")
+
+    async def nothing(job):
+        return None
+
+    skipped, _ = manager.submit("c", nothing)
+    await skipped.wait()
+    assert skipped.status == SKIPPED
+
+
+async def test_history_is_bounded():
+    manager = JobManager(max_concurrent=1, history_size=2)
+
+    async def work(job):
+        return 1
+
+    for n in range(4):
+        job, _ = manager.submit(f"kind-{n}", work)
+        await job.wait()
+    manager.submit("last", work)
+
+    assert [job.kind for job in manager.list()] == ["last", "kind-3", "kind-2"]
+    await manager.shutdown()
+
+
+async def test_progress_from_pipeline_events():
+    manager = JobManager(max_concurrent=1, history_size=10)
+    release = asyncio.Event()
+    job, _ = manager.submit("scrape", blocking_work(release))
+
+    job.record_event("discovered", {"discovered": 5, "pending": 3})
+    job.record_event("fetched", {"link_url": "u1"})
+    job.record_event("fetched", {"link_url": "u2"})
+    job.record_event("fetched", {"link_url": "u3"})
+    # One identical article: reported as skipped, not stored.
+    job.record_event("skipped", {"link_url": "u3", "reason": "identical"})
+    job.record_event("stored", {"inserted": 1, "updated": 1, "unchanged": 1, "failed": 0})
+    job.record_event("failed", {"stage": "fetch", "count": 1})
+
+    assert job.progress == {
+        "discovered": 5, "pending": 3, "fetched": 3, "skipped": 1, "inserted": 1, "updated": 1,
+        "unchanged": 1, "stored": 2, "failed": 1
+    }
+    assert job.stages["fetched"]["count"] == 3
+    release.set()
+    await job.wait()
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.lease import MongoLease
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_one_holder_at_a_time(db):
+    first = MongoLease("scheduler_leader", 60, owner="node-a")
+    second = MongoLease("scheduler_leader", 60, owner="node-b")
+
+    assert await first.acquire()
+    assert not await second.acquire()
+    # Renewal by the holder.
+    assert await first.acquire()
+    assert first.is_held and not second.is_held
+    assert await second.get_owner() == "node-a"
+
+
+async def test_expired_lease_passes_to_another_node(db):
+    first = MongoLease("scrape_run", 60, owner="node-a")
+    second = MongoLease("scrape_run", 60, owner="node-b")
+    assert await first.acquire()
+
+    await db["scheduler_leases"].update_one(
+        {"_id": "scrape_run"}, {"$set": {"expires_at": datetime.now() - timedelta(seconds=1)}}
+    )
+    assert await first.get_owner() is None
+    assert await second.acquire()
+    assert not await first.acquire()
+    assert await first.get_owner() == "node-b"
+
+
+async def test_release_only_drops_own_lease(db):
+    first = MongoLease("scrape_run", 60, owner="node-a")
+    second = MongoLease("scrape_run", 60, owner="node-b")
+    assert await first.acquire()
+
+    await second.release()
+    assert await second.get_owner() == "node-a"
+
+    await first.release()
+    assert not first.is_held
+    assert await second.acquire()
@@ -0,0 +1,108 @@
+import asyncio
+import io
+import json
+import logging
+import time
+
+import pytest
+
+from app.utils import RepeatFilter, _log_context, create_handlers, log_context, start_queue_logging
+
+
+@pytest.fixture
+def log_output(tmp_path):
+    """Logger behind the queue with JSON output; returns it and a function
+    that stops the listener and returns the console lines."""
+    console = io.StringIO()
+    handlers = create_handlers(tmp_path, json_format=True, stream=console)
+    queue_handler, listener = start_queue_logging(handlers, repeat_window=0.2)
+    test_logger = logging.getLogger("app.tests.logging")
+    test_logger.handlers = [queue_handler]
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+
+    def lines():
+        listener.stop()
+        for handler in handlers:
+            handler.close()
+        return [json.loads(line) for line in console.getvalue().splitlines()]
+
+    yield test_logger, lines
+    test_logger.handlers = []
+
+
+def test_records_carry_the_bound_context(log_output):
+    test_logger, lines = log_output
+
+    async def stage():
+        test_logger.info("fetching")
+
+    async def job():
+        with log_context(job_id="j1", source="vnexpress"):
+            with log_context(article="https://vnexpress.net/1.html"):
+                await asyncio.create_task(stage())
+            test_logger.info("job done")
+        test_logger.info("outside")
+
+    asyncio.run(job())
+
+    fetching, done, outside = lines()
+    assert fetching["message"] == "fetching"
+    assert (fetching["job_id"], fetching["source"], fetching["article"]) == ("j1", "vnexpress", "https://vnexpress.net/1.html")
+    assert (done["job_id"], "article" in done) == ("j1", False)
+    assert set(outside) == {"time", "level", "logger", "message"}
+
+
+def test_bound_context_is_read_only():
+    with pytest.raises(TypeError):
+        _log_context.get()["job_id"] = "leak"
+    with log_context(job_id="a"), pytest.raises(TypeError):
+        _log_context.get()["job_id"] = "leak"
+    assert dict(_log_context.get()) == {}
+
+
+def test_repeated_errors_are_rate_limited(log_output):
+    test_logger, lines = log_output
+    for _ in range(5):
+        test_logger.error("Gemini rate limit reached")
+    test_logger.warning("another line")
+    time.sleep(0.25)
+    test_logger.error("Gemini rate limit reached")
+
+    try:
+        raise ValueError("bad markup")
+    except ValueError:
+        test_logger.error("parse failed", exc_info=True)
+
+    messages = [line["message"] for line in lines()]
+    assert messages[:3] == [
+        "Gemini rate limit reached",
+        "another line",
+        "Gemini rate limit reached (repeated 4 more times)"
+    ]
+    assert messages[3] == "parse failed"
+
+
+def test_context_cannot_replace_the_core_fields(log_output):
+    test_logger, lines = log_output
+    with log_context(level="x", message="y", job_id="j1"):
+        test_logger.info("fetching")
+
+    (line,) = lines()
+    assert (line["level"], line["message"], line["logger"]) == ("INFO", "fetching", "app.tests.logging")
+    assert (line["context_level"], line["context_message"], line["job_id"]) == ("x", "y", "j1")
+
+
+def test_repeat_filter_forgets_the_oldest_messages_past_the_cap(monkeypatch):
+    monkeypatch.setattr(RepeatFilter, "MAX_KEYS", 3)
+    repeat_filter = RepeatFilter(window=60)
+
+    def record(message):
+        return logging.LogRecord("app", logging.ERROR, __file__, 1, message, None, None)
+
+    for n in range(10):
+        assert repeat_filter.filter(record(f"fetch failed {n}"))
+    assert [key[2] for key in repeat_filter._seen] == ["fetch failed 7", "fetch failed 8", "fetch failed 9"]
+    assert not repeat_filter.filter(record("fetch failed 9"))
+    assert repeat_filter.filter(record("fetch failed 0"))
+    assert len(repeat_filter._seen) == 3
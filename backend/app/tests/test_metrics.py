@@ -0,0 +1,60 @@
+import re
+
+import pytest
+
+from app.core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+pytestmark = pytest.mark.anyio
+
+
+def test_exposition_format():
+    registry = MetricsRegistry()
+    requests = Counter("requests_total", "Requests.", ["route"], registry=registry)
+    waiting = Gauge("waiting", "Callers waiting.", registry=registry)
+    latency = Histogram("latency_seconds", "Latency.", ["route"], buckets=(0.1, 1.0), registry=registry)
+
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    waiting.set_function(lambda: 3)
+    for value in (0.05, 0.1, 0.5, 2.5):
+        latency.observe(value, route="/a")
+
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{route="/a\\"b"} 3\n'
+        "# HELP waiting Callers waiting.\n"
+        "# TYPE waiting gauge\n"
+        "waiting 3\n"
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{route="/a",le="0.1"} 2\n'
+        'latency_seconds_bucket{route="/a",le="1"} 3\n'
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4\n'
+        'latency_seconds_sum{route="/a"} 3.15\n'
+        'latency_seconds_count{route="/a"} 4\n'
+    )
+    with pytest.raises(ValueError):
+        requests.inc(status="200")
+    with pytest.raises(ValueError):
+        Counter("requests_total", "Again.", registry=registry)
+
+
+async def test_metrics_endpoint_after_a_request(db, api):
+    assert (await api.get("/api/v1/articles/categories")).status_code == 200
+    response = await api.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# HELP http_request_duration_seconds HTTP request latency by method, route template and status.\n" in body
+    assert "# TYPE http_request_duration_seconds histogram\n" in body
+    assert "# TYPE summary_queue_depth gauge\nsummary_queue_depth 0\n" in body
+
+    labels = 'method="GET",route="/api/v1/articles/categories",status="200"'
+    buckets = re.findall(rf'^http_request_duration_seconds_bucket{{{labels},le="([^"]+)"}} (\d+)$', body, re.M)
+    assert [bound for bound, _ in buckets][-1] == "+Inf"
+    counts = [int(count) for _, count in buckets]
+    assert counts == sorted(counts) and counts[-1] >= 1
+    assert re.search(rf"^http_request_duration_seconds_count{{{labels}}} {counts[-1]}$", body, re.M)
+    assert re.search(rf"^http_request_duration_seconds_sum{{{labels}}} [0-9.e-]+$", body, re.M)
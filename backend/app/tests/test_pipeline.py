@@ -0,0 +1,178 @@
+import pytest
+
+from app.core.config import settings
+from app.core.pipeline import MultiSourcePipeline, ScrapePipeline
+from app.core.rate_limiter import RateLimiter
+from app.core.sources import Source
+from app.core.summarizer import ArticleSummarizer
+from app.core.summary_cache import SummaryCache
+from app.core.summary_queue import PENDING
+from app.tests.scripts.fake_gemini import FakeGemini
+
+pytestmark = pytest.mark.anyio
+
+
+def make_source(server, name: str = "vnexpress", path: str = "/tin-tuc-24h") -> Source:
+    return Source(name=name, listing_urls=[server.url(path)])
+
+
+async def run(pipeline) -> list:
+    return [article async for article in pipeline.run()]
+
+
+def make_pipeline(db, server, **options) -> ScrapePipeline:
+    options = {"incremental": True, "conditional": False, "enqueue_summaries": True, **options}
+    return ScrapePipeline(db, source=make_source(server), **options)
+
+
+async def test_run_stores_every_listed_article(db, fixture_server):
+    pipeline = make_pipeline(db, fixture_server)
+    articles = await run(pipeline)
+
+    stats = pipeline.stats
+    assert stats["discovered"] > 0
+    assert stats["fetched"] == stats["parsed"] == stats["inserted"] == stats["discovered"]
+    assert stats["failed"] == 0
+    assert len(articles) == stats["discovered"]
+    assert stats["feeds"][fixture_server.url("/tin-tuc-24h")] == {"new": stats["discovered"], "status": "changed"}
+
+    docs = await db["articles"].find().to_list(length=None)
+    assert len(docs) == stats["discovered"]
+    for doc in docs:
+        assert doc["content"]
+        assert doc["summary_status"] == PENDING
+        # Extractive draft until the summary workers get to it.
+        assert doc["summary"]
+
+
+async def test_incremental_run_skips_stored_articles(db, fixture_server):
+    await run(make_pipeline(db, fixture_server))
+    requests = fixture_server.request_count
+
+    pipeline = make_pipeline(db, fixture_server)
+    assert await run(pipeline) == []
+    assert pipeline.stats["skipped"] == pipeline.stats["discovered"] > 0
+    assert pipeline.stats["fetched"] == 0
+    # Only the listing page was read again.
+    assert fixture_server.request_count == requests + 1
+
+
+async def test_unchanged_listing_stops_the_run(db, fixture_server):
+    await run(make_pipeline(db, fixture_server, conditional=True))
+
+    pipeline = make_pipeline(db, fixture_server, conditional=True)
+    assert await run(pipeline) == []
+    assert pipeline.stats["listing_unchanged"] is True
+    assert pipeline.stats["discovered"] == 0
+    assert fixture_server.not_modified_count == 1
+
+
+async def test_unchanged_detail_pages_are_not_parsed(db, fixture_server):
+    await run(make_pipeline(db, fixture_server, conditional=True))
+
+    pipeline = make_pipeline(db, fixture_server, incremental=False, conditional=True)
+    # The listing changed (no snapshot), the articles did not.
+    await db["page_snapshots"].delete_many({"url": fixture_server.url("/tin-tuc-24h")})
+    assert await run(pipeline) == []
+    assert pipeline.stats["unchanged"] == pipeline.stats["discovered"] > 0
+    assert pipeline.stats["parsed"] == 0
+
+
+async def test_listeners_receive_progress(db, fixture_server):
+    events = []
+    pipeline = make_pipeline(db, fixture_server)
+    pipeline.add_listener(lambda event, data: events.append((event, data)))
+    await run(pipeline)
+
+    names = [event for event, _ in events]
+    assert names.count("fetched") == pipeline.stats["fetched"]
+    assert "discovered" in names and "stored" in names
+    assert all(data["source"] == "vnexpress" for _, data in events)
+
+
+async def test_failed_source_does_not_stop_the_others(db, fixture_server):
+    pipeline = MultiSourcePipeline(
+        db,
+        [make_source(fixture_server), make_source(fixture_server, "missing", "/no-such-listing")],
+        incremental=True,
+        conditional=False,
+        enqueue_summaries=True
+    )
+    articles = await run(pipeline)
+
+    assert len(articles) == pipeline.stats["sources"]["vnexpress"]["stored"] > 0
+    assert list(pipeline.stats["errors"]) == ["missing"]
+
+
+async def test_failed_fetch_is_retried_on_the_next_run(db, fixture_server):
+    failing = fixture_server.url("/thoi-su-4790000.html")
+    fixture_server.fail_paths.add("/thoi-su-4790000.html")
+    pipeline = make_pipeline(db, fixture_server)
+    articles = await run(pipeline)
+
+    assert pipeline.stats["failed"] == 1
+    assert pipeline.stats["inserted"] == pipeline.stats["discovered"] - 1
+    assert failing not in {str(article.link_url) for article in articles}
+    assert await db["articles"].find_one({"link_url": failing}) is None
+
+    fixture_server.fail_paths.clear()
+    pipeline = make_pipeline(db, fixture_server)
+    articles = await run(pipeline)
+
+    assert (pipeline.stats["fetched"], pipeline.stats["inserted"], pipeline.stats["failed"]) == (1, 1, 0)
+    assert [str(article.link_url) for article in articles] == [failing]
+    assert (await db["articles"].find_one({"link_url": failing}))["content"]
+
+
+async def test_listing_is_reread_after_a_failed_article(db, fixture_server):
+    failing = fixture_server.url("/thoi-su-4790000.html")
+    fixture_server.fail_paths.add("/thoi-su-4790000.html")
+    pipeline = make_pipeline(db, fixture_server, conditional=True)
+    await run(pipeline)
+    assert pipeline.stats["failed"] == 1
+    assert await db["page_snapshots"].find_one({"url": fixture_server.url("/tin-tuc-24h")}) is None
+
+    fixture_server.fail_paths.clear()
+    pipeline = make_pipeline(db, fixture_server, conditional=True)
+    articles = await run(pipeline)
+
+    assert pipeline.stats["listing_unchanged"] is False
+    assert [str(article.link_url) for article in articles] == [failing]
+    # Now that everything is stored, the next run stops at the listing.
+    pipeline = make_pipeline(db, fixture_server, conditional=True)
+    await run(pipeline)
+    assert pipeline.stats["listing_unchanged"] is True
+
+
+async def test_page_without_article_is_retried_on_the_next_run(db, fixture_server):
+    redesigned = fixture_server.url("/thoi-su-4790000.html")
+    fixture_server.pages["/thoi-su-4790000.html"] = "<html><body><p>Trang đang bảo trì</p></body></html>"
+    pipeline = make_pipeline(db, fixture_server)
+    await run(pipeline)
+
+    assert (pipeline.stats["parsed"], pipeline.stats["failed"]) == (pipeline.stats["discovered"] - 1, 1)
+    assert await db["articles"].find_one({"link_url": redesigned}) is None
+
+    fixture_server.pages.clear()
+    pipeline = make_pipeline(db, fixture_server)
+    articles = await run(pipeline)
+
+    assert [str(article.link_url) for article in articles] == [redesigned]
+    assert (await db["articles"].find_one({"link_url": redesigned}))["content"]
+
+
+async def test_inline_mode_summarizes_before_storing(db, fixture_server, monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_MODE", "inline")
+    with FakeGemini() as gemini:
+        monkeypatch.setattr(settings, "GEMINI_API_ENDPOINT", gemini.base_url)
+        summarizer = ArticleSummarizer(rate_limiter=RateLimiter(0), cache=SummaryCache(100, 3600))
+        pipeline = ScrapePipeline(db, source=make_source(fixture_server), summarizer=summarizer,
+                                  incremental=True, conditional=False)
+        await run(pipeline)
+
+    assert pipeline.enqueue_summaries is False
+    assert pipeline.stats["summarized"] == pipeline.stats["inserted"] > 0
+    assert gemini.batch_count > 0
+    docs = await db["articles"].find().to_list(length=None)
+    assert all(doc["summary"].startswith("Tóm tắt giả lập") for doc in docs)
+    assert all(doc.get("summary_status") is None for doc in docs)
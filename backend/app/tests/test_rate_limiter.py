@@ -0,0 +1,102 @@
+import pytest
+
+from app.core import rate_limiter
+from app.core.rate_limiter import RateLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    """Stands in for ``time.monotonic`` and ``asyncio.sleep``; sleeping moves the clock."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.slept = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    monkeypatch.setattr(rate_limiter, "asyncio", clock)
+    return clock
+
+
+async def test_requests_are_spaced_by_the_rate(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+
+    for _ in range(3):
+        assert await limiter.acquire()
+    assert clock.slept == [1.0, 1.0]
+    assert clock.now == 1002.0
+
+
+async def test_burst_goes_through_at_once(clock):
+    limiter = RateLimiter(requests_per_minute=60, burst=3)
+
+    for _ in range(3):
+        await limiter.acquire()
+    assert clock.slept == []
+    assert limiter.estimate_wait() == 1.0
+
+
+async def test_max_wait_declines_without_reserving(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    await limiter.acquire()
+    await limiter.acquire(max_wait=1.5)
+
+    assert limiter.estimate_wait() == 1.0
+    assert await limiter.acquire(max_wait=0.5) is False
+    assert limiter.estimate_wait() == 1.0
+    assert clock.slept == [1.0]
+
+
+async def test_penalize_holds_back_every_caller(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.penalize(30)
+    limiter.penalize(10)
+
+    assert limiter.estimate_wait() == 30.0
+    await limiter.acquire()
+    await limiter.acquire()
+    # Queued behind the block, not all released when it expires.
+    assert clock.slept == [30.0, 1.0]
+
+
+async def test_record_tokens_returns_unused_reservation(clock):
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=600)
+
+    await limiter.acquire(tokens=600)
+    assert limiter.estimate_wait(tokens=100) == pytest.approx(10.0)
+
+    limiter.record_tokens(estimated=600, actual=300)
+    assert limiter.estimate_wait(tokens=100) == 0.0
+    # No usage reported: the estimate stands.
+    limiter.record_tokens(estimated=100, actual=0)
+    assert limiter.estimate_wait(tokens=400) == pytest.approx(10.0)
+
+
+async def test_daily_limit(clock):
+    limiter = RateLimiter(requests_per_minute=0, requests_per_day=2)
+
+    assert await limiter.acquire(max_wait=0)
+    assert await limiter.acquire(max_wait=0)
+    assert await limiter.acquire(max_wait=60) is False
+    assert limiter.estimate_wait() == pytest.approx(43200.0)
+
+
+async def test_zero_is_unlimited_and_negative_is_rejected(clock):
+    limiter = RateLimiter(requests_per_minute=0)
+    for _ in range(100):
+        assert await limiter.acquire(tokens=10_000, max_wait=0)
+    assert clock.slept == []
+
+    with pytest.raises(ValueError):
+        RateLimiter(requests_per_minute=-1)
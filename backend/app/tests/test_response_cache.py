@@ -0,0 +1,79 @@
+import hashlib
+
+import pytest
+
+from app.core import metrics
+from app.core.response_cache import response_cache
+from app.core.summary_queue import PENDING, SummaryQueue
+from app.crud import bulk_upsert_articles
+from app.models import ArticleBase
+
+pytestmark = pytest.mark.anyio
+
+CONTENT = "Mưa lớn kéo dài nhiều ngày khiến nhiều tuyến đường ở Hà Nội ngập sâu. " * 3
+
+
+def make_article(n: int) -> ArticleBase:
+    return ArticleBase(title=f"Bài {n}", link_url=f"https://vnexpress.net/{n}.html", content=CONTENT)
+
+
+async def test_etag_is_a_hash_of_the_body_and_revalidates_to_304(db, api):
+    await bulk_upsert_articles(db["articles"], [make_article(1)])
+
+    response = await api.get("/api/v1/articles/")
+    etag = response.headers["etag"]
+    assert etag == f'"{hashlib.sha256(response.content).hexdigest()[:32]}"'
+    assert response.headers["cache-control"] == "no-cache"
+
+    not_modified = await api.get("/api/v1/articles/", headers={"If-None-Match": f'"other", {etag}'})
+    assert (not_modified.status_code, not_modified.content) == (304, b"")
+    assert not_modified.headers["etag"] == etag
+
+    changed = await api.get("/api/v1/articles/", headers={"If-None-Match": '"other"'})
+    assert (changed.status_code, changed.content) == (200, response.content)
+
+
+async def test_cache_busting_parameter_is_ignored(db, api):
+    await bulk_upsert_articles(db["articles"], [make_article(1)])
+    hits = response_cache.hits
+
+    first = await api.get("/api/v1/articles/", params={"page": 1, "_t": "1700000000"})
+    second = await api.get("/api/v1/articles/", params={"_t": "1700000001", "page": 1})
+
+    assert second.content == first.content
+    assert response_cache.hits == hits + 1
+
+
+async def test_writes_retire_cached_responses(db, api):
+    articles = db["articles"]
+    await bulk_upsert_articles(articles, [make_article(1)], [PENDING])
+    before = (await api.get("/api/v1/articles/")).headers["etag"]
+
+    generation = response_cache.generation
+    await bulk_upsert_articles(articles, [make_article(2)], [PENDING])
+    assert response_cache.generation > generation
+    after_insert = await api.get("/api/v1/articles/")
+    assert after_insert.json()["total"] == 2 and after_insert.headers["etag"] != before
+
+    # A finished summary shows on the cards too.
+    queue = SummaryQueue(lease_seconds=300, max_attempts=3, retry_delay_seconds=60)
+    generation = response_cache.generation
+    assert await queue.complete(await queue.claim("worker-1"), "Tóm tắt mới")
+    assert response_cache.generation > generation
+    assert "Tóm tắt mới" in [item["summary"] for item in (await api.get("/api/v1/articles/")).json()["items"]]
+
+
+async def test_cache_effectiveness_is_exported(db, api):
+    hits = metrics.response_cache_lookups.value(result="hit")
+    misses = metrics.response_cache_lookups.value(result="miss")
+    not_modified = metrics.response_cache_not_modified.value()
+
+    etag = (await api.get("/api/v1/articles/categories")).headers["etag"]
+    await api.get("/api/v1/articles/categories", headers={"If-None-Match": etag})
+
+    assert metrics.response_cache_lookups.value(result="miss") == misses + 1
+    assert metrics.response_cache_lookups.value(result="hit") == hits + 1
+    assert metrics.response_cache_not_modified.value() == not_modified + 1
+    body = (await api.get("/metrics")).text
+    assert "# TYPE response_cache_lookups_total counter" in body
+    assert "response_cache_entries " in body
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from app.core.jobs import job_manager
+from app.core.scheduler import FULL_SCRAPE_KEY, article_scheduler, scrape_key
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def scrapes(monkeypatch):
+    """Replace the scrape itself; each run waits for ``release`` and reports its feeds."""
+    release = asyncio.Event()
+    started = []
+
+    async def scrape_and_store_job(trigger, mode, due_feeds, listener=None):
+        started.append(due_feeds)
+        await release.wait()
+        return None
+
+    monkeypatch.setattr(article_scheduler, "scrape_and_store_job", scrape_and_store_job)
+    monkeypatch.setattr(article_scheduler, "_run_lock", None)
+    job_manager._slots = None
+    job_manager._jobs.clear()
+    yield release, started
+
+
+def test_scrape_key_depends_on_the_feeds_only():
+    assert scrape_key() == FULL_SCRAPE_KEY
+    assert scrape_key({"a": ["x", "y"], "b": ["z"]}) == scrape_key({"b": ["z"], "a": ["y", "x"]})
+    assert scrape_key({"a": ["x"]}) != scrape_key({"a": ["y"]})
+    assert scrape_key({"a": ["x"]}) != FULL_SCRAPE_KEY
+
+
+async def test_only_scrapes_of_the_same_feeds_are_coalesced(scrapes):
+    release, started = scrapes
+    partial, _ = article_scheduler.submit_scrape("scheduled", "adaptive", {"vnexpress": ["feed-a"]})
+    same, created_same = article_scheduler.submit_scrape("scheduled", "adaptive", {"vnexpress": ["feed-a"]})
+    full, created_full = article_scheduler.submit_scrape("api")
+    joined, created_joined = article_scheduler.submit_scrape("manual")
+
+    assert same is partial and not created_same
+    assert full is not partial and created_full
+    assert joined is full and not created_joined
+
+    release.set()
+    await full.wait()
+    # The partial scrape ran first and the full one after it, never together.
+    assert started == [{"vnexpress": ["feed-a"]}, None]
+
+
+async def test_adaptive_tick_defers_to_a_full_scrape(scrapes, monkeypatch):
+    release, started = scrapes
+    monkeypatch.setattr(article_scheduler, "distributed", False)
+    full, _ = article_scheduler.submit_scrape("api")
+
+    await article_scheduler.run_scheduled("adaptive")
+    assert [job.id for job in job_manager.list()] == [full.id]
+
+    release.set()
+    await full.wait()
@@ -0,0 +1,54 @@
+import pytest
+
+from app.core.search import build_search_query, fold_text, is_ranked, search_fields
+from app.crud import build_article_filter, bulk_upsert_articles
+from app.models import ArticleBase
+
+pytestmark = pytest.mark.anyio
+
+
+def test_fold_text_strips_diacritics_case_and_punctuation():
+    assert fold_text("Hà Nội") == "ha noi"
+    assert fold_text("HÀ NỘI, Đà Nẵng!") == "ha noi da nang"
+    assert fold_text("đường") == "duong"
+    assert fold_text(None) == ""
+
+
+def test_search_fields():
+    fields = search_fields({"title": "Bão số 3", "description": "Hà Nội mưa lớn", "content": "Nội dung"})
+    assert fields["search_title"] == "bao so 3"
+    assert fields["search_body"] == "ha noi mua lon noi dung"
+    assert fields["search_terms"] == ["3", "bao", "dung", "ha", "lon", "mua", "noi", "so"]
+
+
+def test_build_search_query():
+    assert build_search_query("  ,, ") is None
+    assert build_search_query("Hà") == {"search_terms": {"$regex": "^ha"}}
+    assert build_search_query("Hà Nội", prefix=False) == {"$text": {"$search": '"ha" "noi"'}}
+
+    query = build_search_query("bão số")
+    assert query == {"$text": {"$search": '"bao"'}, "search_terms": {"$regex": "^so"}}
+    assert is_ranked(query)
+
+
+async def test_prefix_search_is_accent_insensitive(db):
+    articles = db["articles"]
+    await bulk_upsert_articles(articles, [
+        ArticleBase(title="Hà Nội mưa lớn", link_url="https://vnexpress.net/1.html"),
+        ArticleBase(title="Sài Gòn nắng nóng", link_url="https://vnexpress.net/2.html")
+    ])
+
+    for q in ("ha", "HÀ", "nă"):
+        docs = await articles.find(build_article_filter(q=q)).to_list(length=None)
+        assert len(docs) == 1, q
+
+
+async def test_prefix_search_matches_the_content(db):
+    articles = db["articles"]
+    await bulk_upsert_articles(articles, [
+        ArticleBase(title="Sài Gòn nắng nóng", link_url="https://vnexpress.net/2.html",
+                    content="Nhiệt độ ngoài trời vượt 38 độ C.")
+    ])
+
+    docs = await articles.find(build_article_filter(q="nhiệt")).to_list(length=None)
+    assert [doc["title"] for doc in docs] == ["Sài Gòn nắng nóng"]
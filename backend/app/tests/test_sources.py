@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from app.core.pipeline import ScrapePipeline
+from app.core.sources import Source, load_sources, parse_sources
+
+pytestmark = pytest.mark.anyio
+
+LISTING = """<html><body>
+<div class="story"><h2><a href="/tin-a.html">Tin A</a></h2></div>
+<div class="story"><h2><a href="/tin-b.html">Tin B</a></h2></div>
+</body></html>"""
+
+DETAIL = """<html><body><main class="post"><div class="body">
+<p>Đoạn thứ nhất của {title}.</p><p>Đoạn thứ hai.</p>
+</div></main></body></html>"""
+
+SELECTORS = {"listing_item": "div.story", "title": "h2", "detail_article": "main.post", "paragraph": "div.body p"}
+
+
+def test_parse_sources_reads_every_field():
+    [source] = parse_sources([{
+        "name": "example",
+        "listing_urls": ["https://news.example.com/latest"],
+        "categories": {"Thể thao": "https://news.example.com/sport"},
+        "pages": 2,
+        "page_url": "{url}?page={page}",
+        "selectors": {"title": "h2"},
+        "requests_per_minute": 30
+    }])
+
+    assert source.engine == "lxml"
+    assert [page.url for page in source.listing_pages()] == [
+        "https://news.example.com/latest", "https://news.example.com/latest?page=2",
+        "https://news.example.com/sport", "https://news.example.com/sport?page=2"
+    ]
+
+
+@pytest.mark.parametrize("config, message", [
+    ({"name": "x"}, "Sources config must be a JSON list of sources, got dict"),
+    ([["https://example.com"]], "Source #1 must be a JSON object"),
+    ([{"listing_urls": ["https://example.com"]}], "Source #1 is missing ['name']"),
+    ([{"name": "", "listing_urls": ["https://example.com"]}], "Source name must be a non-empty string"),
+    ([{"name": "x"}], "Source #1 'x' is missing ['listing_urls']"),
+    ([{"name": "x", "listing_urls": []}], "Source 'x' has no listing_urls or categories"),
+    ([{"name": "x", "listing_urls": "https://example.com"}], "listing_urls must be a list of URLs"),
+    ([{"name": "x", "listing_urls": ["https://example.com"], "engine": "regex"}],
+     "Source 'x': Unknown HTML extractor 'regex'"),
+    ([{"name": "x", "listing_urls": ["https://example.com"], "engine": "no_such_module:Extractor"}],
+     "Source 'x': No module named 'no_such_module'"),
+    ([{"name": "x", "listing_urls": ["https://example.com"], "selectors": {"headline": "h1"}}],
+     "Source 'x': Unknown selector keys ['headline']"),
+    ([{"name": "x", "listing_urls": ["https://example.com"], "engine": "html5lib", "selectors": {"title": "h2"}}],
+     "does not take custom selectors"),
+    ([{"name": "x", "listing_urls": ["https://example.com"], "pages": 0}], "must read at least one page"),
+    ([{"name": "x", "listing_urls": ["https://example.com"], "requests_per_minute": -1}],
+     "requests_per_minute must be a non-negative integer"),
+    ([{"name": "x", "listing_urls": ["https://example.com"], "url": "https://example.com"}],
+     "Unknown keys ['url'] in source #1 'x'"),
+    ([{"name": "x", "listing_urls": ["https://a.example"]}, {"name": "x", "listing_urls": ["https://b.example"]}],
+     "Duplicate source names: ['x']"),
+])
+def test_malformed_sources_are_rejected(config, message):
+    with pytest.raises(ValueError) as error:
+        parse_sources(config)
+    assert message in str(error.value)
+
+
+def test_load_sources_skips_disabled_ones(tmp_path):
+    path = tmp_path / "sources.json"
+    path.write_text(json.dumps([
+        {"name": "on", "listing_urls": ["https://a.example/latest"]},
+        {"name": "off", "listing_urls": ["https://b.example/latest"], "enabled": False}
+    ]), encoding="utf-8")
+
+    assert [source.name for source in load_sources(str(path))] == ["on"]
+    assert [source.name for source in load_sources("")] == ["vnexpress"]
+
+
+async def test_selector_overrides_reach_the_extractor(db, fixture_server):
+    fixture_server.pages["/latest"] = LISTING
+    fixture_server.pages["/tin-a.html"] = DETAIL.format(title="tin A")
+    fixture_server.pages["/tin-b.html"] = DETAIL.format(title="tin B")
+    source = Source(name="example", listing_urls=[fixture_server.url("/latest")], selectors=SELECTORS)
+
+    pipeline = ScrapePipeline(db, source=source, incremental=True, conditional=False, enqueue_summaries=True)
+    articles = [article async for article in pipeline.run()]
+
+    assert sorted((article.title, str(article.link_url)) for article in articles) == [
+        ("Tin A", fixture_server.url("/tin-a.html")), ("Tin B", fixture_server.url("/tin-b.html"))
+    ]
+    stored = await db["articles"].find_one({"link_url": fixture_server.url("/tin-a.html")})
+    assert stored["content"] == "Đoạn thứ nhất của tin A. Đoạn thứ hai."
@@ -0,0 +1,83 @@
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limiter import RateLimiter
+from app.core.summarizer import AdaptiveBatchSizer, ArticleSummarizer
+from app.core.summary_cache import SummaryCache
+from app.tests.scripts.fake_gemini import FakeGemini
+
+pytestmark = pytest.mark.anyio
+
+
+def make_articles(count: int) -> list[tuple[str, str]]:
+    return [
+        (f"Bài {n}: " + "Mưa lớn kéo dài nhiều ngày khiến nhiều tuyến đường ở Hà Nội ngập sâu. " * 4, f"Tiêu đề {n}")
+        for n in range(count)
+    ]
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    with FakeGemini() as server:
+        monkeypatch.setattr(settings, "GEMINI_API_ENDPOINT", server.base_url)
+        yield server
+
+
+@pytest.fixture
+def summarizer(db, gemini):
+    summarizer = ArticleSummarizer(rate_limiter=RateLimiter(0), cache=SummaryCache(100, 3600))
+    summarizer.batch_sizer.size = 4
+    return summarizer
+
+
+def test_batch_size_grows_on_fast_replies_and_shrinks_on_slow_or_failed_ones():
+    sizer = AdaptiveBatchSizer(max_size=4, target_latency=10.0)
+    assert sizer.size == 2
+
+    for _ in range(5):
+        sizer.record_success(1.0)
+    assert sizer.size == 4
+
+    sizer.record_success(30.0)
+    assert sizer.size == 3
+    sizer.record_failure()
+    assert sizer.size == 1
+    sizer.record_failure()
+    assert sizer.size == 1
+
+
+def test_batches_respect_the_size_and_token_budget(monkeypatch):
+    summarizer = ArticleSummarizer(rate_limiter=RateLimiter(0), cache=SummaryCache(100, 3600))
+    summarizer.batch_sizer.size = 3
+    short = [(index, "x" * 300, f"t{index}") for index in range(7)]
+    assert [len(batch) for batch in summarizer._pack_batches(short)] == [3, 3, 1]
+
+    # Two short articles (500 tokens each) fit the budget; a long one goes alone.
+    monkeypatch.setattr(settings, "SUMMARY_BATCH_TOKEN_BUDGET", 1200)
+    mixed = short[:2] + [(2, "x" * 6000, "long")] + short[3:4]
+    assert [[index for index, _, _ in batch] for batch in summarizer._pack_batches(mixed)] == [[0, 1], [2], [3]]
+
+
+async def test_one_request_per_batch_then_the_cache(summarizer, gemini):
+    articles = make_articles(4)
+    summaries = await summarizer.generate_summaries(articles)
+
+    assert summaries == [f"Tóm tắt giả lập cho bài {n}." for n in range(4)]
+    assert (gemini.request_count, gemini.batch_count) == (1, 1)
+    assert summarizer.cache.misses == 4
+
+    assert await summarizer.generate_summaries(articles) == summaries
+    assert gemini.request_count == 1
+
+
+async def test_failed_batch_falls_back_to_single_requests(summarizer, gemini):
+    gemini.fail_batches = True
+    articles = make_articles(3)
+    summaries = await summarizer.generate_summaries(articles)
+
+    assert all(summary.startswith("Tóm tắt giả lập: ") for summary in summaries)
+    assert (gemini.batch_count, gemini.request_count) == (1, 4)
+    assert summarizer.batch_sizer.size == 2
+    # Looked up once each, not again on the single retry.
+    assert summarizer.cache.misses == 3
+    assert await summarizer.generate_summaries(articles) == summaries
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.summary_queue import DONE, FALLBACK, PENDING, PROCESSING, SummaryQueue, SummaryWorkerPool
+
+pytestmark = pytest.mark.anyio
+
+CONTENT = "Mưa lớn kéo dài nhiều ngày khiến nhiều tuyến đường ở Hà Nội ngập sâu. " * 3
+
+
+@pytest.fixture
+def queue(db):
+    return SummaryQueue(lease_seconds=300, max_attempts=3, retry_delay_seconds=60)
+
+
+async def add_pending(db, count: int = 1, ready_at=None):
+    ready_at = ready_at or datetime.now() - timedelta(seconds=1)
+    result = await db["articles"].insert_many([
+        {"title": f"Bài {n}", "content": CONTENT, "summary_status": PENDING, "summary_available_at": ready_at}
+        for n in range(count)
+    ])
+    return result.inserted_ids
+
+
+async def expire_lease(db, article_id):
+    await db["articles"].update_one(
+        {"_id": article_id}, {"$set": {"summary_available_at": datetime.now() - timedelta(seconds=1)}}
+    )
+
+
+def seconds_from_now(moment: datetime) -> float:
+    return (moment - datetime.now()).total_seconds()
+
+
+async def test_an_article_is_claimed_by_one_worker(db, queue):
+    [article_id] = await add_pending(db)
+
+    first, second = await asyncio.gather(queue.claim("worker-1"), queue.claim("worker-2"))
+
+    claimed = [doc for doc in (first, second) if doc is not None]
+    assert [doc["_id"] for doc in claimed] == [article_id]
+    stored = await db["articles"].find_one({"_id": article_id})
+    assert stored["summary_status"] == PROCESSING
+    assert stored["summary_lease"] == claimed[0]["summary_lease"]
+    assert seconds_from_now(stored["summary_available_at"]) == pytest.approx(300, abs=2)
+
+
+async def test_expired_lease_is_reclaimed_and_the_stale_worker_rejected(db, queue):
+    [article_id] = await add_pending(db)
+    stale = await queue.claim("worker-1")
+    assert await queue.claim("worker-2") is None
+
+    await expire_lease(db, article_id)
+    fresh = await queue.claim("worker-2")
+
+    assert fresh["_id"] == article_id
+    assert fresh["summary_lease"] != stale["summary_lease"]
+    assert fresh["summary_attempts"] == 2
+
+    assert await queue.complete(stale, "Tóm tắt cũ") is False
+    assert await queue.retry(stale, "late failure") is False
+    assert await queue.complete(fresh, "Tóm tắt mới") is True
+
+    stored = await db["articles"].find_one({"_id": article_id})
+    assert (stored["summary_status"], stored["summary"]) == (DONE, "Tóm tắt mới")
+    assert "summary_lease" not in stored and "summary_available_at" not in stored
+
+
+async def test_retry_backs_off_exponentially(db, queue):
+    [article_id] = await add_pending(db)
+
+    delays = []
+    for _ in range(3):
+        doc = await queue.claim("worker-1")
+        assert await queue.retry(doc, "Gemini summary unavailable")
+        # Not claimable until the delay is over.
+        assert await queue.claim("worker-1") is None
+
+        stored = await db["articles"].find_one({"_id": article_id})
+        assert (stored["summary_status"], stored["summary_error"]) == (PENDING, "Gemini summary unavailable")
+        delays.append(round(seconds_from_now(stored["summary_available_at"]), -1))
+        await expire_lease(db, article_id)
+
+    assert delays == [60, 120, 240]
+
+
+class StubSummarizer:
+    """Summarizer whose Gemini is always unavailable."""
+
+    class batch_sizer:
+        size = 5
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_summary(self, content, title, use_fallback=True):
+        self.calls += 1
+        return None
+
+    async def generate_summaries(self, articles, use_fallback=True):
+        self.calls += 1
+        return [None] * len(articles)
+
+    async def generate_fallback_summary(self, content, title):
+        return f"[Tóm tắt tự động] {title}"
+
+
+async def test_worker_falls_back_after_the_last_attempt(db, queue):
+    [article_id] = await add_pending(db)
+    pool = SummaryWorkerPool(queue, StubSummarizer())
+
+    for attempt in range(1, queue.max_attempts + 1):
+        await pool._process(await queue.claim_batch("worker-1", 5))
+        stored = await db["articles"].find_one({"_id": article_id})
+        if attempt < queue.max_attempts:
+            assert stored["summary_status"] == PENDING
+            await expire_lease(db, article_id)
+
+    assert (stored["summary_status"], stored["summary"]) == (FALLBACK, "[Tóm tắt tự động] Bài 0")
+    assert pool.get_stats()["retried"] == queue.max_attempts - 1
+
+
+async def test_lag_includes_articles_of_a_crashed_worker(db, queue):
+    [article_id] = await add_pending(db)
+    await queue.claim("worker-1")
+    assert (await queue.get_stats())["lag_seconds"] == 0.0
+
+    # The worker died; its lease ran out ten minutes ago.
+    await db["articles"].update_one(
+        {"_id": article_id}, {"$set": {"summary_available_at": datetime.now() - timedelta(minutes=10)}}
+    )
+    stats = await queue.get_stats()
+    assert stats["by_status"][PROCESSING] == stats["depth"] == 1
+    assert stats["lag_seconds"] == pytest.approx(600, abs=2)
@@ -1,10 +1,50 @@
+"""Logging setup.
+
+Records are formatted on the calling thread but written by a ``QueueListener``
+thread, so ``logger.info`` in the scrape loop never waits on the console or
+on disk. ``logs/app.log`` and ``logs/error.log`` rotate at ``LOG_MAX_BYTES``.
+
+``LOG_FORMAT=json`` writes one JSON object per line with the fields bound by
+``log_context`` (job id, source, article URL). Identical warning/error lines
+are written at most once per ``LOG_REPEAT_WINDOW_SECONDS``; the next one that
+gets through says how many were dropped.
+"""
+import atexit
+import copy
+import io
+import json
 import logging
+import queue
 import sys
-import io
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, List, Mapping, Tuple
+
+from .core.config import settings
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Read-only, so a binding can only be replaced (and reset), never changed for
+# every context that shares it.
+_log_context: ContextVar[Mapping[str, Any]] = ContextVar("log_context", default=MappingProxyType({}))
 
-logs_dir = Path("logs")
-logs_dir.mkdir(exist_ok=True)
+
+@contextmanager
+def log_context(**fields):
+    """Attach ``fields`` to every record logged in this context, including by
+    tasks created inside it."""
+    token = _log_context.set(MappingProxyType({**_log_context.get(), **fields}))
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
 
 
 class Utf8StreamHandler(logging.StreamHandler):
@@ -14,25 +54,149 @@ class Utf8StreamHandler(logging.StreamHandler):
         super().__init__(stream)
 
 
-console_handler = Utf8StreamHandler()
-console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(console_formatter)
+class JsonFormatter(logging.Formatter):
+    # A ``log_context`` field with one of these names is written as ``context_<name>``.
+    CORE_FIELDS = frozenset({"time", "level", "logger", "message", "exc_info"})
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for name, value in getattr(record, "context", {}).items():
+            entry[f"context_{name}" if name in self.CORE_FIELDS else name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RepeatFilter(logging.Filter):
+    """Drops a warning or error identical to one let through less than
+    ``window`` seconds ago.
+
+    At most ``MAX_KEYS`` messages are remembered; past that the one let through
+    longest ago is forgotten, so a burst of distinct messages cannot grow it.
+    """
+
+    MAX_KEYS = 1024
+
+    def __init__(self, window: float):
+        super().__init__()
+        self.window = window
+        # In the order they were last let through.
+        self._seen: OrderedDict[Tuple[str, int, str], List[float]] = OrderedDict()
+        self._lock = threading.Lock()
 
-file_handler = logging.FileHandler(logs_dir / "app.log", encoding='utf-8')
-file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.window <= 0 or record.levelno < logging.WARNING:
+            return True
+        message = record.getMessage()
+        key = (record.name, record.levelno, message)
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.window:
+                seen[1] += 1
+                return False
+            self._seen[key] = [now, 0]
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.MAX_KEYS:
+                self._seen.popitem(last=False)
+        if seen is not None and seen[1]:
+            record.msg = f"{message} (repeated {int(seen[1])} more times)"
+            record.args = None
+        return True
 
-error_file_handler = logging.FileHandler(logs_dir / "error.log", encoding='utf-8')
-error_file_handler.setLevel(logging.ERROR)
-error_file_handler.setFormatter(file_formatter)
+
+class ContextQueueHandler(QueueHandler):
+    """Hands records to a ``QueueListener`` with the message, traceback and
+    ``log_context`` already rendered, and drops them if the queue is full
+    rather than block the caller."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.context = _log_context.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def create_handlers(
+        log_dir: Path,
+        json_format: bool = False,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        stream=None
+) -> List[logging.Handler]:
+    """Console, ``app.log`` and ``error.log`` (ERROR and above) handlers."""
+    log_dir.mkdir(parents=True, exist_ok=True)
+    formatter = JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT)
+
+    console_handler = Utf8StreamHandler(stream)
+    file_handler = RotatingFileHandler(
+        log_dir / "app.log", maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+    error_file_handler = RotatingFileHandler(
+        log_dir / "error.log", maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+    error_file_handler.setLevel(logging.ERROR)
+
+    handlers = [console_handler, file_handler, error_file_handler]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def start_queue_logging(
+        handlers: List[logging.Handler],
+        queue_size: int = 0,
+        repeat_window: float = 0
+) -> Tuple[ContextQueueHandler, QueueListener]:
+    """Put ``handlers`` behind a queue; returns the handler to log to and the
+    started listener that writes to them."""
+    queue_handler = ContextQueueHandler(queue.Queue(queue_size))
+    if repeat_window > 0:
+        queue_handler.addFilter(RepeatFilter(repeat_window))
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return queue_handler, listener
+
+
+logs_dir = Path(settings.LOG_DIR)
+queue_handler, log_listener = start_queue_logging(
+    create_handlers(
+        logs_dir,
+        json_format=settings.LOG_FORMAT == "json",
+        max_bytes=settings.LOG_MAX_BYTES,
+        backup_count=settings.LOG_BACKUP_COUNT
+    ),
+    queue_size=settings.LOG_QUEUE_SIZE,
+    repeat_window=settings.LOG_REPEAT_WINDOW_SECONDS
+)
+# Flushes what is still queued when the process exits.
+atexit.register(log_listener.stop)
 
 logging.basicConfig(
-    level=logging.INFO,
-    handlers=[
-        console_handler,
-        file_handler,
-        error_file_handler
-    ]
+    level=settings.LOG_LEVEL,
+    handlers=[queue_handler]
 )
 
 logger = logging.getLogger(__name__)
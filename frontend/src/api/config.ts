@@ -25,10 +25,6 @@ export const apiClient = async <T>(
 ): Promise<ApiResponse<T>> => {
     const url = endpoint.startsWith('http') ? endpoint : `${API_BASE_URL}/${endpoint}`;
 
-    const urlWithCacheBusting = options.method === 'GET' && !url.includes('_t=')
-    ? `${url}${url.includes('?') ? '&' : '?'}_t=${Date.now()}`
-        : url;
-
     const cacheKey = `${options.method}:${url}`;
     if (options.method === 'GET' && options.cache !== 'no-store') {
         const cachedResponse = apiCache.get(cacheKey)
@@ -50,7 +46,7 @@ export const apiClient = async <T>(
     };
 
     try {
-        const response = await fetch(urlWithCacheBusting, config);
+        const response = await fetch(url, config);
 
         if (!response.ok) {
             const errorData = await response.json().catch(() => null);
@@ -30,7 +30,8 @@ export type ArticleData = {
     summary: string | null;
     image_url: string;
     category: string;
-    content: string;
+    description: string | null;
+    summary_status: string | null;
     created_at: string;
     updated_at: string;
 };